@@ -0,0 +1,389 @@
+"""Benchmarks the interactive code paths of quick-commit on synthetic repositories.
+
+The repositories are generated with `git fast-import` and kept in a cache directory, so that they are only built
+once per size. Every benchmark reports the best time of a few repetitions. The results are compared to a baseline
+file, and the run fails if a benchmark got slower than the baseline by more than the allowed threshold.
+
+Timings only compare on the same hardware, so the baseline is kept next to the generated repositories, which are not
+under version control. The first run on a machine records it, later runs only add the benchmarks it does not cover
+yet. `--update-baseline` replaces it with the new results.
+
+Usage:
+    python benchmarks/run.py [--sizes 10000 100000] [--threshold 1.5] [--update-baseline]
+"""
+
+# ruff: noqa: T201
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from commit import commits, config, history, usage
+from commit.main import new_filter_function, show_more_filter_function
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_CACHE_DIR = ROOT.parent / ".benchmarks"
+BASELINE_NAME = "baseline.json"
+DEFAULT_THRESHOLD = 1.5
+# differences below this many seconds are considered noise, whatever the relative change.
+MIN_REGRESSION = 0.002
+REPEAT = 5
+SEED = 20250101
+END_TIME = 1_700_000_000
+# the commits of every repository span ten years at most, one hour apart at most.
+MAX_SPAN = 10 * 365 * 24 * 3600
+MAX_STEP = 3600
+
+COMMIT_TYPES = ["feat", "fix", "docs", "refactor", "test", "chore", "ci", "perf", "build", "style"]
+TYPE_WEIGHTS = [30, 30, 8, 10, 7, 6, 3, 2, 2, 2]
+SCOPES = [
+    "api", "cli", "config", "core", "db", "deps", "docs", "git", "history", "parser", "prompt", "ranking", "ui",
+    "auth", "cache", "build", "io", "net", "log", "tests", "release", "server", "client", "storage", "schema",
+    "search", "theme", "i18n", "metrics", "plugins", "scheduler", "security", "settings", "sync", "types", "utils",
+    "web", "worker", "lint", "ci",
+]  # fmt: skip
+SUBJECTS = ["add", "fix", "remove", "update", "improve", "rework", "document", "test", "speed up", "clean up"]
+OBJECTS = ["handling of empty input", "error messages", "the cache", "option parsing", "edge cases", "the output"]
+CONFIG = """\
+scopes:
+  exclude:
+    - deps
+    - git.*
+  add:
+    - benchmarks
+gitmojis:
+  priority:
+    - bug
+    - sparkles
+"""
+
+
+def get_gitmoji_codes() -> list[str]:
+    """Get the codes of all default gitmojis, most common first.
+
+    Returns:
+        list[str]: The gitmoji codes, including the surrounding colons.
+    """
+    return [f":{name}:" for _, name, _ in commits.DEFAULT_GITMOJIS]
+
+
+def generate_messages(count: int, seed: int = SEED) -> Iterator[str]:
+    """Generate realistic commit subjects.
+
+    Types, scopes and gitmojis follow a long-tailed distribution. A few subjects are merges or do not follow the
+    conventional commit format at all.
+
+    Args:
+        count (int): The number of subjects to generate.
+        seed (int, optional): The seed of the random generator. Defaults to SEED.
+
+    Yields:
+        str: The commit subjects.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    gitmojis = get_gitmoji_codes()
+    scope_weights = [1 / (rank + 1) for rank in range(len(SCOPES))]
+    gitmoji_weights = [1 / (rank + 1) ** 1.2 for rank in range(len(gitmojis))]
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.03:
+            yield f"Merge pull request #{i} from fork/branch-{i}"
+            continue
+        if roll < 0.05:
+            yield f"{rng.choice(SUBJECTS).capitalize()} {rng.choice(OBJECTS)}"
+            continue
+        commit_type = rng.choices(COMMIT_TYPES, TYPE_WEIGHTS)[0]
+        scope = f"({rng.choices(SCOPES, scope_weights)[0]})" if rng.random() < 0.85 else ""
+        gitmoji = rng.choices(gitmojis, gitmoji_weights)[0]
+        breaking = "!" if rng.random() < 0.01 else ""
+        yield f"{commit_type}{scope}:{breaking} {gitmoji} {rng.choice(SUBJECTS)} {rng.choice(OBJECTS)}"
+
+
+def build_repo(path: Path, count: int) -> None:
+    """Create a repository with a linear history of synthetic commits.
+
+    Args:
+        path (Path): The directory of the new repository.
+        count (int): The number of commits.
+    """
+    path.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)  # noqa: S603 S607
+    process = subprocess.Popen(  # noqa: S603
+        ["git", "fast-import", "--quiet"],  # noqa: S607
+        cwd=path,
+        stdin=subprocess.PIPE,
+    )
+    assert process.stdin is not None
+    step = min(MAX_STEP, MAX_SPAN // count)
+    for i, message in enumerate(generate_messages(count)):
+        data = message.encode()
+        timestamp = END_TIME - (count - 1 - i) * step
+        process.stdin.write(
+            b"commit refs/heads/main\n"
+            b"committer Bench <bench@example.com> %d +0000\n"
+            b"data %d\n%s\n" % (timestamp, len(data), data)
+        )
+    process.stdin.close()
+    if process.wait() != 0:
+        msg = f"git fast-import failed for {path}"
+        raise RuntimeError(msg)
+
+
+def get_repo_path(cache_dir: Path, count: int) -> Path:
+    """Get a synthetic repository, building it if it is not cached yet.
+
+    Args:
+        cache_dir (Path): The directory holding the generated repositories.
+        count (int): The number of commits of the repository.
+
+    Returns:
+        Path: The directory of the repository.
+    """
+    path = cache_dir / f"repo-{count}"
+    if not (path / ".git").exists():
+        print(f"Generating a repository with {count} commits...")
+        build_repo(path, count)
+    # checked on every run, so that cached repositories pick up changes of the configuration.
+    config_file = path / ".quick-commit-config.yaml"
+    if not config_file.exists() or config_file.read_text(encoding="utf-8") != CONFIG:
+        config_file.write_text(CONFIG, encoding="utf-8")
+    return path
+
+
+@contextlib.contextmanager
+def working_directory(path: Path) -> Iterator[None]:
+    """Change the working directory for the duration of a block.
+
+    Args:
+        path (Path): The new working directory.
+
+    Yields:
+        None: Nothing.
+    """
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def measure(function: Callable[[], Any], setup: Callable[[], None] | None = None, repeat: int = REPEAT) -> float:
+    """Time a function.
+
+    Args:
+        function (Callable[[], Any]): The function to time.
+        setup (Callable[[], None] | None, optional): A function run before every repetition, outside of the timing.
+            Defaults to None.
+        repeat (int, optional): The number of repetitions. Defaults to REPEAT.
+
+    Returns:
+        float: The best time of all repetitions, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_keystrokes(
+    filter_function: Callable[[str, int, list[str], dict[str, Any]], tuple[list[str], int]],
+    options: list[str],
+    text: str,
+) -> float:
+    """Time the filter callback of a prompt while a text is typed.
+
+    Args:
+        filter_function (Callable[[str, int, list[str], dict[str, Any]], tuple[list[str], int]]): The factory result
+            that is called on every keystroke.
+        options (list[str]): The options the prompt starts with.
+        text (str): The text that is typed.
+
+    Returns:
+        float: The slowest keystroke, in seconds.
+    """
+    tags: dict[str, Any] = {}
+    current = options
+    slowest = 0.0
+    for end in range(1, len(text) + 1):
+        start = time.perf_counter()
+        current, _ = filter_function(text[:end], 0, current, tags)
+        slowest = max(slowest, time.perf_counter() - start)
+    return slowest
+
+
+@contextlib.contextmanager
+def isolated_usage_store() -> Iterator[None]:
+    """Replace the usage store of the user with an empty one for the duration of a block.
+
+    The rankings read the store, the results must neither depend on nor change the store of whoever runs them.
+
+    Yields:
+        None: Nothing.
+    """
+    original = usage.get_database_path
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / usage.DATABASE_NAME
+        usage.get_database_path = lambda: path
+        usage.clear_cache()
+        try:
+            yield
+        finally:
+            usage.get_database_path = original
+            usage.clear_cache()
+
+
+def clear_caches() -> None:
+    """Forget everything the package cached in this process."""
+    config.clear_cache()
+    history.clear_cache()
+    usage.clear_cache()
+
+
+def clear_index() -> None:
+    """Forget everything cached in this process and the history index of the current repository."""
+    clear_caches()
+    history.get_index_path(commits.get_repo()).unlink(missing_ok=True)
+
+
+def run_benchmarks(path: Path) -> dict[str, float]:
+    """Run all benchmarks on a repository.
+
+    Args:
+        path (Path): The directory of the repository.
+
+    Returns:
+        dict[str, float]: The time of every benchmark, in seconds.
+    """
+    results: dict[str, float] = {}
+    with working_directory(path), isolated_usage_store():
+        results["find_config[cold]"] = measure(config.find_config, setup=config.clear_cache)
+        results["find_config[memo]"] = measure(config.find_config)
+        results["get_possible_scopes[scan]"] = measure(commits.get_possible_scopes, setup=clear_index, repeat=3)
+        results["get_possible_scopes[index]"] = measure(commits.get_possible_scopes, setup=clear_caches)
+        results["get_possible_scopes[memo]"] = measure(commits.get_possible_scopes)
+        results["get_gitmojis[index]"] = measure(commits.get_gitmojis, setup=clear_caches)
+        results["get_gitmojis[memo]"] = measure(commits.get_gitmojis)
+        results["get_commit_types[index]"] = measure(commits.get_commit_types, setup=clear_caches)
+        results["get_commit_types[memo]"] = measure(commits.get_commit_types)
+
+        # the filter functions are created once per prompt, the time of the slowest keystroke is reported.
+        scopes = [*commits.get_possible_scopes(), "Create new scope from current input"]
+        results["keystroke[scopes]"] = min(
+            measure_keystrokes(new_filter_function(scopes), scopes, "schedx") for _ in range(REPEAT)
+        )
+        ranked = commits.rank_gitmojis()
+        results["keystroke[gitmojis]"] = min(
+            measure_keystrokes(show_more_filter_function(ranked), commits.page_gitmojis(ranked, 0), "bugfix")
+            for _ in range(REPEAT)
+        )
+    return results
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float
+) -> list[str]:
+    """Compare benchmark results to a baseline.
+
+    Args:
+        results (dict[str, dict[str, float]]): The new results, per repository size.
+        baseline (dict[str, dict[str, float]]): The baseline results, per repository size.
+        threshold (float): The factor by which a benchmark may be slower than its baseline.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    regressions = []
+    for size, timings in results.items():
+        for name, seconds in timings.items():
+            reference = baseline.get(size, {}).get(name)
+            if reference is None:
+                continue
+            if seconds > max(reference * threshold, reference + MIN_REGRESSION):
+                regressions.append(
+                    f"{name} @ {size} commits: {seconds * 1000:.2f} ms, baseline {reference * 1000:.2f} ms"
+                )
+    return regressions
+
+
+def write_baseline(path: Path, baseline: dict[str, dict[str, float]]) -> None:
+    """Store baseline results.
+
+    Args:
+        path (Path): The baseline results file.
+        baseline (dict[str, dict[str, float]]): The results, per repository size.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def main_cli() -> None:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark quick-commit on synthetic repositories.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Numbers of commits to test.")
+    parser.add_argument(
+        "--baseline", type=Path, help=f"The baseline results file (default: {BASELINE_NAME} in the cache directory)."
+    )
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Where to keep generated repos.")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown factor against the baseline."
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline.")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        path = get_repo_path(args.cache_dir, size)
+        results[str(size)] = run_benchmarks(path)
+        print(f"{size} commits:")
+        for name, seconds in results[str(size)].items():
+            print(f"  {name:<30} {seconds * 1000:10.2f} ms")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    baseline_path = args.baseline if args.baseline is not None else args.cache_dir / BASELINE_NAME
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+    if args.update_baseline:
+        write_baseline(baseline_path, {**baseline, **results})
+        print(f"Baseline written to {baseline_path}.")
+        return
+    missing = {
+        size: {name: seconds for name, seconds in timings.items() if name not in baseline.get(size, {})}
+        for size, timings in results.items()
+    }
+    if any(missing.values()):
+        write_baseline(
+            baseline_path, {size: {**baseline.get(size, {}), **missing.get(size, {})} for size in {*baseline, *missing}}
+        )
+        print(f"Recorded the benchmarks without a baseline on this machine in {baseline_path}.")
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print("Regressions against the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main_cli()
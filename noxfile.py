@@ -76,6 +76,15 @@ def minimums(session: nox.Session) -> None:
     session.run("uv", "pip", "list")
 
 
+@nox.session(reuse_venv=True)
+def benchmarks(session: nox.Session) -> None:
+    """Run the benchmarks against the baseline of this machine. Pass "--update-baseline" to store new results."""
+    env = {"PIP_DISABLE_PIP_VERSION_CHECK": "1"}
+    session.install(*BUILD_REQUIREMENTS, env=env)
+    session.install("--no-build-isolation", "-ve.", env=env)
+    session.run("python", "benchmarks/run.py", *session.posargs, env=env)
+
+
 @nox.session(reuse_venv=True)
 def docs(session: nox.Session) -> None:
     """Build the docs. Use "--non-interactive" to avoid serving. Pass "-b linkcheck" to check links."""
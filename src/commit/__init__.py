@@ -2,8 +2,66 @@
 
 from __future__ import annotations
 
-from . import commits
-from .config import Config, NewCommitType, NewGitmoji, parse_config
-from .main import main
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    # the package attributes are loaded on first access by `__getattr__` below.
+    from . import commits  # noqa: TC004
+    from .config import Config, NewCommitType, NewGitmoji, parse_config  # noqa: TC004
+    from .main import main  # noqa: TC004
 
 __all__ = ["Config", "NewCommitType", "NewGitmoji", "commits", "main", "parse_config"]
+# importing the package must stay cheap, the heavy modules are only needed once the arguments were parsed.
+_LAZY_ATTRIBUTES = {
+    "Config": "config",
+    "NewCommitType": "config",
+    "NewGitmoji": "config",
+    "parse_config": "config",
+    "main": "main",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Load a public attribute of the package on first access.
+
+    Args:
+        name (str): The name of the attribute.
+
+    Returns:
+        Any: The attribute.
+
+    Raises:
+        AttributeError: If the package has no such attribute.
+    """
+    if name == "commits":
+        return importlib.import_module(".commits", __name__)
+    if name not in _LAZY_ATTRIBUTES:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+class _Package(types.ModuleType):
+    """The type of this package, which keeps `commit.main` bound to the entry point rather than its submodule."""
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Set an attribute of the package.
+
+        The import system binds every submodule to the package once it is loaded, which would replace the `main`
+        function by the `commit.main` module whenever that module is imported.
+
+        Args:
+            name (str): The name of the attribute.
+            value (Any): The value of the attribute.
+        """
+        if name == "main" and isinstance(value, types.ModuleType):
+            value = value.main
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
@@ -2,38 +2,111 @@
 
 from __future__ import annotations
 
-import re
-from pathlib import Path
+import os
+from itertools import islice
+from typing import TYPE_CHECKING
 
-import git  # type: ignore[import-not-found]
+from commit import config, discovery, tracing
+from commit.fuzzy import FuzzyIndex
 
-from commit import config
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
 
+    import git  # type: ignore[import-not-found]
 
+
+STREAM_CHUNK_SIZE = 64 * 1024
+# a sample of a huge change, e.g. a vendored dependency update, already shows which scope it belongs to.
+MAX_MATCHED_PATHS = 1000
+
+
+@tracing.traced("commits.has_staged_changes")
+def has_staged_changes() -> bool:
+    """Check if anything is staged for commit.
+
+    git stops comparing the index with `HEAD` at the first difference, and nothing is listed or allocated for the
+    staged files. In a repository without commits, every staged file counts as a change.
+
+    Returns:
+        bool: True if at least one change is staged.
+    """
+    import subprocess
+
+    result = subprocess.run(  # noqa: S603
+        ["git", "diff", "--cached", "--quiet"],  # noqa: S607
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    return result.returncode == 1
+
+
+def iter_staged_paths() -> Iterator[str]:
+    """Stream the paths of all files staged for commit from a single `git diff` process.
+
+    The paths are read lazily, so callers that only need a few of them do not pay for listing all of them.
+
+    Yields:
+        str: The path of each staged file, relative to the root of the repository.
+    """
+    import subprocess
+
+    process = subprocess.Popen(  # noqa: S603
+        ["git", "diff", "--cached", "--name-only", "-z", "--no-renames"],  # noqa: S607
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    assert process.stdout is not None
+    try:
+        rest = b""
+        while chunk := process.stdout.read(STREAM_CHUNK_SIZE):
+            *paths, rest = (rest + chunk).split(b"\0")
+            for path in paths:
+                yield os.fsdecode(path)
+        if rest:
+            yield os.fsdecode(rest)
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+@tracing.traced("commits.get_stages_files")
 def get_stages_files() -> list[str]:
     """Get a list of all files staged for commit.
 
+    Use `has_staged_changes()` to only check if anything is staged.
+
     Returns:
         list[str]: A list of all files staged for commit.
     """
-    repo = get_repo()
-    return [item.a_path for item in repo.index.diff("HEAD")] if repo.head.is_valid() else ["."]
+    return list(iter_staged_paths())
+
+
+_repos: dict[Path, git.Repo] = {}
 
 
+@tracing.traced("commits.get_repo")
 def get_repo() -> git.Repo:
     """Get the current git repository object.
 
+    The repository is found by the shared upward discovery, and its object is created once per process.
+
     Returns:
         git.Repo: The git repository object.
     """
-    current = Path.cwd()
-    while True:
-        if any(current.glob(".git")):
-            return git.Repo(current)
-        if current.parent == current:
-            break
-        current = current.parent
-    return None
+    root = discovery.discover().root
+    if root is None:
+        return None
+    if root not in _repos:
+        import git  # type: ignore[import-not-found]
+
+        _repos[root] = git.Repo(root)
+    return _repos[root]
 
 
 def get_standard_commit_types() -> dict[str, str]:
@@ -57,11 +130,11 @@ def get_standard_commit_types() -> dict[str, str]:
     }
 
 
-def get_commit_types() -> list[str]:
-    """Get a list of all possible commit types.
+def get_allowed_commit_types() -> dict[str, str]:
+    """Get all commit types allowed by the configuration.
 
     Returns:
-        list[str]: A list of all possible commit types.
+        dict[str, str]: The descriptions of the allowed commit types, by name.
     """
     standard = get_standard_commit_types()
     conf = config.find_config()
@@ -70,6 +143,29 @@ def get_commit_types() -> list[str]:
     for ex_commit_type in conf.excluded_commit_types:
         if ex_commit_type in standard:
             del standard[ex_commit_type]
+    return standard
+
+
+@tracing.traced("commits.get_commit_types")
+def get_commit_types() -> list[str]:
+    """Get a list of all possible commit types, ranked by how frequently and recently they were used.
+
+    The priority commit types of the configuration come first. The commit types you used in other repositories are
+    blended in, weighted by `user-weight`. Unused commit types keep their standard order.
+
+    Returns:
+        list[str]: A list of all possible commit types.
+    """
+    standard = get_allowed_commit_types()
+    conf = config.find_config()
+    from commit import history, ranking
+
+    index = history.scan_history(get_repo())
+    scores = ranking.get_scores(index.types, index, conf)
+    if conf.ranking_user_weight > 0:
+        from commit import usage
+
+        scores = ranking.blend(scores, usage.get_scores("type"), conf.ranking_user_weight)
     max_len = max(len(key) for key in standard) + 1
 
     def fill_type(key: str) -> str:
@@ -77,114 +173,353 @@ def get_commit_types() -> list[str]:
 
     return [
         f"{fill_type(key)} {standard[key]}"
-        for key in sorted(standard.keys(), key=lambda item: item not in conf.priority_commit_types)
+        for key in sorted(
+            standard.keys(), key=lambda item: (item not in conf.priority_commit_types, -scores.get(item, 0.0))
+        )
     ]
 
 
+@tracing.traced("commits.get_possible_scopes")
 def get_possible_scopes() -> list[str]:
-    """Get a list of all scopes used in previous commits.
+    """Get a list of all scopes used in previous commits, ranked by how frequently and recently they were used.
+
+    The scopes you used in other repositories are blended in, weighted by `user-weight`. If `suggest-from-paths` is
+    enabled, the scopes used for the directories of the staged files are ranked first.
 
     Returns:
         list[str]: A list of all scopes used in previous commits.
     """
-
-    def get_scope(message: str) -> str:
-        front = message.split(":")[0]
-        if "(" in front and ")" in front:
-            return front[front.index("(") + 1 : front.index(")")]
-        return ""
-
     conf = config.find_config()
-    repo = get_repo()
-    previous_scopes = [get_scope(commit.message) for commit in repo.iter_commits()] if repo.head.is_valid() else []
-    options = []
-    for prev in previous_scopes:
-        if not prev:
-            continue
-        if prev not in options:
-            options.append(prev)
+    # the history is only needed for ranking, checking a message (e.g. in the commit-msg hook) must not load it.
+    from commit import history, ranking
+
+    index = history.scan_history(get_repo())
+    scores = ranking.get_scores(index.scopes, index, conf)
+    if conf.ranking_user_weight > 0:
+        from commit import usage
+
+        scores = ranking.blend(scores, usage.get_scores("scope"), conf.ranking_user_weight)
+    options = sorted(scores, key=lambda scope: -scores[scope])
+    if index.paths is not None:
+        with tracing.phase("commits.match_staged_paths"):
+            matches = index.paths.match(islice(iter_staged_paths(), MAX_MATCHED_PATHS))
+        # scopes matching the staged files come first, the history ranking decides among equal matches.
+        options.sort(key=lambda scope: -matches.get(scope, 0.0))
     for scope in conf.new_scopes:
         if scope not in options:
             options.append(scope)
-    for scope in conf.excluded_scopes:
-        scopes_to_remove = [option for option in options if re.fullmatch(scope, option)]
-        for option in scopes_to_remove:
-            options.remove(option)
+    for pattern in conf.excluded_scope_patterns:
+        options = [option for option in options if not pattern.fullmatch(option)]
     if conf.prohibit_no_scope:
         return options
     return ["None", *options]
 
 
-def check_commit_message(msg: str) -> tuple[bool, str]:
+def check_commit_message(msg: str, conf: config.Config | None = None) -> tuple[bool, str]:
     """Check if a commit message is valid.
 
     Args:
         msg (str): The commit message to check.
+        conf (config.Config | None, optional): The configuration to check against. Defaults to the configuration of
+            the current working directory.
 
     Returns:
         tuple[bool, str]: A tuple containing a boolean indicating if the message is valid and the message itself.
     """
+    from commit import lint
+
     if msg.startswith("!"):
-        return True, msg[1:]
+        return lint.check_message(msg)
+    if conf is None:
+        conf = config.find_config()
+    return lint.check_message(msg, conf.message_regex)
+
+
+def check_scope(scope: str) -> bool:
+    """Check if a scope may be used.
 
+    Scopes need not have been used before, but they must not be excluded by the configuration.
+
+    Args:
+        scope (str): The scope to check. An empty scope stands for no scope at all.
+
+    Returns:
+        bool: A boolean indicating if the scope is allowed.
+    """
     conf = config.find_config()
-    if conf.message_pattern is not None:
-        return len(re.findall(conf.message_pattern, msg)) > 0, msg
+    if not scope:
+        return not conf.prohibit_no_scope
+    return not any(pattern.fullmatch(scope) for pattern in conf.excluded_scope_patterns)
+
+
+def find_gitmoji(gitmoji: str) -> str | None:
+    """Find an allowed gitmoji by its name, its code or its icon.
+
+    Args:
+        gitmoji (str): The gitmoji to find, e.g. "zap", ":zap:" or "⚡️".
+
+    Returns:
+        str | None: The code of the gitmoji, e.g. ":zap:", or None if it is unknown or excluded.
+    """
+    allowed = get_allowed_gitmojis()
+    code = f":{gitmoji.strip(':')}:"
+    if code in allowed:
+        return code
+    return next((gm.code for gm in allowed.values() if gm.icon == gitmoji), None)
 
-    msg = msg.strip()
-    if not msg:
-        return False, msg
-    if msg.endswith("."):
-        return False, msg
-    if msg[0].isupper():
-        return False, msg
-    return True, msg
+
+def get_allowed_gitmojis() -> dict[str, Gitmoji]:
+    """Get all gitmojis allowed by the configuration.
+
+    Returns:
+        dict[str, Gitmoji]: The allowed gitmojis by code, in the order of `get_gitmoji_catalogue`.
+    """
+    excluded = set(config.find_config().excluded_gitmojis)
+    catalogue = get_gitmoji_catalogue()
+    if not excluded:
+        return catalogue
+    return {code: gm for code, gm in catalogue.items() if gm.name not in excluded}
+
+
+def format_commit_message(
+    commit_type: str,
+    scope: str,
+    gitmoji: str,
+    msg: str,
+    description: str = "",
+    footer: str = "",
+    breaking_change: bool = False,
+) -> str:
+    """Assemble a full commit message from its parts.
+
+    Args:
+        commit_type (str): The type of the commit.
+        scope (str): The scope of the commit, empty for no scope.
+        gitmoji (str): The gitmoji code, e.g. ":zap:".
+        msg (str): The short commit message.
+        description (str, optional): The longer description of the changes. Defaults to "".
+        footer (str, optional): The footer of the commit message. Defaults to "".
+        breaking_change (bool, optional): Determine if the commit is a breaking change. Defaults to False.
+
+    Returns:
+        str: The full commit message.
+    """
+    scope = f"({scope})" if scope else ""
+    breaking = "!" if breaking_change else ""
+    full_message = f"{commit_type}{scope}:{breaking} {gitmoji} {msg}"
+    if description:
+        full_message += f"\n\n{description}"
+    if footer:
+        full_message += f"\n\n{footer}"
+    return full_message
+
+
+GITMOJI_PAGE_SIZE = 7
 
 
 def get_gitmojis(filter_string: str = "", start_index: int = 0) -> list[str]:
-    """Get a list of 7 gitmojis, ordered by frequency of use in previous commits.
+    """Get a list of 7 gitmojis, ordered by how frequently and recently they were used in previous commits.
 
     Args:
         filter_string (str, optional): A filter to apply to the list. Defaults to "".
         start_index (int, optional): The index to start from. Defaults to 0.
 
     Returns:
-        list[str]: _description_
+        list[str]: The requested page of gitmojis, followed by a "..." entry to show more.
+    """
+    ranked = rank_gitmoji_records()
+    if filter_string:
+        search = FuzzyIndex([gm.search_key for gm in ranked])
+        ranked = [ranked[i] for i in search.match(filter_string)]
+    if start_index >= len(ranked):
+        start_index = 0
+    return [*(gm.format() for gm in ranked[start_index : start_index + GITMOJI_PAGE_SIZE]), "..."]
+
+
+@tracing.traced("commits.rank_gitmojis")
+def rank_gitmojis() -> list[str]:
+    """Get the list of all available gitmojis, ordered by priority and by how frequently and recently they were used.
+
+    Returns:
+        list[str]: The ranked list of gitmojis.
+    """
+    return [gm.format() for gm in rank_gitmoji_records()]
+
+
+def rank_gitmoji_records() -> list[Gitmoji]:
+    """Rank all available gitmojis by priority and by how frequently and recently they were used.
+
+    Gitmojis found in the history but not in the catalogue are ranked as unknown gitmojis.
+
+    Returns:
+        list[Gitmoji]: The ranked gitmojis.
     """
     conf = config.find_config()
-    gitmoji_list = get_gitmoji_list()
-    gitmoji_dict = {}
-    for gm in gitmoji_list:
-        key = gm.split(" - ")[1].strip()
-        gitmoji_dict[key] = gm
-    gitmoji_count = dict.fromkeys(gitmoji_dict.keys(), 0)
-    repo = get_repo()
-    for commit in repo.iter_commits() if repo.head.is_valid() else []:
-        message = commit.message
-        if message.count(":") < 3:
-            continue
-        gitmoji = message.split(":")[2]
-        if gitmoji != gitmoji.strip():
-            continue
-        gitmoji = f":{gitmoji}:"
-        if gitmoji not in gitmoji_count:
-            gitmoji_count[gitmoji] = 0
-            gitmoji_dict[gitmoji] = f"?? - {gitmoji} - Unknown gitmoji"
-        gitmoji_count[gitmoji] += 1
-
-    for gm in conf.excluded_gitmojis:
-        with_colons = f":{gm}:"
-        if with_colons in gitmoji_count:
-            del gitmoji_count[with_colons]
-            del gitmoji_dict[with_colons]
-
-    gitmoji_list = list(gitmoji_dict.values())
-    gitmoji_list.sort(key=lambda x: gitmoji_count[x.split(" - ")[1].strip()], reverse=True)
-    gitmoji_list.sort(key=lambda x: x.split(" - ")[1].strip()[1:-1] not in conf.priority_gitmojis)
-    gitmoji_list = [gm for gm in gitmoji_list if filter_string.lower() in gm.lower()]
+    gitmojis = dict(get_gitmoji_catalogue())
+    from commit import history, ranking
+
+    index = history.scan_history(get_repo())
+    scores = ranking.get_scores(index.gitmojis, index, conf)
+    if conf.ranking_user_weight > 0:
+        from commit import usage
+
+        scores = ranking.blend(scores, usage.get_scores("gitmoji"), conf.ranking_user_weight)
+    for code in scores:
+        if code not in gitmojis:
+            gitmojis[code] = Gitmoji("??", code[1:-1], "Unknown gitmoji")
+    excluded = set(conf.excluded_gitmojis)
+    priority = set(conf.priority_gitmojis)
+    return sorted(
+        (gm for gm in gitmojis.values() if gm.name not in excluded),
+        key=lambda gm: (gm.name not in priority, -scores.get(gm.code, 0.0)),
+    )
+
+
+def page_gitmojis(gitmoji_list: list[str], start_index: int) -> list[str]:
+    """Get a single page of a list of gitmojis.
+
+    Args:
+        gitmoji_list (list[str]): The gitmojis to take the page from.
+        start_index (int): The index to start from. Starts over at 0 if it is out of range.
+
+    Returns:
+        list[str]: The requested page of gitmojis, followed by a "..." entry to show more.
+    """
     if start_index >= len(gitmoji_list):
         start_index = 0
-    return gitmoji_list[start_index : start_index + 7] + ["..."]
+    return [*gitmoji_list[start_index : start_index + GITMOJI_PAGE_SIZE], "..."]
+
+
+# the default gitmojis as (icon, name, description), in the order they are offered without any history.
+DEFAULT_GITMOJIS = (
+    ("🎨", "art", "Improve structure / format of the code."),
+    ("⚡️", "zap", "Improve performance."),
+    ("🔥", "fire", "Remove code or files."),
+    ("🐛", "bug", "Fix a bug."),
+    ("🚑️", "ambulance", "Critical hotfix."),
+    ("✨", "sparkles", "Introduce new features."),
+    ("📝", "memo", "Add or update documentation."),
+    ("🚀", "rocket", "Deploy stuff."),
+    ("💄", "lipstick", "Add or update the UI and style files."),
+    ("🎉", "tada", "Begin a project."),
+    ("✅", "white_check_mark", "Add, update, or pass tests."),
+    ("🔒️", "lock", "Fix security or privacy issues."),
+    ("🔐", "closed_lock_with_key", "Add or update secrets."),
+    ("🔖", "bookmark", "Release / Version tags."),
+    ("🚨", "rotating_light", "Fix compiler / linter warnings."),
+    ("🚧", "construction", "Work in progress."),
+    ("💚", "green_heart", "Fix CI Build."),
+    ("⬇️", "arrow_down", "Downgrade dependencies."),
+    ("⬆️", "arrow_up", "Upgrade dependencies."),
+    ("📌", "pushpin", "Pin dependencies to specific versions."),
+    ("👷", "construction_worker", "Add or update CI build system."),
+    ("📈", "chart_with_upwards_trend", "Add or update analytics or track code."),
+    ("♻️", "recycle", "Refactor code."),
+    ("➕", "heavy_plus_sign", "Add a dependency."),  # noqa: RUF001
+    ("➖", "heavy_minus_sign", "Remove a dependency."),  # noqa: RUF001
+    ("🔧", "wrench", "Add or update configuration files."),
+    ("🔨", "hammer", "Add or update development scripts."),
+    ("🌐", "globe_with_meridians", "Internationalization and localization."),
+    ("✏️", "pencil2", "Fix typos."),
+    ("💩", "poop", "Write bad code that needs to be improved."),
+    ("⏪️", "rewind", "Revert changes."),
+    ("🔀", "twisted_rightwards_arrows", "Merge branches."),
+    ("📦️", "package", "Add or update compiled files or packages."),
+    ("👽️", "alien", "Update code due to external API changes."),
+    ("🚚", "truck", "Move or rename resources (e.g.: files, paths, routes)."),
+    ("📄", "page_facing_up", "Add or update license."),
+    ("💥", "boom", "Introduce breaking changes."),
+    ("🍱", "bento", "Add or update assets."),
+    ("♿️", "wheelchair", "Improve accessibility."),
+    ("💡", "bulb", "Add or update comments in source code."),
+    ("🍻", "beers", "Write code drunkenly."),
+    ("💬", "speech_balloon", "Add or update text and literals."),
+    ("🗃️", "card_file_box", "Perform database related changes."),
+    ("🔊", "loud_sound", "Add or update logs."),
+    ("🔇", "mute", "Remove logs."),
+    ("👥", "busts_in_silhouette", "Add or update contributor(s)."),
+    ("🚸", "children_crossing", "Improve user experience / usability."),
+    ("🏗️", "building_construction", "Make architectural changes."),
+    ("📱", "iphone", "Work on responsive design."),
+    ("🤡", "clown_face", "Mock things."),
+    ("🥚", "egg", "Add or update an easter egg."),
+    ("🙈", "see_no_evil", "Add or update a .gitignore file."),
+    ("📸", "camera_flash", "Add or update snapshots."),
+    ("⚗️", "alembic", "Perform experiments."),
+    ("🔍️", "mag", "Improve SEO."),
+    ("🏷️", "label", "Add or update types."),
+    ("🌱", "seedling", "Add or update seed files."),
+    ("🚩", "triangular_flag_on_post", "Add, update, or remove feature flags."),
+    ("🥅", "goal_net", "Catch errors."),
+    ("💫", "dizzy", "Add or update animations and transitions."),
+    ("🗑️", "wastebasket", "Deprecate code that needs to be cleaned up."),
+    ("🛂", "passport_control", "Work on code related to authorization, roles and permissions."),
+    ("🩹", "adhesive_bandage", "Simple fix for a non-critical issue."),
+    ("🧐", "monocle_face", "Data exploration/inspection."),
+    ("⚰️", "coffin", "Remove dead code."),
+    ("🧪", "test_tube", "Add a failing test."),
+    ("👔", "necktie", "Add or update business logic."),
+    ("🩺", "stethoscope", "Add or update healthcheck."),
+    ("🧱", "bricks", "Infrastructure related changes."),
+    ("🧑\u200d💻", "technologist", "Improve developer experience."),
+    ("💸", "money_with_wings", "Add sponsorships or money related infrastructure."),
+    ("🧵", "thread", "Add or update code related to multithreading or concurrency."),
+    ("🦺", "safety_vest", "Add or update code related to validation."),
+)
+
+
+class Gitmoji:
+    """A gitmoji of the catalogue.
+
+    The records are created once per process. The text shown in the prompts is only formatted when it is needed.
+    """
+
+    __slots__ = ("code", "description", "icon", "name", "search_key")
+
+    def __init__(self, icon: str, name: str, description: str) -> None:
+        """Create a new gitmoji record.
+
+        Args:
+            icon (str): The emoji.
+            name (str): The name of the gitmoji, without colons.
+            description (str): What the gitmoji is used for.
+        """
+        self.icon = icon
+        self.name = name
+        self.code = f":{name}:"
+        self.description = description
+        self.search_key = self.format().lower()
+
+    def format(self) -> str:
+        """Format the gitmoji as shown in the prompts.
+
+        Returns:
+            str: The icon, code and description of the gitmoji.
+        """
+        return f"{self.icon} - {self.code} - {self.description}"
+
+
+_catalogues: dict[tuple[tuple[str, str, str], ...], dict[str, Gitmoji]] = {}
+
+
+def get_gitmoji_catalogue() -> dict[str, Gitmoji]:
+    """Get all possible gitmojis, including the ones added by the configuration.
+
+    The catalogue is built once per process and set of added gitmojis. An added gitmoji replaces a default gitmoji of
+    the same name and is moved to the end.
+
+    Returns:
+        dict[str, Gitmoji]: The gitmojis by code, e.g. ":zap:". Must not be modified.
+    """
+    added = tuple((gitmoji.icon, gitmoji.name, gitmoji.description) for gitmoji in config.find_config().new_gitmojis)
+    if added not in _catalogues:
+        catalogue: dict[str, Gitmoji] = {}
+        for icon, name, description in (*DEFAULT_GITMOJIS, *added):
+            gitmoji = Gitmoji(icon, name, description)
+            catalogue.pop(gitmoji.code, None)
+            catalogue[gitmoji.code] = gitmoji
+        _catalogues[added] = catalogue
+    return _catalogues[added]
 
 
 def get_gitmoji_list() -> list[str]:
@@ -193,86 +528,4 @@ def get_gitmoji_list() -> list[str]:
     Returns:
         list[str]: A list of all possible gitmojis.
     """
-    conf = config.find_config()
-    base_list = [
-        "🎨 - :art: - Improve structure / format of the code.",
-        "⚡️ - :zap: - Improve performance.",
-        "🔥 - :fire: - Remove code or files.",
-        "🐛 - :bug: - Fix a bug.",
-        "🚑️ - :ambulance: - Critical hotfix.",
-        "✨ - :sparkles: - Introduce new features.",
-        "📝 - :memo: - Add or update documentation.",
-        "🚀 - :rocket: - Deploy stuff.",
-        "💄 - :lipstick: - Add or update the UI and style files.",
-        "🎉 - :tada: - Begin a project.",
-        "✅ - :white_check_mark: - Add, update, or pass tests.",
-        "🔒️ - :lock: - Fix security or privacy issues.",
-        "🔐 - :closed_lock_with_key: - Add or update secrets.",
-        "🔖 - :bookmark: - Release / Version tags.",
-        "🚨 - :rotating_light: - Fix compiler / linter warnings.",
-        "🚧 - :construction: - Work in progress.",
-        "💚 - :green_heart: - Fix CI Build.",
-        "⬇️ - :arrow_down: - Downgrade dependencies.",
-        "⬆️ - :arrow_up: - Upgrade dependencies.",
-        "📌 - :pushpin: - Pin dependencies to specific versions.",
-        "👷 - :construction_worker: - Add or update CI build system.",
-        "📈 - :chart_with_upwards_trend: - Add or update analytics or track code.",
-        "♻️ - :recycle: - Refactor code.",
-        "➕ - :heavy_plus_sign: - Add a dependency.",  # noqa: RUF001
-        "➖ - :heavy_minus_sign: - Remove a dependency.",  # noqa: RUF001
-        "🔧 - :wrench: - Add or update configuration files.",
-        "🔨 - :hammer: - Add or update development scripts.",
-        "🌐 - :globe_with_meridians: - Internationalization and localization.",
-        "✏️ - :pencil2: - Fix typos.",
-        "💩 - :poop: - Write bad code that needs to be improved.",
-        "⏪️ - :rewind: - Revert changes.",
-        "🔀 - :twisted_rightwards_arrows: - Merge branches.",
-        "📦️ - :package: - Add or update compiled files or packages.",
-        "👽️ - :alien: - Update code due to external API changes.",
-        "🚚 - :truck: - Move or rename resources (e.g.: files, paths, routes).",
-        "📄 - :page_facing_up: - Add or update license.",
-        "💥 - :boom: - Introduce breaking changes.",
-        "🍱 - :bento: - Add or update assets.",
-        "♿️ - :wheelchair: - Improve accessibility.",
-        "💡 - :bulb: - Add or update comments in source code.",
-        "🍻 - :beers: - Write code drunkenly.",
-        "💬 - :speech_balloon: - Add or update text and literals.",
-        "🗃️ - :card_file_box: - Perform database related changes.",
-        "🔊 - :loud_sound: - Add or update logs.",
-        "🔇 - :mute: - Remove logs.",
-        "👥 - :busts_in_silhouette: - Add or update contributor(s).",
-        "🚸 - :children_crossing: - Improve user experience / usability.",
-        "🏗️ - :building_construction: - Make architectural changes.",
-        "📱 - :iphone: - Work on responsive design.",
-        "🤡 - :clown_face: - Mock things.",
-        "🥚 - :egg: - Add or update an easter egg.",
-        "🙈 - :see_no_evil: - Add or update a .gitignore file.",
-        "📸 - :camera_flash: - Add or update snapshots.",
-        "⚗️ - :alembic: - Perform experiments.",
-        "🔍️ - :mag: - Improve SEO.",
-        "🏷️ - :label: - Add or update types.",
-        "🌱 - :seedling: - Add or update seed files.",
-        "🚩 - :triangular_flag_on_post: - Add, update, or remove feature flags.",
-        "🥅 - :goal_net: - Catch errors.",
-        "💫 - :dizzy: - Add or update animations and transitions.",
-        "🗑️ - :wastebasket: - Deprecate code that needs to be cleaned up.",
-        "🛂 - :passport_control: - Work on code related to authorization, roles and permissions.",
-        "🩹 - :adhesive_bandage: - Simple fix for a non-critical issue.",
-        "🧐 - :monocle_face: - Data exploration/inspection.",
-        "⚰️ - :coffin: - Remove dead code.",
-        "🧪 - :test_tube: - Add a failing test.",
-        "👔 - :necktie: - Add or update business logic.",
-        "🩺 - :stethoscope: - Add or update healthcheck.",
-        "🧱 - :bricks: - Infrastructure related changes.",
-        "🧑‍💻 - :technologist: - Improve developer experience.",
-        "💸 - :money_with_wings: - Add sponsorships or money related infrastructure.",
-        "🧵 - :thread: - Add or update code related to multithreading or concurrency.",
-        "🦺 - :safety_vest: - Add or update code related to validation.",
-    ]
-    for gitmoji in conf.new_gitmojis:
-        for gm in base_list:
-            if f":{gitmoji.name}:" in gm:
-                base_list.remove(gm)
-                break
-        base_list.append(f"{gitmoji.icon} - :{gitmoji.name}: - {gitmoji.description}")
-    return base_list
+    return [gitmoji.format() for gitmoji in get_gitmoji_catalogue().values()]
@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import json
+import os
+import re
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
+from typing import Any
 
-import appdirs  # type: ignore[import-untyped]
-import yaml
+from commit import discovery, tracing
+
+CONFIG_FILE_NAMES = discovery.CONFIG_FILE_NAMES
+GLOBAL_CONFIG_FILE_NAMES = ("config.yaml", "config.yml")
 
 
 @dataclass
@@ -37,6 +46,7 @@ class Config:
     excluded_scopes: list[str] = field(default_factory=list)
     new_scopes: list[str] = field(default_factory=list)
     prohibit_no_scope: bool = False
+    suggest_scopes_from_paths: bool = False
 
     message_pattern: str | None = None
 
@@ -45,34 +55,160 @@ class Config:
     priority_gitmojis: list[str] = field(default_factory=list)
 
     enable_footer: bool = False
+    parallel_precommit: bool = False
+
+    history_backend: str = "git-log"
+    history_only_mine: bool = False
+    history_no_merges: bool = False
+    history_first_parent: bool = False
+
+    ranking_half_life_days: float = 30.0
+    ranking_recency_weight: float = 1.0
+    ranking_user_weight: float = 0.25
+
+    @cached_property
+    def excluded_scope_patterns(self) -> list[re.Pattern[str]]:
+        """The compiled patterns of the excluded scopes."""
+        return [re.compile(scope) for scope in self.excluded_scopes]
+
+    @cached_property
+    def message_regex(self) -> re.Pattern[str] | None:
+        """The compiled custom message pattern, if one is set."""
+        return re.compile(self.message_pattern) if self.message_pattern is not None else None
 
 
+_resolved: dict[Path, Config] = {}
+
+
+@tracing.traced("config.find_config")
 def find_config() -> Config:
     """Find the configuration for your current working directory.
 
+    The configuration is resolved once per working directory and process.
+
     Returns:
         Config: The configuration for your current working directory.
     """
-    current = Path.cwd()
-    while True:
-        if (current / ".quick-commit-config.yaml").exists():
-            return parse_config(current / ".quick-commit-config.yaml")
-        if (current / ".quick-commit-config.yml").exists():
-            return parse_config(current / ".quick-commit-config.yml")
-        if current.parent == current:
-            break
-        current = current.parent
+    cwd = Path.cwd()
+    if cwd not in _resolved:
+        config_file = find_config_file(cwd)
+        _resolved[cwd] = load_config(config_file) if config_file is not None else Config()
+    return _resolved[cwd]
+
+
+def clear_cache(root: Path | None = None) -> None:
+    """Forget the configurations resolved by this process, including where their files were found.
+
+    Args:
+        root (Path | None, optional): Only forget the directories inside this one, e.g. the working tree of a
+            repository. Defaults to all directories.
+    """
+    if root is None:
+        _resolved.clear()
+    else:
+        for cwd in [cwd for cwd in _resolved if cwd.is_relative_to(root)]:
+            del _resolved[cwd]
+    discovery.clear_cache(root)
+
+
+def find_config_file(start: Path) -> Path | None:
+    """Find the configuration file that applies to a directory.
+
+    The local configuration file is taken from the upward scan shared with the repository discovery.
+
+    Args:
+        start (Path): The directory to start searching from.
+
+    Returns:
+        Path | None: The nearest local configuration file, the global configuration file, or None if neither exists.
+    """
+    local = discovery.discover(start).config_file
+    if local is not None:
+        return local
 
     # no local config found, finding global config instead.
-    config_dir = Path(appdirs.user_config_dir("quick-commit", False))
+    candidates = get_global_config_files()
+    config_dir = candidates[0].parent
     if not config_dir.exists():
         config_dir.mkdir(parents=True)
-    config_file = config_dir / "config.yaml"
-    if not config_file.exists():
-        config_file = config_dir / "config.yml"
-    if config_file.exists():
-        return parse_config(config_file)
-    return Config()
+    return next((config_file for config_file in candidates if config_file.exists()), None)
+
+
+def get_global_config_files() -> list[Path]:
+    """Get the possible paths of the global configuration file.
+
+    Returns:
+        list[Path]: The paths in the user config directory, the first existing one is used.
+    """
+    import appdirs  # type: ignore[import-untyped]
+
+    config_dir = Path(appdirs.user_config_dir("quick-commit", False))
+    return [config_dir / name for name in GLOBAL_CONFIG_FILE_NAMES]
+
+
+def get_cache_dir() -> Path:
+    """Get the directory holding the parsed configuration files.
+
+    Returns:
+        Path: The cache directory.
+    """
+    import appdirs  # type: ignore[import-untyped]
+
+    return Path(appdirs.user_cache_dir("quick-commit", False)) / "configs"
+
+
+def load_config(config: Path) -> Config:
+    """Load a configuration file, using the parsed-config cache if it is still valid.
+
+    A cache entry is valid if the modification time and size of the configuration file did not change since it was
+    written. This avoids parsing YAML on most runs.
+
+    Args:
+        config (Path): The path to the configuration file.
+
+    Returns:
+        Config: The loaded configuration.
+    """
+    stat = config.stat()
+    cache_file = get_cache_dir() / f"{hashlib.sha256(str(config.resolve()).encode()).hexdigest()}.json"
+    try:
+        with cache_file.open("r", encoding="utf-8") as file:
+            cached = json.load(file)
+        if cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            return config_from_data(cached["data"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    data = read_config_data(config)
+    c = config_from_data(data)
+    try:
+        content = json.dumps({"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "data": data}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return c
+    import tempfile
+
+    with contextlib.suppress(OSError):
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, prefix=f".{cache_file.name}.")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(content)
+        Path(tmp_name).replace(cache_file)
+    return c
+
+
+def read_config_data(config: Path) -> Any:  # noqa: ANN401
+    """Read the raw data of a configuration file.
+
+    Args:
+        config (Path): The path to the configuration file.
+
+    Returns:
+        Any: The parsed YAML document.
+    """
+    import yaml
+
+    with config.open("r") as file:
+        return yaml.safe_load(file)
 
 
 def parse_config(config: Path | str) -> Config:
@@ -89,9 +225,21 @@ def parse_config(config: Path | str) -> Config:
     """
     if isinstance(config, str):
         config = Path(config)
-    with config.open("r") as file:
-        data = yaml.safe_load(file)
+    return config_from_data(read_config_data(config))
+
+
+def config_from_data(data: Any) -> Config:  # noqa: ANN401
+    """Build a configuration from the raw data of a configuration file.
+
+    Args:
+        data (Any): The parsed YAML document.
 
+    Raises:
+        ValueError: If the configuration is invalid.
+
+    Returns:
+        Config: The configuration.
+    """
     c = Config()
     if data is None:
         return c
@@ -158,6 +306,12 @@ def parse_config(config: Path | str) -> Config:
                 msg = "The prohibit-no-scope option must be a boolean."
                 raise ValueError(msg)
             c.prohibit_no_scope = data["scopes"]["prohibit-no-scope"]
+        ######################################### scopes->suggest-from-paths #########################################
+        if "suggest-from-paths" in data["scopes"]:
+            if not isinstance(data["scopes"]["suggest-from-paths"], bool):
+                msg = "The suggest-from-paths option must be a boolean."
+                raise ValueError(msg)
+            c.suggest_scopes_from_paths = data["scopes"]["suggest-from-paths"]
     ######################################### message->custom-pattern #########################################
     if "message" in data and "custom-pattern" in data["message"]:
         if not isinstance(data["message"]["custom-pattern"], str):
@@ -213,5 +367,57 @@ def parse_config(config: Path | str) -> Config:
             msg = "The always-enable-footer option must be a boolean."
             raise ValueError(msg)
         c.enable_footer = data["always-enable-footer"]
+    if "history" in data:
+        ######################################### history->backend #########################################
+        if "backend" in data["history"]:
+            if data["history"]["backend"] not in {"git-log", "gitpython"}:
+                msg = "The history backend must be either 'git-log' or 'gitpython'."
+                raise ValueError(msg)
+            c.history_backend = data["history"]["backend"]
+        ######################################### history->only-mine #########################################
+        if "only-mine" in data["history"]:
+            if not isinstance(data["history"]["only-mine"], bool):
+                msg = "The only-mine option must be a boolean."
+                raise ValueError(msg)
+            c.history_only_mine = data["history"]["only-mine"]
+        ######################################### history->no-merges #########################################
+        if "no-merges" in data["history"]:
+            if not isinstance(data["history"]["no-merges"], bool):
+                msg = "The no-merges option must be a boolean."
+                raise ValueError(msg)
+            c.history_no_merges = data["history"]["no-merges"]
+        ######################################### history->first-parent #########################################
+        if "first-parent" in data["history"]:
+            if not isinstance(data["history"]["first-parent"], bool):
+                msg = "The first-parent option must be a boolean."
+                raise ValueError(msg)
+            c.history_first_parent = data["history"]["first-parent"]
+    if "ranking" in data:
+        ######################################### ranking->half-life-days #########################################
+        if "half-life-days" in data["ranking"]:
+            value = data["ranking"]["half-life-days"]
+            if isinstance(value, bool) or not isinstance(value, int | float) or value <= 0:
+                msg = "The half-life-days option must be a positive number."
+                raise ValueError(msg)
+            c.ranking_half_life_days = float(value)
+        ######################################### ranking->recency-weight #########################################
+        if "recency-weight" in data["ranking"]:
+            value = data["ranking"]["recency-weight"]
+            if isinstance(value, bool) or not isinstance(value, int | float) or not 0 <= value <= 1:
+                msg = "The recency-weight option must be a number between 0 and 1."
+                raise ValueError(msg)
+            c.ranking_recency_weight = float(value)
+        ########################################### ranking->user-weight ###########################################
+        if "user-weight" in data["ranking"]:
+            value = data["ranking"]["user-weight"]
+            if isinstance(value, bool) or not isinstance(value, int | float) or not 0 <= value <= 1:
+                msg = "The user-weight option must be a number between 0 and 1."
+                raise ValueError(msg)
+            c.ranking_user_weight = float(value)
+    if "parallel-pre-commit" in data:
+        if not isinstance(data["parallel-pre-commit"], bool):
+            msg = "The parallel-pre-commit option must be a boolean."
+            raise ValueError(msg)
+        c.parallel_precommit = data["parallel-pre-commit"]
 
     return c
@@ -0,0 +1,377 @@
+"""Provides an optional per-user daemon that keeps the ranked lists of recently used repositories warm.
+
+The daemon listens on a Unix socket and answers one JSON request per connection. The results of a repository are
+kept until its `HEAD`, the branch `HEAD` points to, or its configuration file changes, so a run of quick-commit
+does not need to rank the history itself. If no daemon is running, the CLI computes everything in its own process,
+exactly as without the daemon.
+"""
+
+# ruff: noqa: T201
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from commit import discovery, tracing
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+SOCKET_ENV_VARIABLE = "QUICK_COMMIT_SOCKET"
+SOCKET_NAME = "daemon.sock"
+CONNECT_TIMEOUT = 0.1
+# a cold history scan of a large repository may take a while, the client would not be faster on its own.
+REQUEST_TIMEOUT = 60.0
+IDLE_TIMEOUT = 30 * 60
+MAX_AGE = 60 * 60
+MAX_REPOSITORIES = 32
+MAX_REQUEST_SIZE = 64 * 1024
+
+
+def get_socket_path() -> Path:
+    """Get the path of the daemon socket of the current user.
+
+    Returns:
+        Path: The path of the socket.
+    """
+    if SOCKET_ENV_VARIABLE in os.environ:
+        return Path(os.environ[SOCKET_ENV_VARIABLE])
+    if "XDG_RUNTIME_DIR" in os.environ:
+        return Path(os.environ["XDG_RUNTIME_DIR"]) / "quick-commit" / SOCKET_NAME
+    import appdirs  # type: ignore[import-untyped]
+
+    return Path(appdirs.user_cache_dir("quick-commit", False)) / SOCKET_NAME
+
+
+def send(request: dict[str, Any], timeout: float = REQUEST_TIMEOUT, path: Path | None = None) -> dict[str, Any] | None:
+    """Send a request to the daemon.
+
+    Args:
+        request (dict[str, Any]): The request.
+        timeout (float, optional): The time to wait for the response, in seconds. Defaults to REQUEST_TIMEOUT.
+        path (Path | None, optional): The path of the socket. Defaults to `get_socket_path()`.
+
+    Returns:
+        dict[str, Any] | None: The response, or None if no daemon is running or it did not answer properly.
+    """
+    path = path if path is not None else get_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(str(path))
+            client.settimeout(timeout)
+            client.sendall(json.dumps(request).encode() + b"\n")
+            with client.makefile("rb") as file:
+                response = json.loads(file.readline())
+    except (OSError, ValueError):
+        return None
+    return response if isinstance(response, dict) else None
+
+
+def fetch(kind: str, fallback: Callable[[], list[str]]) -> list[str]:
+    """Get a ranked list from the daemon, or compute it in this process if that is not possible.
+
+    Args:
+        kind (str): The list to get, one of "types", "scopes" and "gitmojis".
+        fallback (Callable[[], list[str]]): The function computing the list in this process.
+
+    Returns:
+        list[str]: The ranked list.
+    """
+    with tracing.phase("daemon.fetch"):
+        response = send({"request": kind, "cwd": str(Path.cwd())})
+    if response is not None and response.get("ok") and isinstance(response.get("result"), list):
+        return [str(item) for item in response["result"]]
+    return fallback()
+
+
+def read_text(path: Path) -> str | None:
+    """Read a small file, if it exists.
+
+    Args:
+        path (Path): The file to read.
+
+    Returns:
+        str | None: The content of the file, or None if it cannot be read.
+    """
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def get_mtime(path: Path) -> int | None:
+    """Get the modification time of a file, if it exists.
+
+    Args:
+        path (Path): The file.
+
+    Returns:
+        int | None: The modification time in nanoseconds, or None if the file does not exist.
+    """
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_state(found: discovery.Discovery) -> tuple[Any, ...]:
+    """Get everything the history and configuration of a repository depend on.
+
+    Args:
+        found (discovery.Discovery): The repository and configuration file of the working directory.
+
+    Returns:
+        tuple[Any, ...]: A value that changes whenever the history or the configuration need to be read again.
+    """
+    from commit import config
+
+    assert found.git_dir is not None
+    assert found.common_dir is not None
+    head = read_text(found.git_dir / "HEAD")
+    ref_mtime = None
+    if head is not None and head.startswith("ref: "):
+        # branches live in the common git directory, which linked worktrees share with the main working tree.
+        ref_mtime = get_mtime(found.common_dir / head[len("ref: ") :])
+    config_file = config.find_config_file(found.start)
+    return (
+        head,
+        ref_mtime,
+        get_mtime(found.common_dir / "packed-refs"),
+        str(config_file) if config_file is not None else None,
+        get_mtime(config_file) if config_file is not None else None,
+    )
+
+
+def get_usage_state() -> tuple[Any, ...]:
+    """Get the state of the usage store of the user, which changes with every commit in any repository.
+
+    Returns:
+        tuple[Any, ...]: A value that changes whenever the usage store was written to.
+    """
+    from commit import usage
+
+    database = usage.get_database_path()
+    # new commits are written to the write-ahead log of the usage store first.
+    return get_mtime(database), get_mtime(database.with_name(f"{database.name}-wal"))
+
+
+@dataclass
+class Entry:
+    """The cached results of a repository."""
+
+    state: tuple[Any, ...]
+    git_dir: Path
+    usage_state: tuple[Any, ...] | None = None
+    staged: int | None = None
+    created: float = field(default_factory=time.monotonic)
+    results: dict[str, list[str]] = field(default_factory=dict)
+
+
+@dataclass
+class DaemonState:
+    """The caches of a running daemon."""
+
+    entries: OrderedDict[Path, Entry] = field(default_factory=OrderedDict)
+    usage_state: tuple[Any, ...] | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    running: bool = True
+
+    def compute(self, kind: str, cwd: Path) -> list[str]:
+        """Get a ranked list, computing it if it is not cached or outdated.
+
+        Args:
+            kind (str): The list to get, one of "types", "scopes" and "gitmojis".
+            cwd (Path): The working directory to get the list for.
+
+        Returns:
+            list[str]: The ranked list.
+
+        Raises:
+            ValueError: If the list is unknown or the directory is not part of a git repository.
+        """
+        from commit import commits, config, history, usage
+
+        functions = {
+            "types": commits.get_commit_types,
+            "scopes": commits.get_possible_scopes,
+            "gitmojis": commits.rank_gitmojis,
+        }
+        if kind not in functions:
+            msg = f"Unknown request '{kind}'."
+            raise ValueError(msg)
+        # the package resolves repositories and configurations relative to the working directory of the process.
+        with self.lock:
+            previous = Path.cwd()
+            os.chdir(cwd)
+            try:
+                # repositories and configuration files may have been created or removed since the last request.
+                discovery.clear_cache()
+                found = discovery.discover()
+                if found.root is None or found.git_dir is None:
+                    msg = f"{cwd} is not part of a git repository."
+                    raise ValueError(msg)
+                # the store is shared by all repositories, the scores read from it are only outdated once it changes.
+                usage_state = get_usage_state()
+                if usage_state != self.usage_state:
+                    usage.clear_cache()
+                    self.usage_state = usage_state
+                # every subdirectory of a repository shares its entry, and only its own caches are ever cleared.
+                state = get_state(found)
+                entry = self.entries.get(found.root)
+                if entry is None or entry.state != state or time.monotonic() - entry.created > MAX_AGE:
+                    config.clear_cache(found.root)
+                    history.clear_cache(found.git_dir)
+                    entry = Entry(state, found.git_dir, usage_state)
+                    self.entries[found.root] = entry
+                elif entry.usage_state != usage_state:
+                    entry.results.clear()
+                    entry.usage_state = usage_state
+                self.entries.move_to_end(found.root)
+                # the scopes may be ranked by the staged files, which change without a new commit.
+                staged = get_mtime(found.git_dir / "index")
+                if entry.staged != staged and config.find_config().suggest_scopes_from_paths:
+                    entry.results.pop("scopes", None)
+                entry.staged = staged
+                while len(self.entries) > MAX_REPOSITORIES:
+                    root, evicted = self.entries.popitem(last=False)
+                    config.clear_cache(root)
+                    history.clear_cache(evicted.git_dir)
+                if kind not in entry.results:
+                    entry.results[kind] = functions[kind]()
+                return entry.results[kind]
+            finally:
+                os.chdir(previous)
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answer a request.
+
+        Args:
+            request (dict[str, Any]): The request.
+
+        Returns:
+            dict[str, Any]: The response.
+        """
+        kind = request.get("request")
+        if kind == "ping":
+            return {"ok": True, "pid": os.getpid(), "repositories": len(self.entries)}
+        if kind == "stop":
+            self.running = False
+            return {"ok": True}
+        try:
+            return {"ok": True, "result": self.compute(str(kind), Path(str(request.get("cwd"))))}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+
+def serve(path: Path | None = None, idle_timeout: float = IDLE_TIMEOUT) -> None:
+    """Run the daemon in the current process until it is stopped or idle for too long.
+
+    Args:
+        path (Path | None, optional): The path of the socket. Defaults to `get_socket_path()`.
+        idle_timeout (float, optional): The time without requests after which the daemon exits, in seconds. Defaults
+            to 30 minutes.
+    """
+    import socketserver
+
+    path = path if path is not None else get_socket_path()
+    if send({"request": "ping"}, timeout=CONNECT_TIMEOUT, path=path) is not None:
+        print("The quick-commit daemon is already running.")
+        return
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+
+    state = DaemonState()
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                request = json.loads(self.rfile.readline(MAX_REQUEST_SIZE))
+            except ValueError:
+                request = {}
+            response = state.handle(request if isinstance(request, dict) else {})
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    class Server(socketserver.UnixStreamServer):
+        timeout = idle_timeout
+        idle = False
+
+        def handle_timeout(self) -> None:
+            self.idle = True
+
+    # requests are answered one at a time, they change the working directory of the process.
+    with Server(str(path), RequestHandler) as server:
+        path.chmod(0o600)
+        try:
+            while state.running and not server.idle:
+                server.handle_request()
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def start() -> int:
+    """Start the daemon in the background.
+
+    Returns:
+        int: The exit code.
+    """
+    import subprocess
+
+    if send({"request": "ping"}, timeout=CONNECT_TIMEOUT) is not None:
+        print("The quick-commit daemon is already running.")
+        return 0
+    subprocess.Popen(  # noqa: S603
+        [sys.executable, "-m", "commit.daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    for _ in range(50):
+        time.sleep(0.1)
+        if send({"request": "ping"}, timeout=CONNECT_TIMEOUT) is not None:
+            print(f"Started the quick-commit daemon at {get_socket_path()}.")
+            return 0
+    print("Error: The quick-commit daemon did not start.")
+    return 1
+
+
+def stop() -> int:
+    """Stop a running daemon.
+
+    Returns:
+        int: The exit code.
+    """
+    if send({"request": "stop"}, timeout=CONNECT_TIMEOUT) is None:
+        print("The quick-commit daemon is not running.")
+        return 1
+    print("Stopped the quick-commit daemon.")
+    return 0
+
+
+def status() -> int:
+    """Print whether the daemon is running.
+
+    Returns:
+        int: The exit code, 0 if the daemon is running.
+    """
+    response = send({"request": "ping"}, timeout=CONNECT_TIMEOUT)
+    if response is None:
+        print("The quick-commit daemon is not running.")
+        return 1
+    print(f"The quick-commit daemon is running (pid {response.get('pid')}, {response.get('repositories')} cached).")
+    return 0
+
+
+if __name__ == "__main__":
+    serve()
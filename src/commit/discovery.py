@@ -0,0 +1,174 @@
+"""Finds the git repository and the configuration file that apply to a directory, in a single upward scan.
+
+Every directory from the start directory up to the file system root is listed at most once, and the scan stops as
+soon as both the repository and the nearest configuration file are known. `.git` files, as used by worktrees and
+submodules, are followed to the git directory they point to. The result is kept for the rest of the process.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from commit import tracing
+
+GIT_DIR_NAME = ".git"
+CONFIG_FILE_NAMES = (".quick-commit-config.yaml", ".quick-commit-config.yml")
+
+
+# not a dataclass, the commit-msg hook scans for the configuration on every commit and `dataclasses` would dominate it.
+class Discovery:
+    """The repository and the local configuration file of a directory.
+
+    Attributes:
+        start (Path): The directory the scan started from.
+        root (Path | None): The root of the working tree, None if the directory is not part of a repository.
+        git_dir (Path | None): The git directory of the working tree, e.g. `.git/worktrees/<name>` for a linked
+            worktree.
+        common_dir (Path | None): The git directory shared by all worktrees, holding the refs and the objects.
+        config_file (Path | None): The nearest local configuration file, None if there is none. The global
+            configuration file is not considered.
+    """
+
+    __slots__ = ("common_dir", "config_file", "git_dir", "root", "start")
+
+    def __init__(
+        self,
+        start: Path,
+        root: Path | None = None,
+        git_dir: Path | None = None,
+        common_dir: Path | None = None,
+        config_file: Path | None = None,
+    ) -> None:
+        """Record what a scan found.
+
+        Args:
+            start (Path): The directory the scan started from.
+            root (Path | None, optional): The root of the working tree. Defaults to None.
+            git_dir (Path | None, optional): The git directory of the working tree. Defaults to None.
+            common_dir (Path | None, optional): The git directory shared by all worktrees. Defaults to None.
+            config_file (Path | None, optional): The nearest local configuration file. Defaults to None.
+        """
+        self.start = start
+        self.root = root
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self.config_file = config_file
+
+
+def read_git_file(path: Path) -> Path | None:
+    """Follow a `.git` file to the git directory it points to.
+
+    Args:
+        path (Path): The `.git` file.
+
+    Returns:
+        Path | None: The git directory, or None if the file is not a valid `.git` file.
+    """
+    try:
+        content = path.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    git_dir = (path.parent / content[len("gitdir:") :].strip()).resolve()
+    return git_dir if git_dir.is_dir() else None
+
+
+def get_common_dir(git_dir: Path) -> Path:
+    """Get the git directory shared by all worktrees of a repository.
+
+    Args:
+        git_dir (Path): The git directory of a working tree.
+
+    Returns:
+        Path: The common git directory, `git_dir` itself unless it belongs to a linked worktree.
+    """
+    try:
+        common_dir = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return git_dir
+    return (git_dir / common_dir).resolve()
+
+
+def list_names(directory: Path) -> dict[str, bool]:
+    """List the entries of a directory.
+
+    Args:
+        directory (Path): The directory to list.
+
+    Returns:
+        dict[str, bool]: Whether each entry is a directory, by name. Empty if the directory cannot be listed.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: entry.is_dir() for entry in entries}
+    except OSError:
+        return {}
+
+
+def scan(start: Path) -> Discovery:
+    """Scan a directory and its parents for the repository and the nearest configuration file.
+
+    Args:
+        start (Path): The directory to start from.
+
+    Returns:
+        Discovery: What was found.
+    """
+    root = git_dir = config_file = None
+    current = start
+    while True:
+        names = list_names(current)
+        if config_file is None:
+            config_file = next((current / name for name in CONFIG_FILE_NAMES if name in names), None)
+        if root is None and GIT_DIR_NAME in names:
+            path = current / GIT_DIR_NAME
+            git_dir = path if names[GIT_DIR_NAME] else read_git_file(path)
+            if git_dir is not None:
+                root = current
+        if (root is not None and config_file is not None) or current.parent == current:
+            break
+        current = current.parent
+    return Discovery(
+        start,
+        root,
+        git_dir,
+        get_common_dir(git_dir) if git_dir is not None else None,
+        config_file,
+    )
+
+
+_discovered: dict[Path, Discovery] = {}
+
+
+@tracing.traced("discovery.discover")
+def discover(start: Path | None = None) -> Discovery:
+    """Get the repository and the local configuration file of a directory.
+
+    The scan runs once per directory and process.
+
+    Args:
+        start (Path | None, optional): The directory. Defaults to the current working directory.
+
+    Returns:
+        Discovery: The repository and the local configuration file.
+    """
+    start = start if start is not None else Path.cwd()
+    if start not in _discovered:
+        _discovered[start] = scan(start)
+    return _discovered[start]
+
+
+def clear_cache(root: Path | None = None) -> None:
+    """Forget the directories scanned by this process.
+
+    Args:
+        root (Path | None, optional): Only forget the directories inside this one, e.g. the working tree of a
+            repository. Defaults to all directories.
+    """
+    if root is None:
+        _discovered.clear()
+        return
+    for start in [start for start in _discovered if start.is_relative_to(root)]:
+        del _discovered[start]
@@ -0,0 +1,185 @@
+"""Provides fuzzy matching of prompt options, similar to the matching done by fzf."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+SCORE_MATCH = 16
+BONUS_BOUNDARY = 8
+BONUS_CONSECUTIVE = 4
+PENALTY_GAP_START = 3
+PENALTY_GAP_EXTENSION = 1
+
+
+def get_positions(key: str, query: str) -> list[int] | None:
+    """Find a compact alignment of a query as a subsequence of a key.
+
+    The first occurrence of the full subsequence is located by a forward scan. A backward scan from its end then
+    moves the start as far right as possible, which yields the shortest match ending there.
+
+    Args:
+        key (str): The normalized key to search in.
+        query (str): The normalized query to search for.
+
+    Returns:
+        list[int] | None: The positions of the query characters in the key, or None if the query does not match.
+    """
+    pos = -1
+    for char in query:
+        pos = key.find(char, pos + 1)
+        if pos < 0:
+            return None
+    end = pos
+    for char in reversed(query[:-1]):
+        pos = key.rfind(char, 0, pos)
+    positions = [pos]
+    for char in query[1:]:
+        pos = key.find(char, pos + 1, end + 1)
+        positions.append(pos)
+    return positions
+
+
+def get_score(key: str, positions: list[int]) -> int:
+    """Score an alignment of a query in a key.
+
+    Matches at word boundaries and runs of consecutive matches are rewarded, gaps between matches are penalised. As in
+    fzf, all characters of a consecutive run share the bonus of the run's first character if it is higher.
+
+    Args:
+        key (str): The normalized key.
+        positions (list[int]): The positions of the query characters in the key, as returned by `get_positions`.
+
+    Returns:
+        int: The score of the alignment. Higher is better.
+    """
+    score = 0
+    previous = -2
+    run_bonus = 0
+    for pos in positions:
+        bonus = BONUS_BOUNDARY if pos == 0 or not key[pos - 1].isalnum() else 0
+        if pos == previous + 1:
+            run_bonus = max(run_bonus, bonus, BONUS_CONSECUTIVE)
+            bonus = run_bonus
+        else:
+            if previous >= 0:
+                score -= PENALTY_GAP_START + PENALTY_GAP_EXTENSION * (pos - previous - 2)
+            run_bonus = bonus
+        score += SCORE_MATCH + bonus
+        previous = pos
+    return score
+
+
+def score_key(key: str, query: str) -> int | None:
+    """Score how well a query matches a key.
+
+    Contiguous occurrences of the query are preferred, especially if they start at a word boundary. Otherwise the
+    query is aligned as a subsequence.
+
+    Args:
+        key (str): The normalized key.
+        query (str): The normalized, non-empty query.
+
+    Returns:
+        int | None: The score of the match, or None if the query does not match the key.
+    """
+    pos = key.find(query)
+    if pos < 0:
+        positions = get_positions(key, query)
+        return get_score(key, positions) if positions is not None else None
+    first = pos
+    while pos >= 0:
+        if pos == 0 or not key[pos - 1].isalnum():
+            return len(query) * (SCORE_MATCH + BONUS_BOUNDARY)
+        pos = key.find(query, pos + 1)
+    return get_score(key, list(range(first, first + len(query))))
+
+
+class FuzzyIndex:
+    """A search index over a fixed list of options.
+
+    The options are normalized once when the index is created, and the results of all queries are kept for the
+    lifetime of the index. If a query extends an earlier one, only the matches of the earlier query are searched, as
+    every match of the longer query is also a match of its prefix.
+    """
+
+    def __init__(self, options: Sequence[str], keys: Sequence[str] | None = None) -> None:
+        """Create a new search index.
+
+        Args:
+            options (Sequence[str]): The options to search.
+            keys (Sequence[str] | None, optional): The texts to match for each option. Defaults to the options.
+        """
+        self.options = list(options)
+        self.keys = [key.lower() for key in (keys if keys is not None else options)]
+        self.results: dict[str, list[int]] = {"": list(range(len(self.keys)))}
+        self.candidates: dict[str, list[int]] = {"": self.results[""]}
+
+    def match(self, query: str) -> list[int]:
+        """Match a query against all options.
+
+        Args:
+            query (str): The query typed by the user.
+
+        Returns:
+            list[int]: The indices of the matching options, best match first. Options with equal scores keep their
+            original order. An empty query matches all options in their original order.
+        """
+        query = query.lower()
+        if query in self.results:
+            return self.results[query]
+
+        prefix = query[:-1]
+        while prefix not in self.candidates:
+            prefix = prefix[:-1]
+        keys = self.keys
+        first, last = query[0], query[-1]
+        best = len(query) * (SCORE_MATCH + BONUS_BOUNDARY)
+        # within an alphanumeric query, only the first character can follow a word boundary. all contiguous matches
+        # that do not start at one therefore share the same score.
+        contiguous = SCORE_MATCH + (len(query) - 1) * (SCORE_MATCH + BONUS_CONSECUTIVE) if query.isalnum() else None
+        top: list[int] = []
+        inner: list[int] = []
+        buckets: dict[int, list[int]] = {best: top}
+        for i in self.candidates[prefix]:
+            key = keys[i]
+            pos = key.find(query)
+            if pos < 0:
+                if last not in key or first not in key:
+                    continue
+                positions = get_positions(key, query)
+                if positions is not None:
+                    buckets.setdefault(get_score(key, positions), []).append(i)
+                continue
+            # contiguous matches at a word boundary are by far the most common case.
+            start = pos
+            while pos > 0 and key[pos - 1].isalnum():
+                pos = key.find(query, pos + 1)
+            if pos >= 0:
+                top.append(i)
+            elif contiguous is not None:
+                inner.append(i)
+            else:
+                buckets.setdefault(get_score(key, list(range(start, start + len(query)))), []).append(i)
+        if inner:
+            assert contiguous is not None
+            bucket = buckets.setdefault(contiguous, [])
+            # subsequence matches may score the same, equal scores keep the original order of the options.
+            bucket[:] = sorted(bucket + inner) if bucket else inner
+        result = [i for score in sorted(buckets, reverse=True) for i in buckets[score]]
+        self.results[query] = result
+        self.candidates[query] = sorted(result)
+        return result
+
+    def filter(self, query: str) -> list[str]:
+        """Match a query against all options.
+
+        Args:
+            query (str): The query typed by the user.
+
+        Returns:
+            list[str]: The matching options, best match first.
+        """
+        return [self.options[i] for i in self.match(query)]
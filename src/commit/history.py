@@ -0,0 +1,793 @@
+"""Provides a single-pass, persistent and incremental scanner over the commit history of a repository."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+from commit import config, tracing
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    import git  # type: ignore[import-not-found]
+
+    class HistorySource(Protocol):
+        """Lists the subject lines of a revision range, see `iter_git_log`."""
+
+        def __call__(
+            self, repo: git.Repo, revision: str, history_filter: HistoryFilter | None = None, /
+        ) -> Iterator[tuple[str, int] | tuple[str, int, list[str]]]:
+            """List the subject lines of a revision range.
+
+            Args:
+                repo (git.Repo): The git repository.
+                revision (str): The revision or revision range to list.
+                history_filter (HistoryFilter | None, optional): The commits to list. Defaults to all commits.
+
+            Returns:
+                Iterator[tuple[str, int] | tuple[str, int, list[str]]]: The subject line, the unix timestamp and
+                optionally the changed paths of each commit, newest first.
+            """
+            ...
+
+
+INDEX_FILE_NAME = "quick-commit-index.json"
+INDEX_VERSION = 5
+SECONDS_PER_DAY = 24 * 60 * 60
+DEFAULT_HALF_LIFE = 30 * SECONDS_PER_DAY
+# scopes almost always name one of the top directories, deeper levels would only grow the index.
+PATH_TRIE_DEPTH = 4
+COMMIT_SEPARATOR = "\x1e"
+
+
+@dataclass
+class Usage:
+    """How often and how recently something was used in the commit history.
+
+    Besides the raw count, every use contributes an exponentially decaying weight to `score`. The score is stored
+    relative to the reference time of the index it belongs to.
+    """
+
+    count: int = 0
+    last_seen: int = 0
+    score: float = 0.0
+
+    def add(self, timestamp: int, count: int = 1, score: float = 1.0) -> None:
+        """Record further uses.
+
+        Args:
+            timestamp (int): The unix timestamp of the most recent of the recorded uses.
+            count (int, optional): The number of uses to record. Defaults to 1.
+            score (float, optional): The decayed weight of the recorded uses. Defaults to 1.0.
+        """
+        self.count += count
+        self.last_seen = max(self.last_seen, timestamp)
+        self.score += score
+
+
+@dataclass
+class PathTrie:
+    """The scopes used by the commits that touched each directory, as a trie of path components.
+
+    A commit counts once for every directory (up to `PATH_TRIE_DEPTH` levels deep) containing at least one of the
+    files it touched. Files at the root of the repository are not recorded, as the root says nothing about the scope.
+    """
+
+    scopes: dict[str, int] = field(default_factory=dict)
+    children: dict[str, PathTrie] = field(default_factory=dict)
+
+    def add(self, paths: Iterable[str], scope: str) -> None:
+        """Record the files touched by a single commit.
+
+        Args:
+            paths (Iterable[str]): The paths of the touched files, relative to the root of the repository.
+            scope (str): The scope of the commit.
+        """
+        seen: set[int] = set()
+        for path in paths:
+            node = self
+            for part in path.split("/")[:-1][:PATH_TRIE_DEPTH]:
+                node = node.children.setdefault(part, PathTrie())
+                if id(node) not in seen:
+                    seen.add(id(node))
+                    node.scopes[scope] = node.scopes.get(scope, 0) + 1
+
+    def merge(self, other: PathTrie) -> None:
+        """Add the counts of another trie to this one.
+
+        Args:
+            other (PathTrie): The trie to merge into this one.
+        """
+        for scope, count in other.scopes.items():
+            self.scopes[scope] = self.scopes.get(scope, 0) + count
+        for part, child in other.children.items():
+            self.children.setdefault(part, PathTrie()).merge(child)
+
+    def lookup(self, directory: str) -> dict[str, int]:
+        """Get the scopes of the deepest recorded directory containing a given directory.
+
+        Args:
+            directory (str): The directory, relative to the root of the repository.
+
+        Returns:
+            dict[str, int]: The number of commits per scope, empty if no containing directory was recorded.
+        """
+        node = self
+        found: dict[str, int] = {}
+        for part in directory.split("/")[:PATH_TRIE_DEPTH] if directory else []:
+            if part not in node.children:
+                break
+            node = node.children[part]
+            found = node.scopes or found
+        return found
+
+    def match(self, paths: Iterable[str]) -> dict[str, float]:
+        """Score the scopes by how well they match a set of files.
+
+        Every file votes for the scopes of the deepest recorded directory containing it, in proportion to how often
+        each of them was used there.
+
+        Args:
+            paths (Iterable[str]): The paths of the files, relative to the root of the repository.
+
+        Returns:
+            dict[str, float]: The score of every scope matching at least one of the files.
+        """
+        shares: dict[str, dict[str, float]] = {}
+        scores: dict[str, float] = {}
+        for path in paths:
+            directory = path.rpartition("/")[0]
+            if directory not in shares:
+                counts = self.lookup(directory)
+                total = sum(counts.values())
+                shares[directory] = {scope: count / total for scope, count in counts.items()}
+            for scope, share in shares[directory].items():
+                scores[scope] = scores.get(scope, 0.0) + share
+        return scores
+
+    def to_data(self) -> list[Any]:
+        """Convert the trie into a compact JSON-serializable form.
+
+        Returns:
+            list[Any]: The scopes and children of the trie.
+        """
+        return [self.scopes, {part: child.to_data() for part, child in self.children.items()}]
+
+    @classmethod
+    def from_data(cls, data: list[Any]) -> PathTrie:
+        """Restore a trie from the form created by `to_data`.
+
+        Args:
+            data (list[Any]): The scopes and children of the trie.
+
+        Returns:
+            PathTrie: The restored trie.
+        """
+        scopes, children = data
+        return cls(dict(scopes), {part: cls.from_data(child) for part, child in children.items()})
+
+
+@dataclass(frozen=True)
+class HistoryFilter:
+    """Which commits of the history are counted.
+
+    The filters are passed on to the history traversal of git itself, so excluded commits are never read.
+
+    Attributes:
+        author (str | None): Only count commits by this author email. None counts all authors.
+        no_merges (bool): Skip merge commits.
+        first_parent (bool): Only follow the first parent of merge commits, i.e. skip the commits of merged branches.
+    """
+
+    author: str | None = None
+    no_merges: bool = False
+    first_parent: bool = False
+
+    def get_git_log_args(self) -> list[str]:
+        """Get the options limiting `git log` to the counted commits.
+
+        Returns:
+            list[str]: The options.
+        """
+        args = []
+        if self.author is not None:
+            # a fixed string including the brackets matches the email exactly, not as a pattern or a substring.
+            args += ["--fixed-strings", f"--author=<{self.author}>"]
+        if self.no_merges:
+            args.append("--no-merges")
+        if self.first_parent:
+            args.append("--first-parent")
+        return args
+
+    def get_iter_commits_kwargs(self) -> dict[str, Any]:
+        """Get the options limiting `git.Repo.iter_commits()` to the counted commits.
+
+        Returns:
+            dict[str, Any]: The keyword arguments, passed on to `git rev-list`.
+        """
+        kwargs: dict[str, Any] = {}
+        if self.author is not None:
+            kwargs.update(fixed_strings=True, author=f"<{self.author}>")
+        if self.no_merges:
+            kwargs["no_merges"] = True
+        if self.first_parent:
+            kwargs["first_parent"] = True
+        return kwargs
+
+    def to_data(self) -> list[Any]:
+        """Convert the filter to plain data that can be stored as JSON.
+
+        Returns:
+            list[Any]: The author, the merge and the first-parent settings.
+        """
+        return [self.author, self.no_merges, self.first_parent]
+
+    @classmethod
+    def from_data(cls, data: list[Any]) -> HistoryFilter:
+        """Restore a filter from the data created by `to_data`.
+
+        Args:
+            data (list[Any]): The stored data.
+
+        Returns:
+            HistoryFilter: The restored filter.
+        """
+        author, no_merges, first_parent = data
+        return cls(author, bool(no_merges), bool(first_parent))
+
+
+@dataclass
+class HistoryIndex:
+    """Aggregated information about the commit history up to a given commit.
+
+    All mappings are ordered by most recent use, as the history is scanned from the newest commit backwards. The
+    decayed scores of all entries are relative to `reference`, the timestamp of the newest commit recorded so far: a
+    use at time `t` contributes `2 ** ((t - reference) / half_life)`, which never exceeds 1. `paths` is only set if
+    the index was built from a history source that lists the files touched by each commit. `history_filter` selects
+    the commits that were counted.
+    """
+
+    head: str | None = None
+    scopes: dict[str, Usage] = field(default_factory=dict)
+    gitmojis: dict[str, Usage] = field(default_factory=dict)
+    types: dict[str, Usage] = field(default_factory=dict)
+    half_life: float = DEFAULT_HALF_LIFE
+    reference: int | None = None
+    paths: PathTrie | None = None
+    history_filter: HistoryFilter = field(default_factory=HistoryFilter)
+
+    @property
+    def scope_counts(self) -> dict[str, int]:
+        """The number of commits using each scope."""
+        return {scope: usage.count for scope, usage in self.scopes.items()}
+
+    @property
+    def gitmoji_counts(self) -> dict[str, int]:
+        """The number of commits using each gitmoji code (including its colons)."""
+        return {gitmoji: usage.count for gitmoji, usage in self.gitmojis.items()}
+
+    @property
+    def type_counts(self) -> dict[str, int]:
+        """The number of commits using each commit type."""
+        return {commit_type: usage.count for commit_type, usage in self.types.items()}
+
+    def add(self, message: str, timestamp: int, paths: Iterable[str] | None = None) -> None:
+        """Record a single commit, which must be older than all commits recorded so far.
+
+        Args:
+            message (str): The commit message.
+            timestamp (int): The unix timestamp of the commit.
+            paths (Iterable[str] | None, optional): The files touched by the commit, if the history source lists them.
+                Defaults to None.
+        """
+        commit_type, scope, gitmoji = parse_header(message)
+        if paths is not None:
+            if self.paths is None:
+                self.paths = PathTrie()
+            if scope:
+                self.paths.add(paths, scope)
+        if not commit_type and not scope and gitmoji is None:
+            return
+        if self.reference is None or timestamp > self.reference:
+            self.move_reference(timestamp)
+            weight = 1.0
+        else:
+            weight = 2.0 ** ((timestamp - self.reference) / self.half_life)
+        if commit_type:
+            self.types.setdefault(commit_type, Usage()).add(timestamp, score=weight)
+        if scope:
+            self.scopes.setdefault(scope, Usage()).add(timestamp, score=weight)
+        if gitmoji is not None:
+            self.gitmojis.setdefault(gitmoji, Usage()).add(timestamp, score=weight)
+
+    def move_reference(self, reference: int) -> None:
+        """Make all decayed scores relative to a new reference time.
+
+        Args:
+            reference (int): The new reference timestamp.
+        """
+        if self.reference is not None:
+            factor = 2.0 ** ((self.reference - reference) / self.half_life)
+            for usages in (self.scopes, self.gitmojis, self.types):
+                for usage in usages.values():
+                    usage.score *= factor
+        self.reference = reference
+
+    def merge_older(self, older: HistoryIndex) -> None:
+        """Merge an index that describes older commits into this one.
+
+        Entries only seen in the older index are appended at the end, which keeps the order of most recent use.
+
+        Args:
+            older (HistoryIndex): The index describing commits that precede the ones in this index.
+        """
+        if older.reference is None:
+            return
+        if self.reference is None or older.reference > self.reference:
+            self.move_reference(older.reference)
+            factor = 1.0
+        else:
+            factor = 2.0 ** ((older.reference - self.reference) / self.half_life)
+        for mine, theirs in ((self.scopes, older.scopes), (self.gitmojis, older.gitmojis), (self.types, older.types)):
+            for key, usage in theirs.items():
+                mine.setdefault(key, Usage()).add(usage.last_seen, usage.count, usage.score * factor)
+        if older.paths is not None:
+            if self.paths is None:
+                self.paths = PathTrie()
+            self.paths.merge(older.paths)
+
+
+def get_scope(message: str) -> str:
+    """Extract the scope from a commit message.
+
+    Args:
+        message (str): The commit message.
+
+    Returns:
+        str: The scope of the commit, or an empty string if it has none.
+    """
+    front = message.split(":")[0]
+    if "(" in front and ")" in front:
+        return front[front.index("(") + 1 : front.index(")")]
+    return ""
+
+
+def get_commit_type(message: str) -> str:
+    """Extract the commit type from a commit message.
+
+    Args:
+        message (str): The commit message.
+
+    Returns:
+        str: The commit type, or an empty string if the message does not start with one.
+    """
+    if ":" not in message:
+        return ""
+    commit_type = message.split(":")[0].split("(")[0].rstrip("!")
+    return commit_type if re.fullmatch(r"[\w-]+", commit_type) else ""
+
+
+def get_gitmoji(message: str) -> str | None:
+    """Extract the gitmoji code from a commit message.
+
+    Args:
+        message (str): The commit message.
+
+    Returns:
+        str | None: The gitmoji code including its colons, or None if the message has no gitmoji.
+    """
+    if message.count(":") < 3:
+        return None
+    gitmoji = message.split(":")[2]
+    if gitmoji != gitmoji.strip():
+        return None
+    return f":{gitmoji}:"
+
+
+def parse_header(message: str) -> tuple[str, str, str | None]:
+    """Extract the commit type, scope and gitmoji from a commit message.
+
+    Args:
+        message (str): The commit message.
+
+    Returns:
+        tuple[str, str, str | None]: The commit type, the scope and the gitmoji code of the message.
+    """
+    return get_commit_type(message), get_scope(message), get_gitmoji(message)
+
+
+def scan_commits(
+    commits: Iterable[tuple[str, int] | tuple[str, int, list[str]]], half_life: float = DEFAULT_HALF_LIFE
+) -> HistoryIndex:
+    """Build an index from a sequence of commits.
+
+    Args:
+        commits (Iterable[tuple[str, int] | tuple[str, int, list[str]]]): The subject lines and unix timestamps of the
+            commits, newest first, optionally followed by the files touched by each commit.
+        half_life (float, optional): The half-life of the decayed scores in seconds. Defaults to 30 days.
+
+    Returns:
+        HistoryIndex: The index describing the given commits.
+    """
+    index = HistoryIndex(half_life=half_life)
+    for subject, timestamp, *paths in commits:
+        index.add(subject, timestamp, *paths)
+    return index
+
+
+def iter_git_log(
+    repo: git.Repo, revision: str, history_filter: HistoryFilter | None = None
+) -> Iterator[tuple[str, int]]:
+    """Stream the subject lines of a revision range from a single `git log` process.
+
+    Only one line per commit is held in memory at a time.
+
+    Args:
+        repo (git.Repo): The git repository.
+        revision (str): The revision or revision range to list.
+        history_filter (HistoryFilter | None, optional): The commits to list. Defaults to all commits.
+
+    Yields:
+        tuple[str, int]: The subject line and the unix timestamp of each commit, newest first.
+    """
+    process = subprocess.Popen(  # noqa: S603
+        [  # noqa: S607
+            "git",
+            f"--git-dir={repo.git_dir}",
+            "log",
+            "--format=%ct %s",
+            *(history_filter or HistoryFilter()).get_git_log_args(),
+            revision,
+            "--",
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        encoding="utf-8",
+        errors="replace",
+    )
+    assert process.stdout is not None
+    try:
+        for line in process.stdout:
+            timestamp, _, subject = line.rstrip("\n").partition(" ")
+            yield subject, int(timestamp)
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+def iter_git_log_paths(
+    repo: git.Repo, revision: str, history_filter: HistoryFilter | None = None
+) -> Iterator[tuple[str, int, list[str]]]:
+    """Stream the subject lines and touched files of a revision range from a single `git log` process.
+
+    Merge commits list no files, the files they bring in are recorded with the commits that changed them.
+
+    Args:
+        repo (git.Repo): The git repository.
+        revision (str): The revision or revision range to list.
+        history_filter (HistoryFilter | None, optional): The commits to list. Defaults to all commits.
+
+    Yields:
+        tuple[str, int, list[str]]: The subject line, the unix timestamp and the touched files of each commit, newest
+            first.
+    """
+    process = subprocess.Popen(  # noqa: S603
+        [  # noqa: S607
+            "git",
+            f"--git-dir={repo.git_dir}",
+            "-c",
+            "core.quotePath=false",
+            "log",
+            f"--format={COMMIT_SEPARATOR}%ct %s",
+            "--name-only",
+            "--no-renames",
+            *(history_filter or HistoryFilter()).get_git_log_args(),
+            revision,
+            "--",
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        encoding="utf-8",
+        errors="replace",
+    )
+    assert process.stdout is not None
+    try:
+        current: tuple[str, int, list[str]] | None = None
+        for line in process.stdout:
+            line = line.rstrip("\n")  # noqa: PLW2901
+            if line.startswith(COMMIT_SEPARATOR):
+                if current is not None:
+                    yield current
+                timestamp, _, subject = line[len(COMMIT_SEPARATOR) :].partition(" ")
+                current = (subject, int(timestamp), [])
+            elif line and current is not None:
+                current[2].append(line)
+        if current is not None:
+            yield current
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+def iter_gitpython(
+    repo: git.Repo, revision: str, history_filter: HistoryFilter | None = None
+) -> Iterator[tuple[str, int]]:
+    """List the subject lines of a revision range using GitPython commit objects.
+
+    Args:
+        repo (git.Repo): The git repository.
+        revision (str): The revision or revision range to list.
+        history_filter (HistoryFilter | None, optional): The commits to list. Defaults to all commits.
+
+    Yields:
+        tuple[str, int]: The subject line and the unix timestamp of each commit, newest first.
+    """
+    for commit in repo.iter_commits(revision, **(history_filter or HistoryFilter()).get_iter_commits_kwargs()):
+        summary = commit.summary
+        # GitPython keeps the raw bytes of messages it cannot decode with the commit's encoding.
+        yield summary if isinstance(summary, str) else summary.decode(errors="replace"), commit.committed_date
+
+
+HISTORY_SOURCES: dict[str, HistorySource] = {
+    "git-log": iter_git_log,
+    "gitpython": iter_gitpython,
+}
+
+
+def get_history_source(name: str = "git-log") -> HistorySource:
+    """Get a history source by its name.
+
+    The `git-log` source falls back to GitPython if no `git` executable is available.
+
+    Args:
+        name (str, optional): The name of the history source. Defaults to "git-log".
+
+    Raises:
+        ValueError: If no history source with the given name exists.
+
+    Returns:
+        HistorySource: The history source.
+    """
+    if name not in HISTORY_SOURCES:
+        msg = f"Unknown history backend '{name}'. Available backends: {', '.join(HISTORY_SOURCES)}."
+        raise ValueError(msg)
+    if name == "git-log" and shutil.which("git") is None:
+        name = "gitpython"
+    return HISTORY_SOURCES[name]
+
+
+def get_index_path(repo: git.Repo) -> Path:
+    """Get the path of the history index for a repository.
+
+    Args:
+        repo (git.Repo): The git repository.
+
+    Returns:
+        Path: The path of the index file inside the git directory.
+    """
+    return Path(repo.git_dir) / INDEX_FILE_NAME
+
+
+def load_index(repo: git.Repo) -> HistoryIndex:
+    """Load the stored history index of a repository.
+
+    Args:
+        repo (git.Repo): The git repository.
+
+    Returns:
+        HistoryIndex: The stored index, or an empty index if none exists or it cannot be read.
+    """
+    try:
+        with get_index_path(repo).open("r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return HistoryIndex()
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return HistoryIndex()
+    return HistoryIndex(
+        head=data.get("head"),
+        scopes={key: Usage(*value) for key, value in data.get("scopes", {}).items()},
+        gitmojis={key: Usage(*value) for key, value in data.get("gitmojis", {}).items()},
+        types={key: Usage(*value) for key, value in data.get("types", {}).items()},
+        half_life=data.get("half_life", DEFAULT_HALF_LIFE),
+        reference=data.get("reference"),
+        paths=PathTrie.from_data(data["paths"]) if data.get("paths") is not None else None,
+        history_filter=HistoryFilter.from_data(data["filter"]) if "filter" in data else HistoryFilter(),
+    )
+
+
+def save_index(repo: git.Repo, index: HistoryIndex) -> None:
+    """Store the history index of a repository.
+
+    The file is replaced atomically. Failing to write the index is not an error, as it only serves as a cache.
+
+    Args:
+        repo (git.Repo): The git repository.
+        index (HistoryIndex): The index to store.
+    """
+    path = get_index_path(repo)
+    data = {
+        "version": INDEX_VERSION,
+        "head": index.head,
+        "scopes": {key: [usage.count, usage.last_seen, usage.score] for key, usage in index.scopes.items()},
+        "gitmojis": {key: [usage.count, usage.last_seen, usage.score] for key, usage in index.gitmojis.items()},
+        "types": {key: [usage.count, usage.last_seen, usage.score] for key, usage in index.types.items()},
+        "half_life": index.half_life,
+        "reference": index.reference,
+        "paths": index.paths.to_data() if index.paths is not None else None,
+        "filter": index.history_filter.to_data(),
+    }
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{INDEX_FILE_NAME}.")
+    except OSError:
+        return
+    tmp = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        tmp.replace(path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
+def is_ancestor(repo: git.Repo, ancestor: str, rev: str) -> bool:
+    """Check whether a commit is an ancestor of another one.
+
+    Args:
+        repo (git.Repo): The git repository.
+        ancestor (str): The sha of the potential ancestor.
+        rev (str): The sha of the descendant.
+
+    Returns:
+        bool: True if `ancestor` exists and is an ancestor of `rev`.
+    """
+    from git.exc import GitCommandError  # type: ignore[import-not-found]
+
+    try:
+        # exits with 1 if it is not an ancestor, which GitPython raises like any other failure.
+        repo.git.merge_base("--is-ancestor", ancestor, rev)
+    except GitCommandError:
+        return False
+    return True
+
+
+def update_index(
+    repo: git.Repo,
+    source: HistorySource | None = None,
+    half_life: float = DEFAULT_HALF_LIFE,
+    track_paths: bool = False,
+    history_filter: HistoryFilter | None = None,
+) -> HistoryIndex:
+    """Bring the history index of a repository up to date with its HEAD.
+
+    Only commits added since the last indexed commit are scanned. If that commit is no longer an ancestor of HEAD
+    (e.g. after a rebase or a force-push), or the index was built with a different half-life, filter or without the
+    requested path trie, the index is rebuilt from scratch.
+
+    Args:
+        repo (git.Repo): The git repository.
+        source (HistorySource | None, optional): The history source to read commits from. Defaults to the `git-log`
+            source. It is ignored if `track_paths` is set.
+        half_life (float, optional): The half-life of the decayed scores in seconds. Defaults to 30 days.
+        track_paths (bool, optional): Determine if the scopes used per directory are recorded as well. Defaults to
+            False.
+        history_filter (HistoryFilter | None, optional): The commits to count. Defaults to all commits.
+
+    Returns:
+        HistoryIndex: The up-to-date index.
+    """
+    history_filter = history_filter or HistoryFilter()
+    if not repo.head.is_valid():
+        return HistoryIndex(
+            half_life=half_life, paths=PathTrie() if track_paths else None, history_filter=history_filter
+        )
+    head = repo.head.commit.hexsha
+    stored = load_index(repo)
+    if (
+        stored.half_life != half_life
+        or (stored.paths is not None) != track_paths
+        or stored.history_filter != history_filter
+    ):
+        stored = HistoryIndex(half_life=half_life)
+    if stored.head == head:
+        return stored
+
+    if track_paths:
+        source = iter_git_log_paths
+    elif source is None:
+        source = get_history_source()
+    if stored.head is not None and is_ancestor(repo, stored.head, head):
+        index = scan_commits(source(repo, f"{stored.head}..{head}", history_filter), half_life)
+        index.merge_older(stored)
+    else:
+        index = scan_commits(source(repo, head, history_filter), half_life)
+    index.head = head
+    index.history_filter = history_filter
+    save_index(repo, index)
+    return index
+
+
+def get_history_filter(repo: git.Repo, conf: config.Config) -> HistoryFilter:
+    """Get the commits of a repository counted by a configuration.
+
+    Args:
+        repo (git.Repo): The git repository.
+        conf (config.Config): The configuration.
+
+    Returns:
+        HistoryFilter: The filter. Without a configured `user.email`, `only-mine` counts the commits of all authors.
+    """
+    author = None
+    if conf.history_only_mine:
+        with contextlib.suppress(OSError):
+            result = subprocess.run(  # noqa: S603
+                ["git", f"--git-dir={repo.git_dir}", "config", "user.email"],  # noqa: S607
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            author = result.stdout.strip() or None
+    return HistoryFilter(author, conf.history_no_merges, conf.history_first_parent)
+
+
+_scanned: dict[str, HistoryIndex] = {}
+_scan_lock = threading.Lock()
+
+
+@tracing.traced("history.scan_history")
+def scan_history(repo: git.Repo) -> HistoryIndex:
+    """Get the aggregated commit history of a repository.
+
+    The history is only read once per process and repository, every later call returns the same object. Concurrent
+    callers wait for the scan that is already running instead of starting another one.
+
+    Args:
+        repo (git.Repo): The git repository.
+
+    Returns:
+        HistoryIndex: The aggregated history of the repository.
+    """
+    key = str(Path(repo.git_dir).resolve())
+    with _scan_lock:
+        if key not in _scanned:
+            conf = config.find_config()
+            _scanned[key] = update_index(
+                repo,
+                get_history_source(conf.history_backend),
+                conf.ranking_half_life_days * SECONDS_PER_DAY,
+                # the touched files are only listed by `git log`.
+                conf.suggest_scopes_from_paths and shutil.which("git") is not None,
+                get_history_filter(repo, conf),
+            )
+        return _scanned[key]
+
+
+def clear_cache(git_dir: Path | None = None) -> None:
+    """Forget the histories scanned by this process.
+
+    Args:
+        git_dir (Path | None, optional): Only forget the history of the repository with this git directory. Defaults to
+            all repositories.
+    """
+    with _scan_lock:
+        if git_dir is None:
+            _scanned.clear()
+        else:
+            _scanned.pop(str(git_dir.resolve()), None)
@@ -0,0 +1,128 @@
+"""Provides the `commit-msg` git hook, which checks messages written without quick-commit.
+
+The hook runs on every commit, so it only imports what checking a single header needs. In particular, it neither
+imports GitPython nor reads the history. The rules derived from the configuration are read from a cache in the git
+directory, so that neither the configuration nor the gitmoji catalogue is loaded unless one of them changed.
+"""
+
+# ruff: noqa: T201
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+HOOK_MARKER = "# installed by quick-commit"
+# set for the commits created by quick-commit itself, their messages were checked while they were written.
+VALIDATED_ENV_VARIABLE = "QUICK_COMMIT_VALIDATED"
+# messages generated by git itself, or meant to be squashed into another commit later.
+SKIPPED_PREFIXES = ("Merge ", 'Revert "', "fixup! ", "squash! ", "amend! ")
+
+
+def get_header(message: str) -> str:
+    """Get the header of a commit message as git will store it.
+
+    Args:
+        message (str): The content of the commit message file.
+
+    Returns:
+        str: The first line that is neither empty nor a comment.
+    """
+    for line in message.splitlines():
+        if line.strip() and not line.startswith("#"):
+            return line.rstrip()
+    return ""
+
+
+def check_message_file(path: Path) -> list[str]:
+    """Check the commit message file passed to the hook.
+
+    Args:
+        path (Path): The commit message file.
+
+    Returns:
+        list[str]: A description of every problem found, empty if the message is valid.
+    """
+    header = get_header(path.read_text(encoding="utf-8", errors="replace"))
+    if not header or header.startswith(SKIPPED_PREFIXES):
+        return []
+
+    from commit import lint
+
+    return lint.check_header(header, lint.get_rules())
+
+
+def main() -> None:
+    """Run the `commit-msg` hook on the message file given as the only argument."""
+    if len(sys.argv) != 2:
+        print("usage: quick-commit-hook <commit-message-file>", file=sys.stderr)
+        sys.exit(2)
+    if os.environ.get(VALIDATED_ENV_VARIABLE):
+        return
+    errors = check_message_file(Path(sys.argv[1]))
+    if errors:
+        print("quick-commit: invalid commit message:", file=sys.stderr)
+        for error in errors:
+            print(f"  - {error}", file=sys.stderr)
+        print("Use 'git commit --no-verify' to commit anyway.", file=sys.stderr)
+        sys.exit(1)
+
+
+def get_hook_path() -> Path:
+    """Get the path of the `commit-msg` hook of the current repository, honouring `core.hooksPath`.
+
+    Returns:
+        Path: The path of the hook.
+    """
+    import subprocess
+
+    result = subprocess.run(  # noqa: S603
+        ["git", "rev-parse", "--git-path", "hooks/commit-msg"],  # noqa: S607
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return Path(result.stdout.strip())
+
+
+def get_hook_script() -> str:
+    """Get the content of the hook script.
+
+    The script calls the current interpreter directly, so it also works outside of the environment quick-commit is
+    installed in.
+
+    Returns:
+        str: The hook script.
+    """
+    return f'#!/bin/sh\n{HOOK_MARKER}\nexec "{sys.executable}" -m commit.hook "$1"\n'
+
+
+def install_hook(force: bool = False) -> int:
+    """Install the `commit-msg` hook in the current repository.
+
+    Args:
+        force (bool, optional): Determine if a hook that was not installed by quick-commit is replaced. Defaults to
+            False.
+
+    Returns:
+        int: The exit code.
+    """
+    from subprocess import CalledProcessError
+
+    try:
+        path = get_hook_path()
+    except CalledProcessError:
+        print("Error: Not a git repository.")
+        return 1
+    if path.exists() and HOOK_MARKER not in path.read_text(encoding="utf-8", errors="replace") and not force:
+        print(f"Error: {path} already exists. Use --force to replace it.")
+        return 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(get_hook_script(), encoding="utf-8")
+    path.chmod(0o755)
+    print(f"Installed the commit-msg hook at {path}.")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
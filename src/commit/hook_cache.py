@@ -0,0 +1,84 @@
+"""Remembers the staged content the pre-commit hooks passed for, so that they are not run again for it.
+
+A successful run is recorded against the id of the staged tree and a hash of the pre-commit configuration, in a small
+file inside the git directory. Only the most recent successes are kept.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+from commit import discovery
+
+PRECOMMIT_CONFIG = ".pre-commit-config.yaml"
+CACHE_FILE = "quick-commit-pre-commit.json"
+CACHE_SIZE = 16
+
+
+def get_key() -> str | None:
+    """Identify what the pre-commit hooks check: the staged content and the pre-commit configuration.
+
+    `git write-tree` stores the staged tree in the object database if needed and returns its id, which only changes
+    if the staged content changes.
+
+    Returns:
+        str | None: The key, or None if it cannot be determined, e.g. during a merge with conflicts.
+    """
+    tree = subprocess.run(["git", "write-tree"], capture_output=True, text=True, check=False)  # noqa: S607 S603
+    if tree.returncode != 0:
+        return None
+    try:
+        config_hash = hashlib.sha256(Path(PRECOMMIT_CONFIG).read_bytes()).hexdigest()
+    except OSError:
+        return None
+    return f"{tree.stdout.strip()}:{config_hash}"
+
+
+def get_cache_path() -> Path | None:
+    """Get the path of the file recording the staged trees the pre-commit hooks passed for.
+
+    Returns:
+        Path | None: The path inside the git directory, or None if the current directory is not part of a repository.
+    """
+    git_dir = discovery.discover().git_dir
+    return git_dir / CACHE_FILE if git_dir is not None else None
+
+
+def load(path: Path) -> list[str]:
+    """Load the keys the pre-commit hooks passed for.
+
+    Args:
+        path (Path): The path of the cache file.
+
+    Returns:
+        list[str]: The keys, oldest first. Empty if the file does not exist or cannot be read.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    return [key for key in data if isinstance(key, str)] if isinstance(data, list) else []
+
+
+def record(path: Path, key: str) -> None:
+    """Remember that the pre-commit hooks passed for a key.
+
+    Failing to write the file is not an error, as it only serves as a cache.
+
+    Args:
+        path (Path): The path of the cache file.
+        key (str): The key the hooks passed for.
+    """
+    keys = [cached for cached in load(path) if cached != key]
+    keys = [*keys, key][-CACHE_SIZE:]
+    with contextlib.suppress(OSError):
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(keys, file)
+        Path(tmp_name).replace(path)
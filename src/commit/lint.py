@@ -0,0 +1,426 @@
+"""Checks the commit messages of existing commits against the configuration."""
+
+# ruff: noqa: T201
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+import sys
+from itertools import chain, islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from commit import discovery
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from concurrent.futures import Future
+
+HEADER_PATTERN = re.compile(
+    # breaking changes are marked before the colon by conventional commits, and after it by quick-commit itself.
+    r"(?P<type>[\w-]+)(?:\((?P<scope>[^()]*)\))?!?:!? (?P<gitmoji>:[^:\s]+:|\S+) (?P<message>.*)"
+)
+HEADER_FORMAT = "<type>(<scope>): <gitmoji> <message>"
+CHUNK_SIZE = 4096
+# the chunks submitted to the pool ahead of the results being consumed, per worker process.
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+RULES_CACHE_FILE = "quick-commit-rules.json"
+RULES_CACHE_VERSION = 1
+# the modules defining the default commit types and gitmojis, the cached rules are rebuilt if they change.
+RULES_SOURCES = ("commits.py", "config.py", "lint.py")
+
+
+class Rules:
+    """Everything a commit header is checked against.
+
+    The commit-msg hook loads this module on every commit, so the rules are a plain class rather than a dataclass
+    and hold no `config.Config`.
+    """
+
+    __slots__ = (
+        "commit_types",
+        "excluded_scope_patterns",
+        "excluded_scopes",
+        "gitmojis",
+        "message_pattern",
+        "message_regex",
+        "prohibit_no_scope",
+    )
+
+    def __init__(
+        self,
+        commit_types: Iterable[str],
+        gitmojis: Iterable[str],
+        excluded_scopes: Iterable[str] = (),
+        prohibit_no_scope: bool = False,
+        message_pattern: str | None = None,
+    ) -> None:
+        """Create a set of rules.
+
+        Args:
+            commit_types (Iterable[str]): The allowed commit types.
+            gitmojis (Iterable[str]): The allowed gitmojis, as codes and icons.
+            excluded_scopes (Iterable[str], optional): The patterns of the excluded scopes. Defaults to ().
+            prohibit_no_scope (bool, optional): Determine if a scope is required. Defaults to False.
+            message_pattern (str | None, optional): The custom message pattern. Defaults to None.
+        """
+        self.commit_types = frozenset(commit_types)
+        self.gitmojis = frozenset(gitmojis)
+        self.excluded_scopes = tuple(excluded_scopes)
+        self.excluded_scope_patterns = [re.compile(scope) for scope in self.excluded_scopes]
+        self.prohibit_no_scope = prohibit_no_scope
+        self.message_pattern = message_pattern
+        self.message_regex = re.compile(message_pattern) if message_pattern is not None else None
+
+    @classmethod
+    def from_config(cls) -> Rules:
+        """Collect the rules of the configuration of the current working directory.
+
+        Returns:
+            Rules: The rules.
+        """
+        from commit import commits, config
+
+        conf = config.find_config()
+        gitmojis: set[str] = set()
+        for gm in commits.get_allowed_gitmojis().values():
+            gitmojis.update((gm.code, gm.icon))
+        return cls(
+            commits.get_allowed_commit_types(),
+            gitmojis,
+            conf.excluded_scopes,
+            conf.prohibit_no_scope,
+            conf.message_pattern,
+        )
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> Rules:
+        """Restore rules stored by `to_data`.
+
+        Args:
+            data (dict[str, Any]): The stored rules.
+
+        Returns:
+            Rules: The rules.
+        """
+        return cls(
+            data["commit_types"],
+            data["gitmojis"],
+            data["excluded_scopes"],
+            data["prohibit_no_scope"],
+            data["message_pattern"],
+        )
+
+    def to_data(self) -> dict[str, Any]:
+        """Convert the rules to plain data that can be stored as JSON.
+
+        Returns:
+            dict[str, Any]: The rules.
+        """
+        return {
+            "commit_types": sorted(self.commit_types),
+            "gitmojis": sorted(self.gitmojis),
+            "excluded_scopes": list(self.excluded_scopes),
+            "prohibit_no_scope": self.prohibit_no_scope,
+            "message_pattern": self.message_pattern,
+        }
+
+
+def get_file_state(path: Path) -> list[int] | None:
+    """Get what identifies the content of a file without reading it.
+
+    Args:
+        path (Path): The file.
+
+    Returns:
+        list[int] | None: The modification time in nanoseconds and the size, or None if the file does not exist.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def get_rule_files(config_file: Path | None) -> list[Path]:
+    """Get the files the rules of a directory are built from.
+
+    Args:
+        config_file (Path | None): The local configuration file of the directory, if there is one.
+
+    Returns:
+        list[Path]: The configuration files that may apply and the modules defining the defaults.
+    """
+    package = Path(__file__).parent
+    sources = [package / name for name in RULES_SOURCES]
+    if config_file is not None:
+        return [config_file, *sources]
+
+    from commit import config
+
+    return [*config.get_global_config_files(), *sources]
+
+
+def get_rules() -> Rules:
+    """Get the rules of the current working directory, from the rules cache of the repository if it is still valid.
+
+    The cache is valid as long as the modification time and size of every file the rules were built from did not
+    change, and no local configuration file was added or removed. A valid cache spares loading the configuration
+    and the gitmoji catalogue.
+
+    Returns:
+        Rules: The rules.
+    """
+    found = discovery.discover()
+    if found.git_dir is None:
+        return Rules.from_config()
+    path = found.git_dir / RULES_CACHE_FILE
+    config_file = str(found.config_file) if found.config_file is not None else None
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+        if (
+            cached["version"] == RULES_CACHE_VERSION
+            and cached["config_file"] == config_file
+            and all(get_file_state(Path(name)) == state for name, state in cached["files"].items())
+        ):
+            return Rules.from_data(cached["rules"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+    # the files are looked at before the rules are built, a change in between invalidates the cache.
+    files = {str(file): get_file_state(file) for file in get_rule_files(found.config_file)}
+    rules = Rules.from_config()
+    content = {"version": RULES_CACHE_VERSION, "config_file": config_file, "files": files, "rules": rules.to_data()}
+    import tempfile
+
+    with contextlib.suppress(OSError):
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(content, file, ensure_ascii=False)
+        Path(tmp_name).replace(path)
+    return rules
+
+
+def check_message(msg: str, message_regex: re.Pattern[str] | None = None) -> tuple[bool, str]:
+    """Check if the message part of a commit header is valid.
+
+    Args:
+        msg (str): The commit message to check.
+        message_regex (re.Pattern[str] | None, optional): The custom message pattern. Defaults to the built-in rules.
+
+    Returns:
+        tuple[bool, str]: A tuple containing a boolean indicating if the message is valid and the message itself.
+    """
+    if msg.startswith("!"):
+        return True, msg[1:]
+
+    if message_regex is not None:
+        return message_regex.search(msg) is not None, msg
+
+    msg = msg.strip()
+    if not msg:
+        return False, msg
+    if msg.endswith("."):
+        return False, msg
+    if msg[0].isupper():
+        return False, msg
+    return True, msg
+
+
+def check_header(header: str, rules: Rules) -> list[str]:
+    """Check a commit header.
+
+    Args:
+        header (str): The first line of the commit message.
+        rules (Rules): The rules to check against.
+
+    Returns:
+        list[str]: A description of every problem found, empty if the header is valid.
+    """
+    match = HEADER_PATTERN.fullmatch(header)
+    if match is None:
+        return [f"header does not match '{HEADER_FORMAT}'"]
+    errors = []
+    if match["type"] not in rules.commit_types:
+        errors.append(f"unknown commit type '{match['type']}'")
+    scope = match["scope"] or ""
+    if not scope and rules.prohibit_no_scope:
+        errors.append("missing scope")
+    elif scope and any(pattern.fullmatch(scope) for pattern in rules.excluded_scope_patterns):
+        errors.append(f"excluded scope '{scope}'")
+    if match["gitmoji"] not in rules.gitmojis:
+        errors.append(f"unknown gitmoji '{match['gitmoji']}'")
+    if not check_message(match["message"], rules.message_regex)[0]:
+        errors.append("message does not follow the message rules")
+    return errors
+
+
+def iter_headers(revision_range: str, include_merges: bool = False) -> Iterator[tuple[str, str]]:
+    """Stream the headers of a revision range from a single `git log` process.
+
+    Args:
+        revision_range (str): The revision or revision range to list.
+        include_merges (bool, optional): Determine if merge commits are listed. Defaults to False.
+
+    Yields:
+        tuple[str, str]: The sha and the header of each commit, newest first.
+
+    Raises:
+        ValueError: If the revision range can not be listed.
+    """
+    import subprocess
+
+    args = ["git", "log", "--format=%H %s", *([] if include_merges else ["--no-merges"]), revision_range, "--"]
+    process = subprocess.Popen(  # noqa: S603
+        args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        encoding="utf-8",
+        errors="replace",
+    )
+    assert process.stdout is not None
+    assert process.stderr is not None
+    try:
+        for line in process.stdout:
+            sha, _, header = line.rstrip("\n").partition(" ")
+            yield sha, header
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        error = process.stderr.read().strip()
+        process.stderr.close()
+    if process.wait() != 0:
+        msg = error or f"Could not list the commits of '{revision_range}'."
+        raise ValueError(msg)
+
+
+_worker_rules: Rules | None = None
+
+
+def init_worker(rules: Rules) -> None:
+    """Keep the rules in a worker process, so that they are only sent once.
+
+    Args:
+        rules (Rules): The rules to check against.
+    """
+    global _worker_rules  # noqa: PLW0603
+    _worker_rules = rules
+
+
+def check_chunk(chunk: list[tuple[str, str]], rules: Rules | None = None) -> list[tuple[str, str, list[str]]]:
+    """Check a chunk of commit headers.
+
+    Args:
+        chunk (list[tuple[str, str]]): The sha and header of each commit.
+        rules (Rules | None, optional): The rules to check against. Defaults to the rules of the worker process.
+
+    Returns:
+        list[tuple[str, str, list[str]]]: The sha, header and problems of each commit.
+    """
+    rules = rules if rules is not None else _worker_rules
+    assert rules is not None
+    return [(sha, header, check_header(header, rules)) for sha, header in chunk]
+
+
+def iter_chunks(items: Iterable[tuple[str, str]], size: int) -> Iterator[list[tuple[str, str]]]:
+    """Split a stream of commits into chunks.
+
+    Args:
+        items (Iterable[tuple[str, str]]): The commits.
+        size (int): The maximum size of each chunk.
+
+    Yields:
+        list[tuple[str, str]]: The chunks.
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def lint(
+    revision_range: str,
+    rules: Rules,
+    jobs: int | None = None,
+    include_merges: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[str, str, list[str]]]:
+    """Check every commit of a revision range.
+
+    The commits are checked in the current process if they fit into a single chunk, and spread across a process pool
+    otherwise. Only a few chunks per worker are read ahead of the results being consumed, so the memory used does not
+    grow with the size of the revision range. The results keep the order of `git log`.
+
+    Args:
+        revision_range (str): The revision or revision range to check.
+        rules (Rules): The rules to check against.
+        jobs (int | None, optional): The number of worker processes. Defaults to the number of CPUs.
+        include_merges (bool, optional): Determine if merge commits are checked. Defaults to False.
+        chunk_size (int, optional): The number of commits sent to a worker at once. Defaults to CHUNK_SIZE.
+
+    Yields:
+        tuple[str, str, list[str]]: The sha, header and problems of each commit.
+    """
+    chunks = iter_chunks(iter_headers(revision_range, include_merges), chunk_size)
+    first = next(chunks, [])
+    second = next(chunks, None)
+    if second is None or jobs == 1:
+        for chunk in chain([first], [second] if second is not None else [], chunks):
+            yield from check_chunk(chunk, rules)
+        return
+
+    # only imported here, the commit-msg hook checks single headers and should not pay for them.
+    import multiprocessing
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = jobs or os.cpu_count() or 1
+    # forking a process that already runs threads is unsafe, the workers are spawned instead.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(rules,),
+    ) as executor:
+        # `executor.map` would submit every chunk at once, i.e. read the whole revision range before the first result.
+        pending: deque[Future[list[tuple[str, str, list[str]]]]] = deque()
+        try:
+            for chunk in chain([first, second], chunks):
+                pending.append(executor.submit(check_chunk, chunk))
+                if len(pending) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def run_lint(revision_range: str, jobs: int | None = None, show_all: bool = False, include_merges: bool = False) -> int:
+    """Check every commit of a revision range and print the results as JSON lines.
+
+    Args:
+        revision_range (str): The revision or revision range to check.
+        jobs (int | None, optional): The number of worker processes. Defaults to the number of CPUs.
+        show_all (bool, optional): Determine if valid commits are printed as well. Defaults to False.
+        include_merges (bool, optional): Determine if merge commits are checked. Defaults to False.
+
+    Returns:
+        int: The exit code, 1 if any commit is invalid.
+    """
+    rules = Rules.from_config()
+    checked = invalid = 0
+    try:
+        for sha, header, errors in lint(revision_range, rules, jobs, include_merges):
+            checked += 1
+            invalid += bool(errors)
+            if errors or show_all:
+                print(json.dumps({"commit": sha, "header": header, "valid": not errors, "errors": errors}))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"{checked} commits checked, {invalid} invalid.", file=sys.stderr)
+    return 1 if invalid else 0
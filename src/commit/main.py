@@ -4,53 +4,76 @@
 from __future__ import annotations
 
 import argparse
+import os
 import subprocess
 import sys
+import threading
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from commit import commits, config, prompt
+from commit import hook, prompt, tracing
+from commit.fuzzy import FuzzyIndex
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from concurrent.futures import Future
+
+    from commit import config
+
+T = TypeVar("T")
 
 
 def new_filter_function(options: list[str]) -> Callable[[str, int, list[str], dict[str, Any]], tuple[list[str], int]]:
     """A filter function that always keeps the last option in the list.
 
+    Only the other options are searched, the last option stays at the end whether it matches or not. The search index
+    is built once per prompt and narrows the previous matches if the filter text is extended.
+
     Args:
         options (list[str]): The list of options to filter
 
     Returns:
         Callable[[str, int, list[str], dict[str, Any]], tuple[list[str], int]]: The filter function.
     """
+    search = FuzzyIndex(options[:-1])
 
-    def fun(state: str, index: int, current_options: list[str], tags: dict[str, Any]) -> tuple[list[str], int]:
+    def fun(state: str, index: int, current_options: list[str], _tags: dict[str, Any]) -> tuple[list[str], int]:
         """The filter function the be returned.
 
         Args:
             state (str): The current state of the prompt.
             index (int): The current index of the prompt.
             current_options (list[str]): The current options of the prompt.
-            tags (dict[str, Any]): The tags of the prompt.
+            _tags (dict[str, Any]): The tags of the prompt.
 
         Returns:
             tuple[list[str], int]: The filter result.
         """
-        (new_options, new_index) = prompt.get_filter_rule(options)(state, index, current_options, tags)
-        if current_options[-1] not in new_options:
-            new_options.append(current_options[-1])
+        old_item = current_options[index]
+        new_options = [*search.filter(state), options[-1]]
+        new_index = new_options.index(old_item) if old_item in new_options else 0
         return new_options, new_index
 
     return fun
 
 
-def show_more_filter_function() -> Callable[[str, int, list[str], dict[str, Any]], tuple[list[str], int]]:
+def show_more_filter_function(
+    ranked_gitmojis: list[str],
+) -> Callable[[str, int, list[str], dict[str, Any]], tuple[list[str], int]]:
     """A filter function that shows more options when the last option is selected.
 
+    The ranked gitmojis are computed once per prompt and searched with a fuzzy search index, which narrows the
+    previous matches if the filter text is extended.
+
+    Args:
+        ranked_gitmojis (list[str]): The ranked list of all gitmojis, as returned by `commits.rank_gitmojis`.
+
     Returns:
         Callable[[str, int, list[str], dict[str, Any]], tuple[list[str], int]]: The filter function.
     """
+    from commit import commits
+
+    search = FuzzyIndex(ranked_gitmojis)
 
     def fun(state: str, index: int, current_options: list[str], tags: dict[str, Any]) -> tuple[list[str], int]:
         """The filter function the be returned.
@@ -70,7 +93,12 @@ def show_more_filter_function() -> Callable[[str, int, list[str], dict[str, Any]
             page += 1
             tags["page"] = page
             index = 0
-        new_options = commits.get_gitmojis(state, page * 7)
+
+        filtered = search.filter(state)
+        if page * commits.GITMOJI_PAGE_SIZE >= len(filtered):
+            page = 0
+            tags["page"] = page
+        new_options = commits.page_gitmojis(filtered, page * commits.GITMOJI_PAGE_SIZE)
         if current_selection != "..." and current_selection in new_options:
             index = new_options.index(current_selection)
         else:
@@ -80,6 +108,51 @@ def show_more_filter_function() -> Callable[[str, int, list[str], dict[str, Any]
     return fun
 
 
+def run_in_background(function: Callable[[], T]) -> Future[T]:
+    """Run a function on a daemon worker thread.
+
+    Args:
+        function (Callable[[], T]): The function to run.
+
+    Returns:
+        Future[T]: A future holding the result of the function.
+    """
+    from concurrent.futures import Future
+
+    future: Future[T] = Future()
+
+    def target() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, name="quick-commit-prefetch", daemon=True).start()
+    return future
+
+
+def wait_for(future: Future[T], message: str) -> T:
+    """Wait for the result of a background task, showing a short indicator if it is not done yet.
+
+    Args:
+        future (Future[T]): The future to wait for.
+        message (str): The indicator to show while waiting.
+
+    Returns:
+        T: The result of the background task.
+    """
+    if future.done():
+        return future.result()
+    print(message, end="", flush=True)
+    try:
+        with tracing.phase("main.wait_for"):
+            return future.result()
+    finally:
+        print("\r\033[K", end="", flush=True)
+
+
 def main() -> None:
     """The main function for the commit package."""
     parser = argparse.ArgumentParser(description="Write correct commit messages with gitmojis with ease.")
@@ -97,29 +170,250 @@ def main() -> None:
         action="store_true",
         help="Mark the commit as a breaking change.",
     )
+    parser.add_argument(
+        "--parallel-hooks",
+        "-p",
+        action="store_true",
+        help="Run the pre-commit hooks while the commit message is written.",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=tracing.DEFAULT_TRACE_FILE,
+        metavar="FILE",
+        help=f"Write a JSON trace of where the time went (default: {tracing.DEFAULT_TRACE_FILE}). "
+        f"Can also be enabled by setting {tracing.TRACE_ENV_VARIABLE} to a file name.",
+    )
+    parser.add_argument(
+        "--no-hook-cache",
+        action="store_true",
+        help="Run the pre-commit hooks even if they already passed for the same staged changes.",
+    )
+    scripted = parser.add_argument_group(
+        "non-interactive mode", "Commit without any prompts. Requires --type, --gitmoji and --message."
+    )
+    scripted.add_argument("--type", "-t", help="The type of the commit, e.g. feat.")
+    scripted.add_argument("--scope", "-s", help="The scope of the commit. Omit it for no scope.")
+    scripted.add_argument("--gitmoji", "-g", help="The gitmoji of the commit, by name (zap), code (:zap:) or icon.")
+    scripted.add_argument("--message", "-m", help="The short commit message.")
+    scripted.add_argument("--body", help="A longer description of the changes.")
+    scripted.add_argument("--footer-text", help="The footer of the commit message.")
+    subparsers = parser.add_subparsers(dest="command", title="commands")
+    lint_parser = subparsers.add_parser(
+        "lint", help="Check the commit messages of a revision range and print the invalid ones as JSON lines."
+    )
+    lint_parser.add_argument("revision_range", nargs="?", default="HEAD", help="The commits to check (default: HEAD).")
+    lint_parser.add_argument("--jobs", "-j", type=int, help="The number of worker processes (default: all CPUs).")
+    lint_parser.add_argument("--all", action="store_true", help="Print the valid commits as well.")
+    lint_parser.add_argument("--include-merges", action="store_true", help="Check merge commits as well.")
+    hook_parser = subparsers.add_parser(
+        "install-hook", help="Install a commit-msg hook that checks messages written without quick-commit."
+    )
+    hook_parser.add_argument("--force", action="store_true", help="Replace an existing commit-msg hook.")
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Manage a background process that keeps the ranked scopes and gitmojis warm."
+    )
+    daemon_parser.add_argument(
+        "action", choices=["start", "stop", "status", "run"], help="'run' keeps the daemon in the foreground."
+    )
     args = parser.parse_args()
+    if args.command == "lint":
+        from commit import lint
+
+        sys.exit(lint.run_lint(args.revision_range, args.jobs, args.all, args.include_merges))
+    if args.command == "install-hook":
+        sys.exit(hook.install_hook(args.force))
+    if args.command == "daemon":
+        from commit import daemon
+
+        if args.action == "run":
+            daemon.serve()
+            return
+        sys.exit({"start": daemon.start, "stop": daemon.stop, "status": daemon.status}[args.action]())
+
+    parts = (args.type, args.scope, args.gitmoji, args.message, args.body, args.footer_text)
+    is_scripted = any(part is not None for part in parts)
+    if is_scripted and None in {args.type, args.gitmoji, args.message}:
+        parser.error("--type, --gitmoji and --message are required to commit without prompts")
+
+    trace_path = tracing.get_trace_path(args.profile)
+    if trace_path is not None:
+        tracing.enable()
     try:
-        run(args.footer, args.breaking, args.a, args.no_scope)
+        with tracing.phase("main.run"):
+            if is_scripted:
+                full_message = get_scripted_message(
+                    args.type,
+                    "" if args.no_scope or args.scope is None else args.scope,
+                    args.gitmoji,
+                    args.message,
+                    args.body or "",
+                    args.footer_text or "",
+                    args.breaking,
+                )
+                run_scripted(full_message, args.a, not args.no_hook_cache)
+            else:
+                run(args.footer, args.breaking, args.a, args.no_scope, args.parallel_hooks, not args.no_hook_cache)
     except KeyboardInterrupt:
         print("\nExiting...")
+    finally:
+        if trace_path is not None:
+            tracing.write(trace_path)
+            print(f"Trace written to {trace_path}.")
 
 
-def run_precommit() -> bool:
-    """Run the pre-commit hook.
+@tracing.traced("main.git_commit")
+def git_commit(full_message: str) -> subprocess.CompletedProcess[str]:
+    """Create the commit.
+
+    The message was checked while it was written, so an installed quick-commit `commit-msg` hook skips it.
+
+    Args:
+        full_message (str): The full commit message.
 
     Returns:
-        bool: A boolean indicating if the pre-commit hook was successful.
+        subprocess.CompletedProcess[str]: The finished `git commit` process.
+    """
+    return subprocess.run(  # noqa: S603
+        ["git", "commit", "-m", full_message],  # noqa: S607
+        capture_output=True,
+        text=True,
+        check=False,
+        env={**os.environ, hook.VALIDATED_ENV_VARIABLE: "1"},
+    )
+
+
+@tracing.traced("main.run_precommit_hooks")
+def run_precommit_hooks(use_cache: bool = True) -> subprocess.CompletedProcess[str] | None:
+    """Run the pre-commit hooks without reporting their result.
+
+    The hooks do not read from the terminal, so they can run while the user answers the prompts. They are skipped if
+    they already passed for the same staged content and pre-commit configuration, e.g. if the previous attempt was
+    aborted while the message was written, or `git commit` itself failed.
+
+    Args:
+        use_cache (bool, optional): Determine if the hooks are skipped if they passed before. Defaults to True.
+
+    Returns:
+        subprocess.CompletedProcess[str] | None: The finished pre-commit process, or None if pre-commit is not used or
+            the hooks were skipped.
     """
     if not Path(".pre-commit-config.yaml").exists():
+        return None
+    from commit import hook_cache
+
+    key = cache_path = None
+    if use_cache:
+        with tracing.phase("main.hook_cache"):
+            key = hook_cache.get_key()
+            cache_path = hook_cache.get_cache_path()
+            if key is not None and cache_path is not None and key in hook_cache.load(cache_path):
+                return None
+    result = subprocess.run(  # noqa: S603
+        ["pre-commit", "run"],  # noqa: S607
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    # failures are not recorded, fixing them changes the staged content anyway and flaky hooks deserve a retry.
+    if result.returncode == 0 and key is not None and cache_path is not None:
+        hook_cache.record(cache_path, key)
+    return result
+
+
+def report_precommit(result: subprocess.CompletedProcess[str] | None) -> bool:
+    """Print the output of failed pre-commit hooks.
+
+    Args:
+        result (subprocess.CompletedProcess[str] | None): The result of `run_precommit_hooks`.
+
+    Returns:
+        bool: A boolean indicating if the pre-commit hook was successful.
+    """
+    if result is None:
         return True
-    result = subprocess.run(["pre-commit", "run"], capture_output=True, text=True, check=False)  # noqa: S607 S603
     if result.returncode != 0:
         print(result.stdout)
         print(result.stderr)
     return result.returncode == 0
 
 
-def run(include_footer: bool, breaking_change: bool, stage_all: bool, no_scope: bool) -> None:
+def run_precommit(use_cache: bool = True) -> bool:
+    """Run the pre-commit hook.
+
+    Args:
+        use_cache (bool, optional): Determine if the hooks are skipped if they passed before for the same staged
+            content. Defaults to True.
+
+    Returns:
+        bool: A boolean indicating if the pre-commit hook was successful.
+    """
+    return report_precommit(run_precommit_hooks(use_cache))
+
+
+def get_draft_path() -> Path:
+    """Get the path at which a drafted commit message is kept after a failed commit.
+
+    Returns:
+        Path: The path of the draft inside the git directory.
+    """
+    from commit import discovery
+
+    git_dir = discovery.discover().git_dir
+    assert git_dir is not None
+    return git_dir / "QUICK_COMMIT_DRAFT"
+
+
+def save_draft(message: str) -> None:
+    """Keep a drafted commit message for the next run.
+
+    Args:
+        message (str): The drafted commit message.
+    """
+    get_draft_path().write_text(message, encoding="utf-8")
+    print("Your commit message was kept. Run quick-commit again to reuse it.")
+
+
+def load_draft() -> str | None:
+    """Ask the user whether to reuse the commit message drafted in a previous, failed run.
+
+    Returns:
+        str | None: The drafted commit message, or None if there is none or the user declined it.
+    """
+    path = get_draft_path()
+    if not path.exists():
+        return None
+    draft = path.read_text(encoding="utf-8")
+    print("A commit message was drafted in a previous attempt:\n", draft, sep="")
+    if input("Reuse it? [Y/n] ").strip().lower() in {"", "y", "yes"}:
+        return draft
+    path.unlink()
+    return None
+
+
+def record_usage(full_message: str) -> None:
+    """Record the parts of a new commit in the usage store of the user, unless the configuration ignores it.
+
+    Args:
+        full_message (str): The message of the new commit.
+    """
+    from commit import config
+
+    if config.find_config().ranking_user_weight > 0:
+        from commit import usage
+
+        usage.record_message(full_message)
+
+
+def run(
+    include_footer: bool,
+    breaking_change: bool,
+    stage_all: bool,
+    no_scope: bool,
+    parallel_hooks: bool = False,
+    use_hook_cache: bool = True,
+) -> None:
     """Run the commit process.
 
     Args:
@@ -127,36 +421,178 @@ def run(include_footer: bool, breaking_change: bool, stage_all: bool, no_scope:
         breaking_change (bool): Determine if the commit is a breaking change.
         stage_all (bool): Determine if all changes should be staged automatically.
         no_scope (bool): Determine if a scope should be included in the commit message.
+        parallel_hooks (bool, optional): Determine if the pre-commit hooks should run while the prompts are shown.
+            Defaults to False.
+        use_hook_cache (bool, optional): Determine if the pre-commit hooks are skipped if they already passed for the
+            same staged content. Defaults to True.
     """
-    if commits.get_repo() is None:
+    # imported here, so that `--help` and argument errors do not pay for loading them.
+    from commit import commits, config, daemon, discovery
+
+    if discovery.discover().root is None:
         print("Error: Not a git repository.")
         sys.exit(1)
 
-    if not commits.get_stages_files():
+    # the history is scanned while the files are staged and the first prompts are answered.
+    # a running daemon answers from its warm caches, otherwise the lists are computed in this process.
+    types_future = run_in_background(lambda: daemon.fetch("types", commits.get_commit_types))
+    gitmojis_future = run_in_background(lambda: daemon.fetch("gitmojis", commits.rank_gitmojis))
+
+    if stage_all:
+        with tracing.phase("main.stage_all"):
+            subprocess.run(["git", "add", "."], check=False)  # noqa: S607 S603
+
+    # the scopes may be ranked by the staged files, so they are only ranked once everything is staged.
+    scopes_future = (
+        run_in_background(lambda: daemon.fetch("scopes", commits.get_possible_scopes)) if not no_scope else None
+    )
+
+    if not commits.has_staged_changes():
         print("Error: No files selected to commit.")
         sys.exit(1)
 
     conf = config.find_config()
 
+    if parallel_hooks or conf.parallel_precommit:
+        hooks = run_in_background(lambda: run_precommit_hooks(use_hook_cache))
+    elif not run_precommit(use_hook_cache):
+        sys.exit(1)
+    else:
+        hooks = None
+
+    full_message = load_draft()
+    if full_message is None:
+        full_message = prompt_message(
+            conf, include_footer, breaking_change, scopes_future, gitmojis_future, types_future
+        )
+
+    if hooks is not None and not report_precommit(wait_for(hooks, "Waiting for pre-commit hooks...")):
+        save_draft(full_message)
+        sys.exit(1)
+
+    result = git_commit(full_message)
+    if result.returncode != 0:
+        print(result.stderr)
+        print(result.stdout)
+        save_draft(full_message)
+    else:
+        get_draft_path().unlink(missing_ok=True)
+        record_usage(full_message)
+        print("Committed successfully:\n", full_message, sep="")
+
+
+def get_scripted_message(
+    commit_type: str,
+    scope: str,
+    gitmoji: str,
+    msg: str,
+    description: str = "",
+    footer: str = "",
+    breaking_change: bool = False,
+) -> str:
+    """Validate the parts of a commit message given on the command line and assemble them.
+
+    Only the configuration and the gitmoji catalogue are used for the validation, the history is never read. The
+    process exits with an error message if any part is invalid.
+
+    Args:
+        commit_type (str): The type of the commit.
+        scope (str): The scope of the commit, empty for no scope.
+        gitmoji (str): The gitmoji of the commit, by name, code or icon.
+        msg (str): The short commit message.
+        description (str, optional): The longer description of the changes. Defaults to "".
+        footer (str, optional): The footer of the commit message. Defaults to "".
+        breaking_change (bool, optional): Determine if the commit is a breaking change. Defaults to False.
+
+    Returns:
+        str: The full commit message.
+    """
+    from commit import commits
+
+    errors = []
+    if commit_type not in commits.get_allowed_commit_types():
+        errors.append(f"Unknown commit type '{commit_type}'.")
+    if not commits.check_scope(scope):
+        errors.append(f"The scope '{scope}' is excluded." if scope else "A scope is required.")
+    gitmoji_code = commits.find_gitmoji(gitmoji)
+    if gitmoji_code is None:
+        errors.append(f"Unknown gitmoji '{gitmoji}'.")
+    ok, msg = commits.check_commit_message(msg)
+    if not ok:
+        errors.append("Invalid commit message format. Prepend '!' to use it anyway.")
+    if errors:
+        for error in errors:
+            print(f"Error: {error}")
+        sys.exit(1)
+    return commits.format_commit_message(
+        commit_type, scope, str(gitmoji_code), msg, description, footer, breaking_change
+    )
+
+
+def run_scripted(full_message: str, stage_all: bool, use_hook_cache: bool = True) -> None:
+    """Commit a prepared message without any prompts.
+
+    GitPython is not used on this path, git itself reports a missing repository or an empty commit. Scripted commits
+    are often made by tools rather than the user, they are not recorded in the usage store.
+
+    Args:
+        full_message (str): The full commit message.
+        stage_all (bool): Determine if all changes should be staged automatically.
+        use_hook_cache (bool, optional): Determine if the pre-commit hooks are skipped if they already passed for the
+            same staged content. Defaults to True.
+    """
     if stage_all:
-        subprocess.run(["git", "add", "."], check=False)  # noqa: S607 S603
+        with tracing.phase("main.stage_all"):
+            subprocess.run(["git", "add", "."], check=False)  # noqa: S607 S603
 
-    if not run_precommit():
+    if not run_precommit(use_hook_cache):
         sys.exit(1)
 
-    commit_types = commits.get_commit_types()
+    result = git_commit(full_message)
+    if result.returncode != 0:
+        print(result.stderr)
+        print(result.stdout)
+        sys.exit(result.returncode)
+    print("Committed successfully:\n", full_message, sep="")
+
+
+@tracing.traced("main.prompt_message")
+def prompt_message(
+    conf: config.Config,
+    include_footer: bool,
+    breaking_change: bool,
+    scopes_future: Future[list[str]] | None,
+    gitmojis_future: Future[list[str]],
+    types_future: Future[list[str]],
+) -> str:
+    """Prompt the user for all parts of the commit message.
+
+    Args:
+        conf (config.Config): The configuration to use.
+        include_footer (bool): Determine if a footer should be included in the commit message.
+        breaking_change (bool): Determine if the commit is a breaking change.
+        scopes_future (Future[list[str]] | None): The possible scopes, or None if no scope should be included.
+        gitmojis_future (Future[list[str]]): The ranked list of gitmojis.
+        types_future (Future[list[str]]): The ranked list of commit types.
+
+    Returns:
+        str: The full commit message.
+    """
+    from commit import commits
+
+    commit_types = wait_for(types_future, "Loading commit types...")
     (_, index, _) = prompt.show_with_filter(commit_types, "Select the type of change that you are committing: ")
     commit_type = commit_types[index].split(":")[0]
 
-    if not no_scope:
-        scopes = [*commits.get_possible_scopes(), "Create new scope from current input"]
+    if scopes_future is not None:
+        scopes = [*wait_for(scopes_future, "Loading scopes..."), "Create new scope from current input"]
         (text, index, _) = prompt.show(
             scopes,
             "Select the scope of the change that you are committing: ",
             on_update=new_filter_function(scopes),
         )
         scope = scopes[index] if index != len(scopes) - 1 else text
-        scope = "" if scope == "None" else f"({scope})"
+        scope = "" if scope == "None" else scope
     else:
         scope = ""
 
@@ -167,11 +603,12 @@ def run(include_footer: bool, breaking_change: bool, stage_all: bool, no_scope:
         if not ok:
             print("Invalid commit message format. Please try again or prepend '!'.")
 
-    gitmojis = commits.get_gitmojis()
+    ranked_gitmojis = wait_for(gitmojis_future, "Loading gitmojis...")
+    gitmojis = commits.page_gitmojis(ranked_gitmojis, 0)
     (_, index, gitmoji) = prompt.show(
         gitmojis,
         "Choose a gitmoji: ",
-        on_update=show_more_filter_function(),
+        on_update=show_more_filter_function(ranked_gitmojis),
         wrap_above=False,
         wrap_below=False,
     )
@@ -185,20 +622,7 @@ def run(include_footer: bool, breaking_change: bool, stage_all: bool, no_scope:
     else:
         footer = ""
 
-    breaking = "!" if breaking_change else ""
-
-    full_message = f"{commit_type}{scope}:{breaking} {gitmoji} {msg}"
-    if description:
-        full_message += f"\n\n{description}"
-    if footer:
-        full_message += f"\n\n{footer}"
-
-    result = subprocess.run(["git", "commit", "-m", full_message], capture_output=True, text=True, check=False)  # noqa: S603 S607
-    if result.returncode != 0:
-        print(result.stderr)
-        print(result.stdout)
-    else:
-        print("Committed successfully:\n", full_message, sep="")
+    return commits.format_commit_message(commit_type, scope, gitmoji, msg, description, footer, breaking_change)
 
 
 if __name__ == "__main__":
@@ -3,22 +3,30 @@
 # ruff: noqa: T201
 from __future__ import annotations
 
+import codecs
 import os
+import select
 import sys
 import termios
+import time
 import tty
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TextIO
+
+from commit import tracing
+from commit.fuzzy import FuzzyIndex
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from typing_extensions import Self
+
 COLOUR_YELLOW = "\033[33m"
 STYLE_BOLD = "\033[1m"
 COLOUR_RESET = "\033[0m"
 
 
 def get_filter_rule(options: list[str]) -> Callable[[str, int, list[str], dict[str, Any]], tuple[list[str], int]]:
-    """A simple filter function for prompts.
+    """A fuzzy filter function for prompts, returning the matching options best match first.
 
     Args:
         options (list[str]): The list of options to filter
@@ -26,6 +34,7 @@ def get_filter_rule(options: list[str]) -> Callable[[str, int, list[str], dict[s
     Returns:
         Callable[[str, int, list[str], dict[str, Any]], tuple[list[str], int]]: The filter function.
     """
+    search = FuzzyIndex(options)
 
     def fun(state: str, index: int, current_options: list[str], _tags: dict[str, Any]) -> tuple[list[str], int]:
         """The filter function the be returned.
@@ -40,44 +49,212 @@ def get_filter_rule(options: list[str]) -> Callable[[str, int, list[str], dict[s
             tuple[list[str], int]: The filter result.
         """
         old_item = current_options[index]
-        filtered = [option for option in options if state.lower() in option.lower()]
+        filtered = search.filter(state)
         index = filtered.index(old_item) if old_item in filtered else 0
         return filtered, index
 
     return fun
 
 
+KEY_NAMES = {
+    "\x7f": "backspace",
+    "\x08": "backspace",
+    "\n": "return",
+    "\r": "return",
+    "\t": "tab",
+}
+ARROW_KEYS = {"A": "up", "B": "down", "C": "right", "D": "left"}
+ESCAPE_TIMEOUT = 0.05
+
+
+def parse_keys(data: str) -> tuple[list[str], str]:
+    """Split raw terminal input into keys.
+
+    Arrow keys are recognised in both their normal (`ESC [ A`) and application (`ESC O A`) form, other escape sequences
+    are reported as "esc".
+
+    Args:
+        data (str): The decoded terminal input.
+
+    Returns:
+        tuple[list[str], str]: The keys found in the input, and an incomplete escape sequence at its end, if any.
+    """
+    keys = []
+    i = 0
+    while i < len(data):
+        if data[i] != "\x1b":
+            keys.append(KEY_NAMES.get(data[i], data[i]))
+            i += 1
+            continue
+        if i + 1 == len(data):
+            return keys, data[i:]
+        if data[i + 1] not in "[O":
+            keys.append("esc")
+            i += 1
+            continue
+        end = i + 2
+        while end < len(data) and not "\x40" <= data[end] <= "\x7e":
+            end += 1
+        if end == len(data):
+            return keys, data[i:]
+        keys.append(ARROW_KEYS.get(data[end], "esc") if end == i + 2 else "esc")
+        i = end + 1
+    return keys, ""
+
+
+class InputSession:
+    """Reads keys from the terminal, which is kept in cbreak mode for the lifetime of the session.
+
+    All input that is available at once (e.g. pasted text or a fast burst of keys) is read and returned together.
+    """
+
+    def __init__(self) -> None:
+        """Create a new input session on the standard input."""
+        self.fd = sys.stdin.fileno()
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.old_settings: list[Any] | None = None
+
+    def __enter__(self) -> Self:
+        """Switch the terminal to cbreak mode.
+
+        Returns:
+            Self: The session.
+        """
+        self.old_settings = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd)
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        """Restore the previous terminal settings."""
+        if self.old_settings is not None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.old_settings)
+
+    def has_input(self, timeout: float) -> bool:
+        """Check whether more input is available.
+
+        Args:
+            timeout (float): The time to wait for input in seconds.
+
+        Returns:
+            bool: True if input can be read without blocking.
+        """
+        return bool(select.select([self.fd], [], [], timeout)[0])
+
+    def read(self) -> str:
+        """Read the input that is currently available, blocking until there is some.
+
+        Returns:
+            str: The decoded input.
+        """
+        return self.decoder.decode(os.read(self.fd, 1024))
+
+    def read_keys(self) -> list[str]:
+        """Read all keys that are available at once, blocking until there is at least one.
+
+        Returns:
+            list[str]: The keys entered by the user.
+        """
+        data = self.read()
+        while True:
+            while self.has_input(0):
+                data += self.read()
+            keys, rest = parse_keys(data)
+            if not rest or not self.has_input(ESCAPE_TIMEOUT):
+                return keys + ["esc"] * bool(rest)
+            data += self.read()
+
+
 def getchar() -> str:
     """Get a single character from the user.
 
     Returns:
         str: The character entered by the user.
     """
-    old_settings = termios.tcgetattr(sys.stdin)
-    tty.setcbreak(sys.stdin.fileno())
-    try:
+    with InputSession() as session:
         while True:
-            b = os.read(sys.stdin.fileno(), 3).decode()
-            if len(b) == 3:
-                k = ord(b[2])
-                if k in {65, 66, 67, 68}:
-                    k += 100
-            else:
-                k = ord(b)
-            key_mapping = {
-                127: "backspace",
-                10: "return",
-                32: " ",
-                9: "tab",
-                27: "esc",
-                165: "up",
-                166: "down",
-                167: "right",
-                168: "left",
-            }
-            return key_mapping.get(k, chr(k))
-    finally:
-        termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+            keys = session.read_keys()
+            if keys:
+                return keys[0]
+
+
+class FrameRenderer:
+    """Draws frames of lines to the terminal, only rewriting the lines that changed since the previous frame.
+
+    Each update is collected in a buffer and written with a single write call.
+    """
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        """Create a new renderer. The first frame is drawn starting at the current line of the terminal.
+
+        Args:
+            stream (TextIO | None, optional): The stream to write to. Defaults to `sys.stdout`.
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.previous: list[str] = []
+        self.row = 0
+        self.height = 1
+        self.cursor_visible = True
+        self.cursor: tuple[int, int] | None = None
+
+    def move_to(self, buffer: list[str], row: int) -> None:
+        """Move the cursor to the start of a row of the frame, adding new lines below the frame if required.
+
+        Args:
+            buffer (list[str]): The buffer to add the escape codes to.
+            row (int): The row to move to, relative to the first line of the frame.
+        """
+        if row < self.row:
+            buffer.append(f"\033[{self.row - row}A")
+            self.row = row
+        elif row > self.row:
+            existing = min(row, self.height - 1) - self.row
+            if existing > 0:
+                buffer.append(f"\033[{existing}B")
+                self.row += existing
+            buffer.append("\n" * (row - self.row))
+            self.row = row
+            self.height = max(self.height, row + 1)
+        buffer.append("\r")
+
+    def render(self, lines: list[str], cursor: tuple[int, int] | None = None) -> None:
+        """Draw a new frame.
+
+        Args:
+            lines (list[str]): The lines of the frame.
+            cursor (tuple[int, int] | None, optional): The row and column to place the cursor at, or None to hide the
+                cursor. Defaults to None.
+        """
+        buffer: list[str] = []
+        if cursor is None and self.cursor_visible:
+            buffer.append("\033[?25l")
+            self.cursor_visible = False
+        for row in range(max(len(lines), len(self.previous))):
+            if row >= len(lines):
+                self.move_to(buffer, row)
+                buffer.append("\033[K")
+            elif row >= len(self.previous) or lines[row] != self.previous[row]:
+                self.move_to(buffer, row)
+                buffer.append(f"{lines[row]}\033[K")
+        self.previous = list(lines)
+        if cursor is not None and (buffer or cursor != self.cursor):
+            self.move_to(buffer, cursor[0])
+            if cursor[1] > 0:
+                buffer.append(f"\033[{cursor[1]}C")
+            if not self.cursor_visible:
+                buffer.append("\033[?25h")
+                self.cursor_visible = True
+        self.cursor = cursor
+        if buffer:
+            self.stream.write("".join(buffer))
+            self.stream.flush()
+
+    def finish(self, lines: list[str]) -> None:
+        """Draw the final frame and move the cursor below it, so regular output can follow.
+
+        Args:
+            lines (list[str]): The lines of the final frame.
+        """
+        self.render(lines, (len(lines), 0))
 
 
 def show(
@@ -104,86 +281,73 @@ def show(
     state = ""
     running = True
     index = 0
-    last_options = options
     original_options = options
     tags: dict[str, Any] = {}
+    renderer = FrameRenderer()
 
-    def print_state() -> None:
-        print(header + state)
+    def get_frame() -> list[str]:
+        lines = [header + state]
         for i, option in enumerate(options):
             pre = f"{COLOUR_YELLOW}{STYLE_BOLD} » " if i == index else "   "
-            print(f"{pre}{option}{COLOUR_RESET}")
-
-    def refresh() -> None:
-        print("\r\033[K", flush=True)
-        for _ in last_options:
-            print("\r\033[K", flush=True)
-        for _ in range(len(last_options) + 1):
-            print("\033[F", end="", flush=True)
-
-    def return_caret() -> None:
-        for _ in range(len(options) + 1):
-            print("\033[F", end="", flush=True)
-        print(f"\033[{len(header) + len(state)}C", end="", flush=True)
-
-    def hide_cursor() -> None:
-        print("\033[?25l", end="", flush=True)
-
-    def show_cursor() -> None:
-        print("\033[?25h", end="", flush=True)
-
-    print_state()
-    if allow_keys:
-        return_caret()
+            lines.append(f"{pre}{option}{COLOUR_RESET}")
+        return lines
+
+    def move(step: int) -> None:
+        nonlocal index
+        index += step
+        if index < 0:
+            index = 0 if not wrap_above else len(options) - 1
+        elif index >= len(options):
+            index = len(options) - 1 if not wrap_below else 0
+
+    def update() -> None:
+        nonlocal options, index
+        if on_update:
+            start = time.perf_counter()
+            options, index = on_update(state, index, options, tags)
+            tracing.add_latency("prompt.filter", time.perf_counter() - start)
+        if len(options) == 0:
+            options = ["---"]
+        if index < 0 or index >= len(options):
+            index = 0
 
     try:
-        while running:
-            if not allow_keys:
-                return_caret()
-            refresh()
-            print_state()
-            if allow_keys:
-                return_caret()
-            else:
-                hide_cursor()
-            last_options = options
-
-            key = getchar()
-            if len(key) == 1 and allow_keys:
-                state += key
-            elif key == "backspace":
-                state = state[:-1]
-            elif key == "up":
-                index -= 1
-                if index < 0:
-                    index = 0 if not wrap_above else len(options) - 1
-            elif key == "down":
-                index += 1
-                if index >= len(options):
-                    index = len(options) - 1 if not wrap_below else 0
-            elif key == "return":
-                running = False
-                show_cursor()
-            else:
-                continue
-
-            if on_update:
-                options, index = on_update(state, index, options, tags)
-            if len(options) == 0:
-                options = ["---"]
-            if index < 0 or index >= len(options):
-                index = 0
+        with InputSession() as session:
+            while running:
+                start = time.perf_counter()
+                renderer.render(get_frame(), (0, len(header) + len(state)) if allow_keys else None)
+                tracing.add_latency("prompt.render", time.perf_counter() - start)
+
+                # a burst of text (e.g. pasted) only updates the filter once, navigation keys are applied one by one.
+                text_changed = False
+                for key in session.read_keys():
+                    if len(key) == 1 and key.isprintable() and allow_keys:
+                        state += key
+                        text_changed = True
+                        continue
+                    if key == "backspace":
+                        state = state[:-1]
+                        text_changed = True
+                        continue
+                    if key not in {"up", "down", "return"}:
+                        continue
+                    if text_changed:
+                        update()
+                        text_changed = False
+                    if key == "return":
+                        running = False
+                    else:
+                        move(-1 if key == "up" else 1)
+                    update()
+                    if not running:
+                        break
+                if text_changed:
+                    update()
     except:
-        show_cursor()
-        if not allow_keys:
-            return_caret()
-        refresh()
+        renderer.render([], (0, 0))
         raise
 
-    if not allow_keys:
-        return_caret()
-    refresh()
-    print(header + f"{STYLE_BOLD}" + options[index] + f"{COLOUR_RESET}")
+    renderer.finish([header + f"{STYLE_BOLD}" + options[index] + f"{COLOUR_RESET}"])
     result = options[index]
 
     if options[index] in original_options:
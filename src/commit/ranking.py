@@ -0,0 +1,75 @@
+"""Ranks scopes and gitmojis by how frequently and how recently they were used."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from commit.config import Config
+    from commit.history import HistoryIndex, Usage
+
+
+def get_score(usage: Usage, index: HistoryIndex, recency_weight: float, now: float) -> float:
+    """Compute the ranking score of a single entry.
+
+    The score blends the raw number of uses with their exponentially decayed weight at time `now`, so frequent but
+    long unused entries fall behind entries that are in active use.
+
+    Args:
+        usage (Usage): The usage of the entry.
+        index (HistoryIndex): The index the usage belongs to.
+        recency_weight (float): How much the decayed weight counts compared to the raw count, between 0 and 1.
+        now (float): The unix timestamp to compute the decayed weight at.
+
+    Returns:
+        float: The score of the entry.
+    """
+    decayed = 0.0
+    if index.reference is not None:
+        decayed = usage.score * 2.0 ** ((index.reference - now) / index.half_life)
+    return (1 - recency_weight) * usage.count + recency_weight * decayed
+
+
+def get_scores(
+    usages: dict[str, Usage], index: HistoryIndex, conf: Config, now: float | None = None
+) -> dict[str, float]:
+    """Compute the ranking scores of a set of entries.
+
+    Args:
+        usages (dict[str, Usage]): The usages of the entries, e.g. `index.scopes`.
+        index (HistoryIndex): The index the usages belong to.
+        conf (Config): The configuration holding the ranking settings.
+        now (float | None, optional): The unix timestamp to rank at. Defaults to the current time.
+
+    Returns:
+        dict[str, float]: The score of each entry.
+    """
+    if now is None:
+        now = time.time()
+    return {key: get_score(usage, index, conf.ranking_recency_weight, now) for key, usage in usages.items()}
+
+
+def blend(repository: dict[str, float], user: dict[str, float], user_weight: float) -> dict[str, float]:
+    """Blend the scores of the repository history with the scores of the user across all repositories.
+
+    Both sets of scores are scaled to a maximum of 1 first, so the blend does not depend on how long either history
+    is. Entries only known to the user are added after the entries of the repository, which keeps the order of
+    equally scored entries stable.
+
+    Args:
+        repository (dict[str, float]): The scores of the repository history.
+        user (dict[str, float]): The scores of the user, e.g. from `usage.get_scores()`.
+        user_weight (float): How much the scores of the user count, between 0 and 1. 0 ignores them.
+
+    Returns:
+        dict[str, float]: The blended score of each entry.
+    """
+    if user_weight <= 0 or not user:
+        return repository
+    repository_max = max(repository.values(), default=0.0) or 1.0
+    user_max = max(user.values()) or 1.0
+    blended = {key: score / repository_max for key, score in repository.items()}
+    for key, score in user.items():
+        blended[key] = blended.get(key, 0.0) + user_weight * score / user_max
+    return blended
@@ -0,0 +1,298 @@
+"""Records where the time of a quick-commit run goes.
+
+Tracing is disabled by default and costs a single check per instrumented call then. Once enabled, every phase
+records its number of calls, its wall time and the subprocesses (and git subprocesses among them) started while it
+was the innermost active phase of its thread. Phases are inclusive, the time of a nested phase also counts towards
+its parents. Latencies that occur many times, such as the filter callback of a prompt, are collected as samples and
+summarized as histograms.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+TRACE_ENV_VARIABLE = "QUICK_COMMIT_TRACE"
+DEFAULT_TRACE_FILE = "quick-commit-trace.json"
+TRACE_VERSION = 1
+# upper bounds of the histogram buckets, in milliseconds.
+HISTOGRAM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0)
+
+
+# plain classes instead of dataclasses: this module is loaded by every run, and `dataclasses` (which imports `inspect`)
+# is one of the most expensive imports of the CLI start-up.
+class Phase:
+    """The statistics of a single phase."""
+
+    __slots__ = ("calls", "git_subprocesses", "seconds", "subprocesses")
+
+    def __init__(self) -> None:
+        """Create the statistics of a phase that was not called yet."""
+        self.calls = 0
+        self.seconds = 0.0
+        self.subprocesses = 0
+        self.git_subprocesses = 0
+
+
+class Tracer:
+    """Collects the phases and latencies of a run."""
+
+    def __init__(self) -> None:
+        """Start a new trace."""
+        self.start = time.perf_counter()
+        self.phases: dict[str, Phase] = {}
+        self.latencies: dict[str, list[float]] = {}
+        self.subprocesses = 0
+        self.git_subprocesses = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def get_stack(self) -> list[str]:
+        """Get the active phases of the current thread.
+
+        Returns:
+            list[str]: The names of the active phases, innermost last.
+        """
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        stack: list[str] = self.local.stack
+        return stack
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        """Record a finished call of a phase.
+
+        Args:
+            name (str): The name of the phase.
+            seconds (float): The wall time of the call.
+        """
+        with self.lock:
+            phase = self.phases.setdefault(name, Phase())
+            phase.calls += 1
+            phase.seconds += seconds
+
+    def add_latency(self, name: str, seconds: float) -> None:
+        """Record a latency sample.
+
+        Args:
+            name (str): The name of the latency.
+            seconds (float): The sample.
+        """
+        with self.lock:
+            self.latencies.setdefault(name, []).append(seconds)
+
+    def add_subprocess(self, executable: str) -> None:
+        """Record a started subprocess for the innermost active phase of the current thread.
+
+        Args:
+            executable (str): The executable of the subprocess.
+        """
+        is_git = Path(executable).stem == "git"
+        stack = self.get_stack()
+        with self.lock:
+            self.subprocesses += 1
+            self.git_subprocesses += is_git
+            if stack:
+                phase = self.phases.setdefault(stack[-1], Phase())
+                phase.subprocesses += 1
+                phase.git_subprocesses += is_git
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summarize the trace.
+
+        Returns:
+            dict[str, Any]: The trace as a JSON serializable dictionary.
+        """
+        with self.lock:
+            return {
+                "version": TRACE_VERSION,
+                "argv": sys.argv,
+                "seconds": time.perf_counter() - self.start,
+                "subprocesses": self.subprocesses,
+                "git_subprocesses": self.git_subprocesses,
+                "phases": {
+                    name: {
+                        "calls": phase.calls,
+                        "seconds": phase.seconds,
+                        "subprocesses": phase.subprocesses,
+                        "git_subprocesses": phase.git_subprocesses,
+                    }
+                    for name, phase in self.phases.items()
+                },
+                "latencies": {name: summarize(samples) for name, samples in self.latencies.items()},
+            }
+
+
+def summarize(samples: list[float]) -> dict[str, Any]:
+    """Summarize latency samples as a histogram.
+
+    Args:
+        samples (list[float]): The samples, in seconds.
+
+    Returns:
+        dict[str, Any]: The number of samples, some percentiles and the histogram, all in milliseconds.
+    """
+    ordered = sorted(sample * 1000 for sample in samples)
+    histogram = dict.fromkeys([f"<={bound}" for bound in HISTOGRAM_BUCKETS] + [f">{HISTOGRAM_BUCKETS[-1]}"], 0)
+    for sample in ordered:
+        bound = next((bound for bound in HISTOGRAM_BUCKETS if sample <= bound), None)
+        histogram[f"<={bound}" if bound is not None else f">{HISTOGRAM_BUCKETS[-1]}"] += 1
+    return {
+        "count": len(ordered),
+        "total_ms": sum(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[min(len(ordered) - 1, len(ordered) * 95 // 100)],
+        "max_ms": ordered[-1],
+        "histogram": histogram,
+    }
+
+
+_tracer: Tracer | None = None
+_hook_installed = False
+
+
+def _audit_hook(event: str, args: tuple[Any, ...]) -> None:
+    """Count the subprocesses started while tracing.
+
+    Args:
+        event (str): The name of the audit event.
+        args (tuple[Any, ...]): The arguments of the audit event.
+    """
+    if event == "subprocess.Popen" and _tracer is not None:
+        executable, popen_args = args[0], args[1]
+        if executable is None:
+            executable = popen_args if isinstance(popen_args, str | bytes | os.PathLike) else popen_args[0]
+        _tracer.add_subprocess(os.fsdecode(executable))
+
+
+def enable() -> Tracer:
+    """Start tracing this process.
+
+    Returns:
+        Tracer: The new tracer.
+    """
+    global _tracer, _hook_installed  # noqa: PLW0603
+    # audit hooks can not be removed again, so a single hook serves all tracers of the process.
+    if not _hook_installed:
+        sys.addaudithook(_audit_hook)
+        _hook_installed = True
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Tracer | None:
+    """Stop tracing this process.
+
+    Returns:
+        Tracer | None: The tracer that was active, if any.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def is_enabled() -> bool:
+    """Check whether this process is traced.
+
+    Returns:
+        bool: True if tracing is enabled.
+    """
+    return _tracer is not None
+
+
+def get_trace_path(profile: str | None) -> Path | None:
+    """Get the file a trace should be written to.
+
+    Args:
+        profile (str | None): The value of the `--profile` argument, if it was given.
+
+    Returns:
+        Path | None: The trace file, or None if tracing is not requested.
+    """
+    if profile is not None:
+        return Path(profile)
+    env = os.environ.get(TRACE_ENV_VARIABLE, "")
+    if env in {"", "0"}:
+        return None
+    return Path(DEFAULT_TRACE_FILE if env == "1" else env)
+
+
+def write(path: Path) -> None:
+    """Write the trace of the active tracer to a file.
+
+    Args:
+        path (Path): The file to write to.
+    """
+    import json
+
+    if _tracer is not None:
+        path.write_text(json.dumps(_tracer.to_dict(), indent=2) + "\n", encoding="utf-8")
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record the time spent in a block as a phase.
+
+    Args:
+        name (str): The name of the phase.
+
+    Yields:
+        None: Nothing.
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    stack = tracer.get_stack()
+    stack.append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add_phase(name, time.perf_counter() - start)
+        stack.pop()
+
+
+def traced(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Record every call of a function as a phase.
+
+    Args:
+        name (str): The name of the phase.
+
+    Returns:
+        Callable[[Callable[P, R]], Callable[P, R]]: The decorator.
+    """
+
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _tracer is None:
+                return function(*args, **kwargs)
+            with phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def add_latency(name: str, seconds: float) -> None:
+    """Record a latency sample if tracing is enabled.
+
+    Args:
+        name (str): The name of the latency.
+        seconds (float): The sample.
+    """
+    if _tracer is not None:
+        _tracer.add_latency(name, seconds)
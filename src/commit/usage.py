@@ -0,0 +1,180 @@
+"""Keeps a per-user record of the commit types, scopes and gitmojis chosen across all repositories.
+
+The record is a small SQLite database in the user data directory. It gives new repositories, which have no history
+to rank from yet, the rankings of the user's other repositories. Several quick-commit processes may write to it at
+the same time: the database runs in WAL mode, waits for locks instead of failing, and every commit is recorded with
+a single upsert per entry.
+
+Like the history index, the scores decay exponentially with age. They are stored relative to a fixed epoch, so that
+recording a use is a plain addition and never needs to rewrite older entries.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from commit import tracing
+
+if TYPE_CHECKING:
+    import sqlite3
+
+DATABASE_NAME = "usage.sqlite3"
+SCHEMA_VERSION = 1
+BUSY_TIMEOUT = 5.0
+EPOCH = 1_704_067_200  # 2024-01-01
+# preferences carried across repositories change slowly, a long half-life also keeps the stored scores far from
+# overflowing for centuries.
+HALF_LIFE = 90 * 24 * 60 * 60
+KINDS = ("type", "scope", "gitmoji")
+
+
+def get_database_path() -> Path:
+    """Get the path of the usage database of the current user.
+
+    Returns:
+        Path: The path of the database file.
+    """
+    import appdirs  # type: ignore[import-untyped]
+
+    return Path(appdirs.user_data_dir("quick-commit", False)) / DATABASE_NAME
+
+
+def connect() -> sqlite3.Connection:
+    """Open the usage database, creating it if needed.
+
+    Returns:
+        sqlite3.Connection: The connection, in autocommit mode outside of `with` blocks.
+    """
+    import sqlite3
+
+    path = get_database_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+    try:
+        connection.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}")
+        if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # readers never block the writer and the writer never blocks readers in WAL mode, the mode is persistent.
+            connection.execute("PRAGMA journal_mode = WAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS usage ("
+                    "kind TEXT NOT NULL, key TEXT NOT NULL, count INTEGER NOT NULL, last_used INTEGER NOT NULL, "
+                    "score REAL NOT NULL, PRIMARY KEY (kind, key)) WITHOUT ROWID"
+                )
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    except sqlite3.Error:
+        connection.close()
+        raise
+    return connection
+
+
+def get_weight(timestamp: float) -> float:
+    """Get the weight of a use relative to the epoch.
+
+    Args:
+        timestamp (float): The unix timestamp of the use.
+
+    Returns:
+        float: The weight, which doubles every half-life after the epoch.
+    """
+    return float(2.0 ** ((timestamp - EPOCH) / HALF_LIFE))
+
+
+@tracing.traced("usage.record")
+def record(commit_type: str, scope: str, gitmoji: str | None, timestamp: float | None = None) -> None:
+    """Record the parts chosen for a commit.
+
+    Failing to record them is not an error, the record only improves the rankings.
+
+    Args:
+        commit_type (str): The commit type, empty if there is none.
+        scope (str): The scope, empty if there is none.
+        gitmoji (str | None): The gitmoji code including its colons, or None if there is none.
+        timestamp (float | None, optional): The unix timestamp of the commit. Defaults to the current time.
+    """
+    import sqlite3
+
+    timestamp = timestamp if timestamp is not None else time.time()
+    rows = [
+        (kind, key, int(timestamp), get_weight(timestamp))
+        for kind, key in zip(KINDS, (commit_type, scope, gitmoji), strict=True)
+        if key
+    ]
+    if not rows:
+        return
+    try:
+        connection = connect()
+    except (sqlite3.Error, OSError):
+        return
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT INTO usage (kind, key, count, last_used, score) VALUES (?, ?, 1, ?, ?) "
+                "ON CONFLICT (kind, key) DO UPDATE SET count = count + 1, "
+                "last_used = max(last_used, excluded.last_used), score = score + excluded.score",
+                rows,
+            )
+    except sqlite3.Error:
+        pass
+    finally:
+        connection.close()
+    clear_cache()
+
+
+def record_message(message: str) -> None:
+    """Record the parts of a commit message.
+
+    Args:
+        message (str): The full commit message.
+    """
+    from commit import history
+
+    record(*history.parse_header(message))
+
+
+_scores: dict[str, dict[str, float]] = {}
+_scores_lock = threading.Lock()
+
+
+@tracing.traced("usage.get_scores")
+def get_scores(kind: str, now: float | None = None) -> dict[str, float]:
+    """Get the decayed scores of all recorded entries of a kind.
+
+    The database is read once per process, the commit types, scopes and gitmojis are ranked from the same read.
+
+    Args:
+        kind (str): The kind of entries, one of KINDS.
+        now (float | None, optional): The unix timestamp to compute the scores at. Defaults to the current time.
+
+    Returns:
+        dict[str, float]: The score of each entry, highest first. Empty if the database cannot be read.
+    """
+    import sqlite3
+
+    with _scores_lock:
+        if not _scores:
+            try:
+                connection = connect()
+            except (sqlite3.Error, OSError):
+                return {}
+            try:
+                rows = connection.execute("SELECT kind, key, score FROM usage ORDER BY score DESC").fetchall()
+            except sqlite3.Error:
+                rows = []
+            finally:
+                connection.close()
+            for row_kind, key, score in rows:
+                _scores.setdefault(row_kind, {})[key] = score
+            _scores.setdefault(kind, {})
+        stored = dict(_scores.get(kind, {}))
+    factor = 1.0 / get_weight(now if now is not None else time.time())
+    return {key: score * factor for key, score in stored.items()}
+
+
+def clear_cache() -> None:
+    """Forget the scores read by this process."""
+    with _scores_lock:
+        _scores.clear()
@@ -0,0 +1,87 @@
+"""Shared fixtures for the test suite."""
+
+from __future__ import annotations
+
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from commit import usage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class GitRepo:
+    """A small helper around a temporary git repository."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialise a new git repository at the given path.
+
+        Args:
+            path (Path): The directory of the repository.
+        """
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.git("init", "-q", "-b", "main")
+        self.git("config", "user.name", "Test User")
+        self.git("config", "user.email", "test@example.com")
+        self.git("config", "commit.gpgsign", "false")
+
+    def git(self, *args: str) -> str:
+        """Run a git command inside the repository.
+
+        Args:
+            *args (str): The arguments passed to git.
+
+        Returns:
+            str: The standard output of the command.
+        """
+        result = subprocess.run(["git", *args], cwd=self.path, capture_output=True, text=True, check=True)  # noqa: S603 S607
+        return result.stdout.strip()
+
+    def commit(self, message: str, path: str = "file.txt") -> str:
+        """Create a new commit that modifies a single file.
+
+        Args:
+            message (str): The commit message.
+            path (str, optional): The file to modify. Defaults to "file.txt".
+
+        Returns:
+            str: The sha of the new commit.
+        """
+        file = self.path / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with file.open("a") as f:
+            f.write(message + "\n")
+        self.git("add", path)
+        self.git("commit", "-q", "-m", message)
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> GitRepo:
+    """Create an empty git repository and make it the current working directory.
+
+    Returns:
+        GitRepo: The repository helper.
+    """
+    repo = GitRepo(tmp_path / "repo")
+    monkeypatch.chdir(repo.path)
+    return repo
+
+
+@pytest.fixture(autouse=True)
+def usage_database(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Keep the usage store of the user out of the tests, every test starts with an empty store.
+
+    Yields:
+        Path: The path of the usage database used by the test.
+    """
+    path = tmp_path / "user-data" / usage.DATABASE_NAME
+    monkeypatch.setattr(usage, "get_database_path", lambda: path)
+    usage.clear_cache()
+    yield path
+    usage.clear_cache()
@@ -2,7 +2,18 @@
 
 from __future__ import annotations
 
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING
+
 import commit.commits as c
+from commit import config
+from commit.fuzzy import FuzzyIndex
+
+if TYPE_CHECKING:
+    from .conftest import GitRepo
+
+RESOURCES = Path(__file__).parent / "resources"
 
 
 def test_check_incorrect_capitalisation() -> None:
@@ -21,3 +32,87 @@ def test_check_correct() -> None:
     """Test check_commit_message with a correct input."""
     msg = " this is a test message"
     assert c.check_commit_message(msg) == (True, msg.strip())
+
+
+def test_validate_parts(git_repo: GitRepo) -> None:
+    """Test the validation of commit types, scopes and gitmojis against the configuration."""
+    shutil.copy(RESOURCES / ".quick-commit-config.yaml", git_repo.path)
+    assert "my-commit-type" in c.get_allowed_commit_types()
+    assert "chore" not in c.get_allowed_commit_types()
+    assert c.check_scope("api")
+    assert not c.check_scope("deps")
+    assert not c.check_scope("")
+    assert c.find_gitmoji("zap") == ":zap:"
+    assert c.find_gitmoji(":bug:") == ":bug:"
+    assert c.find_gitmoji("🎨") == ":my-gitmoji:"
+    assert c.find_gitmoji("art") is None
+    assert c.find_gitmoji("unknown") is None
+
+
+def test_format_commit_message() -> None:
+    """Test assembling a full commit message."""
+    assert c.format_commit_message("feat", "", ":zap:", "go fast") == "feat: :zap: go fast"
+    assert (
+        c.format_commit_message("fix", "api", ":bug:", "fix it", "Details.", "Refs: #1", breaking_change=True)
+        == "fix(api):! :bug: fix it\n\nDetails.\n\nRefs: #1"
+    )
+
+
+def test_staged_changes(git_repo: GitRepo) -> None:
+    """Test the detection and listing of staged files, also before the first commit."""
+    assert not c.has_staged_changes()
+    (git_repo.path / "a file.txt").write_text("a\n", encoding="utf-8")
+    git_repo.git("add", "a file.txt")
+    assert c.has_staged_changes()
+    assert c.get_stages_files() == ["a file.txt"]
+
+    git_repo.commit("feat: :tada: initial commit")
+    assert not c.has_staged_changes()
+    for name in ("b.txt", "sub/c.txt"):
+        (git_repo.path / name).parent.mkdir(exist_ok=True)
+        (git_repo.path / name).write_text("b\n", encoding="utf-8")
+    git_repo.git("add", ".")
+    assert c.has_staged_changes()
+    assert next(c.iter_staged_paths()) == "b.txt"
+    assert c.get_stages_files() == ["b.txt", "sub/c.txt"]
+
+
+def test_scopes_from_paths(git_repo: GitRepo) -> None:
+    """Test that the scopes used for the directories of the staged files are ranked first."""
+    (git_repo.path / ".quick-commit-config.yaml").write_text("scopes:\n  suggest-from-paths: true\n", encoding="utf-8")
+    git_repo.commit("feat(api): :sparkles: first", "services/api/main.py")
+    git_repo.commit("fix(db): :bug: second", "services/db/schema.sql")
+    git_repo.commit("feat(cli): :sparkles: third", "cli/main.py")
+    assert c.get_possible_scopes() == ["None", "cli", "db", "api"]
+
+    (git_repo.path / "services/api/routes.py").write_text("routes\n", encoding="utf-8")
+    git_repo.git("add", "services/api/routes.py")
+    assert c.get_possible_scopes() == ["None", "api", "cli", "db"]
+
+
+def test_gitmoji_catalogue(git_repo: GitRepo) -> None:
+    """Test that the catalogue is built once and added gitmojis replace default ones."""
+    catalogue = c.get_gitmoji_catalogue()
+    assert c.get_gitmoji_catalogue() is catalogue
+    assert catalogue[":zap:"].format() == "⚡️ - :zap: - Improve performance."
+    assert c.get_gitmoji_list()[1] == "⚡️ - :zap: - Improve performance."
+
+    shutil.copy(RESOURCES / ".quick-commit-config.yaml", git_repo.path)
+    config.clear_cache()
+    catalogue = c.get_gitmoji_catalogue()
+    assert list(catalogue)[-2:] == [":my-gitmoji:", ":my-gitmoji-2:"]
+    assert ":art:" not in c.get_allowed_gitmojis()
+
+    git_repo.commit("fix: :bug: fix a thing")
+    git_repo.commit("feat: :custom: add a thing")
+    ranked = c.rank_gitmojis()
+    assert ranked[:4] == [
+        "✨ - :sparkles: - Introduce new features.",
+        "🎨 - :my-gitmoji: - My custom gitmoji.",
+        "🔥 - :my-gitmoji-2: - My custom gitmoji number 2.",
+        "🐛 - :bug: - Fix a bug.",
+    ]
+    assert "?? - :custom: - Unknown gitmoji" in ranked
+    assert not any(":art:" in gm for gm in ranked)
+    assert c.get_gitmojis("bug")[0] == "🐛 - :bug: - Fix a bug."
+    assert c.get_gitmojis("bug", 7) == c.page_gitmojis(FuzzyIndex(ranked).filter("bug"), 7)
@@ -2,7 +2,15 @@
 
 from __future__ import annotations
 
-from commit import NewCommitType, NewGitmoji, parse_config
+import shutil
+from typing import TYPE_CHECKING
+
+import pytest
+
+from commit import NewCommitType, NewGitmoji, config, parse_config
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 def test_parse() -> None:
@@ -18,6 +26,7 @@ def test_parse() -> None:
     assert x.excluded_scopes == ["deps"]
     assert x.new_scopes == ["my-new-scope"]
     assert x.prohibit_no_scope
+    assert x.suggest_scopes_from_paths
 
     assert x.message_pattern == r"^\w+\."
 
@@ -28,7 +37,16 @@ def test_parse() -> None:
     ]
     assert x.priority_gitmojis == ["sparkles", "my-gitmoji", "my-gitmoji-2"]
 
+    assert x.history_only_mine
+    assert x.history_no_merges
+    assert x.history_first_parent
+
+    assert x.ranking_half_life_days == 14
+    assert x.ranking_recency_weight == 0.75
+    assert x.ranking_user_weight == 0.5
+
     assert x.enable_footer
+    assert x.parallel_precommit
 
 
 def test_parse_empty() -> None:
@@ -41,6 +59,7 @@ def test_parse_empty() -> None:
     assert x.excluded_scopes == []
     assert x.new_scopes == []
     assert not x.prohibit_no_scope
+    assert not x.suggest_scopes_from_paths
 
     assert x.message_pattern is None
 
@@ -48,7 +67,16 @@ def test_parse_empty() -> None:
     assert x.new_gitmojis == []
     assert x.priority_gitmojis == []
 
+    assert not x.history_only_mine
+    assert not x.history_no_merges
+    assert not x.history_first_parent
+
+    assert x.ranking_half_life_days == 30
+    assert x.ranking_recency_weight == 1
+    assert x.ranking_user_weight == 0.25
+
     assert not x.enable_footer
+    assert not x.parallel_precommit
 
 
 def test_parse_short_style() -> None:
@@ -68,3 +96,40 @@ def test_parse_short_style() -> None:
         NewGitmoji("🎨", "my-gitmoji", "My custom gitmoji."),
     ]
     assert x.priority_gitmojis == ["sparkles"]
+
+
+def test_compiled_patterns() -> None:
+    """Test the precompiled patterns of a configuration."""
+    x = parse_config("tests/resources/.quick-commit-config.yaml")
+    assert [p.pattern for p in x.excluded_scope_patterns] == ["deps"]
+    assert x.message_regex is not None
+    assert x.message_regex.search("abc.")
+
+
+def test_find_config_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that configurations are resolved once per process and parsed once per file version."""
+    monkeypatch.setattr(config, "get_cache_dir", lambda: tmp_path / "cache")
+    project = tmp_path / "project"
+    (project / "sub").mkdir(parents=True)
+    shutil.copy("tests/resources/.short-style.yaml", project / ".quick-commit-config.yaml")
+    monkeypatch.chdir(project / "sub")
+    config.clear_cache()
+
+    first = config.find_config()
+    assert first.excluded_scopes == ["my-excluded-scope"]
+    assert config.find_config() is first
+
+    read_config_data = config.read_config_data
+
+    def fail(_config: Path) -> None:
+        pytest.fail("The configuration file should not be parsed again.")
+
+    monkeypatch.setattr(config, "read_config_data", fail)
+    config.clear_cache()
+    assert config.find_config() == first
+
+    monkeypatch.setattr(config, "read_config_data", read_config_data)
+    (project / ".quick-commit-config.yaml").write_text("scopes:\n  exclude: other\n")
+    config.clear_cache()
+    assert config.find_config().excluded_scopes == ["other"]
+    config.clear_cache()
@@ -0,0 +1,118 @@
+"""Tests specific to the daemon sub-module."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from commit import daemon, history
+
+from .conftest import GitRepo
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def fail() -> list[str]:
+    """Fail, as the daemon should have answered.
+
+    Raises:
+        AssertionError: Always.
+    """
+    msg = "The daemon did not answer."
+    raise AssertionError(msg)
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Use a socket of the test only.
+
+    Returns:
+        Path: The path of the socket.
+    """
+    path = tmp_path / "d.sock"
+    monkeypatch.setenv(daemon.SOCKET_ENV_VARIABLE, str(path))
+    return path
+
+
+@pytest.fixture
+def running_daemon(socket_path: Path) -> Iterator[threading.Thread]:
+    """Run a daemon on a background thread.
+
+    Yields:
+        threading.Thread: The thread running the daemon.
+    """
+    thread = threading.Thread(target=daemon.serve, args=(socket_path, 10), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if daemon.send({"request": "ping"}) is not None:
+            break
+        time.sleep(0.01)
+    yield thread
+    daemon.send({"request": "stop"})
+    thread.join(timeout=5)
+
+
+@pytest.mark.usefixtures("socket_path")
+def test_fallback() -> None:
+    """Test that the lists are computed in the current process if no daemon is running."""
+    assert daemon.send({"request": "ping"}) is None
+    assert daemon.fetch("scopes", lambda: ["computed"]) == ["computed"]
+
+
+def test_daemon(git_repo: GitRepo, running_daemon: threading.Thread) -> None:
+    """Test that the daemon answers from its cache until the repository changes."""
+    git_repo.commit("feat(api): :sparkles: add the api")
+    assert "api" in daemon.fetch("scopes", fail)
+    assert daemon.fetch("gitmojis", fail)[0].startswith("✨")
+    assert daemon.send({"request": "ping"}) == {"ok": True, "pid": os.getpid(), "repositories": 1}
+
+    git_repo.commit("fix(db): :bug: fix the database")
+    assert "db" in daemon.fetch("scopes", fail)
+
+    (git_repo.path / ".quick-commit-config.yaml").write_text("scopes:\n  exclude:\n    - api\n", encoding="utf-8")
+    assert "api" not in daemon.fetch("scopes", fail)
+
+    response = daemon.send({"request": "unknown", "cwd": str(git_repo.path)})
+    assert response == {"ok": False, "error": "Unknown request 'unknown'."}
+
+    daemon.send({"request": "stop"})
+    running_daemon.join(timeout=5)
+    assert not running_daemon.is_alive()
+    assert daemon.fetch("scopes", lambda: ["computed"]) == ["computed"]
+
+
+@pytest.mark.usefixtures("running_daemon")
+def test_daemon_keeps_other_repositories(git_repo: GitRepo, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that subdirectories share the entry of their repository, and a change only evicts its own caches."""
+    scans: list[str] = []
+    update_index = history.update_index
+
+    def counting_update_index(repo: Any, *args: Any) -> history.HistoryIndex:  # noqa: ANN401
+        scans.append(Path(repo.working_dir).name)
+        return update_index(repo, *args)
+
+    monkeypatch.setattr(history, "update_index", counting_update_index)
+    other = GitRepo(tmp_path / "other")
+    other.commit("feat(web): :sparkles: add the web app")
+    git_repo.commit("feat(api): :sparkles: add the api", "api/main.py")
+    assert "api" in daemon.fetch("scopes", fail)
+    monkeypatch.chdir(git_repo.path / "api")
+    assert "api" in daemon.fetch("scopes", fail)
+    monkeypatch.chdir(other.path)
+    assert "web" in daemon.fetch("scopes", fail)
+    response = daemon.send({"request": "ping"})
+    assert response is not None
+    assert response["repositories"] == 2
+    assert scans == ["repo", "other"]
+
+    other.commit("fix(db): :bug: fix the database")
+    assert "db" in daemon.fetch("scopes", fail)
+    monkeypatch.chdir(git_repo.path)
+    assert daemon.fetch("types", fail)[0].startswith("feat:")
+    assert scans == ["repo", "other", "other"]
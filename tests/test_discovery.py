@@ -0,0 +1,76 @@
+"""Tests specific to the discovery sub-module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from commit import commits, config, discovery
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+    from .conftest import GitRepo
+
+
+def test_discover(git_repo: GitRepo, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the repository and the nearest configuration file are found in a single upward scan."""
+    (git_repo.path / ".quick-commit-config.yaml").write_text("scopes:\n  add: [api]\n", encoding="utf-8")
+    nested = git_repo.path / "src" / "api"
+    nested.mkdir(parents=True)
+    (git_repo.path / "src" / ".quick-commit-config.yml").write_text("scopes:\n  add: [src]\n", encoding="utf-8")
+
+    listed: list[Path] = []
+    list_names = discovery.list_names
+
+    def count(directory: Path) -> dict[str, bool]:
+        listed.append(directory)
+        return list_names(directory)
+
+    monkeypatch.setattr(discovery, "list_names", count)
+    found = discovery.discover(nested)
+    assert found.root == git_repo.path
+    assert found.git_dir == git_repo.path / ".git"
+    assert found.common_dir == git_repo.path / ".git"
+    assert found.config_file == git_repo.path / "src" / ".quick-commit-config.yml"
+    assert listed == [nested, nested.parent, git_repo.path]
+    assert discovery.discover(nested) is found
+    assert len(listed) == 3
+
+    monkeypatch.chdir(nested)
+    assert config.find_config().new_scopes == ["src"]
+    assert commits.get_repo() is commits.get_repo()
+
+
+def test_discover_outside_repository(tmp_path: Path) -> None:
+    """Test that directories outside of any repository are reported as such."""
+    found = discovery.discover(tmp_path)
+    assert found.root is None
+    assert found.git_dir is None
+    assert found.common_dir is None
+
+
+def test_discover_git_file(git_repo: GitRepo, tmp_path: Path) -> None:
+    """Test that `.git` files of linked worktrees and submodules are followed."""
+    git_repo.commit("feat: :tada: initial commit")
+    worktree = tmp_path / "worktree"
+    git_repo.git("worktree", "add", "-q", str(worktree), "-b", "feature")
+    found = discovery.discover(worktree)
+    assert found.root == worktree
+    assert found.git_dir == (git_repo.path / ".git" / "worktrees" / "worktree").resolve()
+    assert found.common_dir == (git_repo.path / ".git").resolve()
+
+    module_dir = git_repo.path / ".git" / "modules" / "sub"
+    module_dir.mkdir(parents=True)
+    submodule = git_repo.path / "sub"
+    submodule.mkdir()
+    (submodule / ".git").write_text("gitdir: ../.git/modules/sub\n", encoding="utf-8")
+    found = discovery.discover(submodule)
+    assert found.root == submodule
+    assert found.git_dir == module_dir.resolve()
+    assert found.common_dir == module_dir.resolve()
+
+    (submodule / ".git").write_text("not a git file\n", encoding="utf-8")
+    discovery.clear_cache()
+    assert discovery.discover(submodule).root == git_repo.path
@@ -0,0 +1,94 @@
+"""Tests for the fuzzy matching of prompt options."""
+
+from __future__ import annotations
+
+import random
+import time
+
+from commit.fuzzy import FuzzyIndex, get_positions, score_key
+
+# the time a single keystroke may take to filter KEYSTROKE_OPTIONS options, once the first two characters narrowed
+# them. the first two characters search all options and get a larger budget.
+KEYSTROKE_BUDGET = 0.003
+FIRST_KEYSTROKE_BUDGET = 0.01
+KEYSTROKE_OPTIONS = 10_000
+WORDS = ["api", "auth", "build", "cache", "cli", "config", "core", "daemon", "db", "deps", "docs", "hook", "infra"]
+WORDS += ["lint", "parser", "sched", "scheduler", "test", "ui", "web", "i18n", "Release_Notes", "x-y"]
+
+
+def get_scopes(count: int) -> list[str]:
+    """Create distinct scope names made of two words and a number.
+
+    Args:
+        count (int): The number of scopes.
+
+    Returns:
+        list[str]: The scopes.
+    """
+    rng = random.Random(0)  # noqa: S311
+    scopes: dict[str, None] = {}
+    while len(scopes) < count:
+        scopes[f"{rng.choice(WORDS)}-{rng.choice(WORDS)}{rng.randrange(1000)}"] = None
+    return list(scopes)
+
+
+def test_subsequence_match() -> None:
+    """Test that queries match as case-insensitive subsequences."""
+    index = FuzzyIndex(["feat: A new feature", "fix: A bug fix", "docs: Documentation only changes"])
+    assert index.filter("dcs") == ["docs: Documentation only changes"]
+    assert index.filter("FX") == ["fix: A bug fix"]
+    assert index.filter("a") == index.options
+    assert not index.filter("xyz")
+    assert index.filter("") == index.options
+
+
+def test_compact_alignment() -> None:
+    """Test that the alignment of a query is as short as possible."""
+    assert get_positions("xaxab", "ab") == [3, 4]
+    assert get_positions("abc", "cb") is None
+
+
+def test_ranking() -> None:
+    """Test that word boundaries and consecutive matches are preferred, and ties keep their order."""
+    assert score_key("scope/api", "api") > score_key("a-p-i", "api")  # type: ignore[operator]
+    assert score_key("a-p-i", "api") > score_key("rapid", "api")  # type: ignore[operator]
+    assert score_key("rapid", "api") > score_key("a-xpxi", "api")  # type: ignore[operator]
+    index = FuzzyIndex(["rapid", "core", "api-2", "api-1"])
+    assert index.filter("api") == ["api-2", "api-1", "rapid"]
+
+
+def test_incremental_matches_fresh_search() -> None:
+    """Test that narrowing the previous results gives the same result as a fresh search."""
+    options = [f"{word}-{i}" for i, word in enumerate(["config", "core", "cli", "cache", "docs"] * 20)]
+    incremental = FuzzyIndex(options)
+    for end in range(1, 5):
+        query = "conf"[:end]
+        assert incremental.match(query) == FuzzyIndex(options).match(query)
+    assert incremental.match("c") == FuzzyIndex(options).match("c")
+
+
+def test_index_matches_reference() -> None:
+    """Test that the index ranks exactly like sorting all matches by `score_key`, keeping the order of ties."""
+    options = get_scopes(2000)
+    index = FuzzyIndex(options)
+    for text in ["sched", "crx", "api", "x-y", "rn", "dae", "_n", "i18", "c", "ct"]:
+        for end in range(1, len(text) + 1):
+            query = text[:end]
+            scores = [score_key(option.lower(), query.lower()) for option in options]
+            expected = sorted((i for i, score in enumerate(scores) if score is not None), key=lambda i: -scores[i])  # type: ignore[operator]
+            assert index.match(query) == expected, query
+
+
+def test_keystroke_budget() -> None:
+    """Test that filtering many options stays within the keystroke budget while a query is typed."""
+    options = get_scopes(KEYSTROKE_OPTIONS)
+    for text in ["scheduler", "config", "daemon-ap"]:
+        slowest = [float("inf")] * len(text)
+        for _ in range(5):
+            index = FuzzyIndex(options)
+            for end in range(1, len(text) + 1):
+                start = time.perf_counter()
+                index.match(text[:end])
+                slowest[end - 1] = min(slowest[end - 1], time.perf_counter() - start)
+        assert max(slowest[:2]) < FIRST_KEYSTROKE_BUDGET, text
+        assert max(slowest[2:]) < KEYSTROKE_BUDGET, text
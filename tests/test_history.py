@@ -0,0 +1,197 @@
+"""Tests for the persistent commit-history index."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from commit import commits, config, history
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .conftest import GitRepo
+
+
+def test_parse_message() -> None:
+    """Test extracting scopes and gitmojis from commit messages."""
+    assert history.get_scope("feat(api): :sparkles: add endpoint") == "api"
+    assert not history.get_scope("feat: :sparkles: add endpoint")
+    assert history.get_gitmoji("feat(api): :sparkles: add endpoint") == ":sparkles:"
+    assert history.get_gitmoji("feat(api): add endpoint") is None
+
+
+def test_index_counts(git_repo: GitRepo) -> None:
+    """Test that a full scan counts scopes and gitmojis in order of recent use."""
+    git_repo.commit("feat(api): :sparkles: first")
+    git_repo.commit("fix(cli): :bug: second")
+    head = git_repo.commit("fix(api): :bug: third")
+
+    index = history.update_index(commits.get_repo())
+    assert index.head == head
+    assert list(index.scope_counts.items()) == [("api", 2), ("cli", 1)]
+    assert index.gitmoji_counts == {":sparkles:": 1, ":bug:": 2}
+    assert history.load_index(commits.get_repo()) == index
+
+
+def test_index_incremental(git_repo: GitRepo, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that later runs only scan the commits added since the last indexed commit."""
+    git_repo.commit("feat(api): :sparkles: first")
+    git_repo.commit("fix(cli): :bug: second")
+    history.update_index(commits.get_repo())
+
+    git_repo.commit("feat(cli): :sparkles: third")
+    scanned: list[str] = []
+    original = history.scan_commits
+
+    def scan(commit_list: Iterable[tuple[str, int]], half_life: float) -> history.HistoryIndex:
+        commit_list = list(commit_list)
+        scanned.extend(subject for subject, _ in commit_list)
+        return original(commit_list, half_life)
+
+    monkeypatch.setattr(history, "scan_commits", scan)
+    index = history.update_index(commits.get_repo())
+    assert scanned == ["feat(cli): :sparkles: third"]
+    assert list(index.scope_counts.items()) == [("cli", 2), ("api", 1)]
+    assert index.gitmoji_counts == {":sparkles:": 2, ":bug:": 1}
+
+
+def test_index_rebuilt_after_rewrite(git_repo: GitRepo) -> None:
+    """Test that the index is rebuilt when the indexed commit is no longer an ancestor of HEAD."""
+    first = git_repo.commit("feat(api): :sparkles: first")
+    git_repo.commit("fix(cli): :bug: second")
+    history.update_index(commits.get_repo())
+
+    git_repo.git("reset", "-q", "--hard", first)
+    git_repo.commit("docs(readme): :memo: rewritten")
+    index = history.update_index(commits.get_repo())
+    assert list(index.scope_counts.items()) == [("readme", 1), ("api", 1)]
+    assert index.gitmoji_counts == {":memo:": 1, ":sparkles:": 1}
+
+
+def test_scan_history_aggregate(git_repo: GitRepo) -> None:
+    """Test that the aggregate records commit types and last-seen timestamps and is only built once."""
+    git_repo.commit("feat(api): :sparkles: first")
+    git_repo.commit("fix(api)!: :bug: second")
+    last = int(git_repo.git("log", "-1", "--format=%ct"))
+
+    stats = history.scan_history(commits.get_repo())
+    assert stats.type_counts == {"fix": 1, "feat": 1}
+    assert stats.scopes["api"].count == 2
+    assert stats.scopes["api"].last_seen == last
+    assert stats.gitmojis[":bug:"].last_seen == last
+
+    git_repo.commit("docs: :memo: third")
+    assert history.scan_history(commits.get_repo()) is stats
+    history.clear_cache()
+    assert history.scan_history(commits.get_repo()).type_counts == {"docs": 1, "fix": 1, "feat": 1}
+
+
+@pytest.mark.parametrize("backend", sorted(history.HISTORY_SOURCES))
+def test_history_sources(git_repo: GitRepo, backend: str) -> None:
+    """Test that all history sources stream the same subject lines and timestamps."""
+    git_repo.commit("feat(api): :sparkles: first\n\nWith a body: that has: colons")
+    git_repo.commit("fix: :bug: second")
+    timestamps = [int(t) for t in git_repo.git("log", "--format=%ct").split()]
+
+    source = history.get_history_source(backend)
+    entries = list(source(commits.get_repo(), "HEAD"))
+    assert entries == [("fix: :bug: second", timestamps[0]), ("feat(api): :sparkles: first", timestamps[1])]
+
+
+def test_unknown_history_source() -> None:
+    """Test that unknown history backends are rejected."""
+    with pytest.raises(ValueError, match="Unknown history backend"):
+        history.get_history_source("svn")
+
+
+def test_path_trie() -> None:
+    """Test that the deepest recorded directory of each file decides its scopes."""
+    trie = history.PathTrie()
+    trie.add(["services/api/main.py", "services/api/routes.py", "README.md"], "api")
+    trie.add(["services/api/main.py", "services/db/schema.sql"], "db")
+    trie.add(["services/db/schema.sql"], "db")
+    assert trie.children["services"].scopes == {"api": 1, "db": 2}
+    assert trie.lookup("services/api/v1") == {"api": 1, "db": 1}
+    assert trie.lookup("services/cli") == {"api": 1, "db": 2}
+    assert not trie.lookup("docs")
+    assert not trie.lookup("")
+    assert trie.match(["services/db/schema.sql", "services/db/seed.sql", "README.md"]) == {"db": 2.0}
+
+    merged = history.PathTrie()
+    merged.merge(trie)
+    merged.merge(trie)
+    assert merged.lookup("services/db") == {"db": 4}
+    assert history.PathTrie.from_data(json.loads(json.dumps(trie.to_data()))) == trie
+
+
+def test_index_paths(git_repo: GitRepo) -> None:
+    """Test that the path trie is built from `git log` and updated incrementally."""
+    git_repo.commit("feat(api): :sparkles: first", "services/api/main.py")
+    git_repo.commit("fix(db): :bug: second", "services/db/schema.sql")
+    git_repo.commit("docs: :memo: no scope", "services/api/README.md")
+    repo = commits.get_repo()
+
+    assert history.update_index(repo).paths is None
+    index = history.update_index(repo, track_paths=True)
+    assert index.paths is not None
+    assert index.paths.lookup("services/api") == {"api": 1}
+
+    git_repo.commit("feat(db): :sparkles: third", "services/db/migrations/001.sql")
+    index = history.update_index(repo, track_paths=True)
+    assert index.paths is not None
+    assert index.paths.lookup("services/db/migrations") == {"db": 1}
+    assert index.paths.lookup("services") == {"db": 2, "api": 1}
+    assert history.load_index(repo) == index
+
+
+def make_team_history(git_repo: GitRepo) -> None:
+    """Create a history with commits by another author and a merged feature branch.
+
+    Args:
+        git_repo (GitRepo): The repository to create the history in.
+    """
+    git_repo.commit("feat(api): :sparkles: mine")
+    (git_repo.path / "deps.txt").write_text("bump\n", encoding="utf-8")
+    git_repo.git("add", "deps.txt")
+    git_repo.git("-c", "user.email=bot@example.com", "commit", "-q", "-m", "chore(deps): :arrow_up: bump")
+    git_repo.git("switch", "-q", "-c", "feature")
+    git_repo.commit("fix(cli): :bug: on a branch", "cli.txt")
+    git_repo.git("switch", "-q", "main")
+    git_repo.git("merge", "-q", "--no-ff", "-m", "chore(release): :twisted_rightwards_arrows: merge", "feature")
+
+
+@pytest.mark.parametrize("source", [*history.HISTORY_SOURCES.values(), history.iter_git_log_paths])
+def test_history_filter(git_repo: GitRepo, source: history.HistorySource) -> None:
+    """Test that every history source leaves out the commits excluded by the filter."""
+    make_team_history(git_repo)
+    repo = commits.get_repo()
+
+    def scopes(history_filter: history.HistoryFilter) -> set[str]:
+        return {history.get_scope(subject) for subject, *_ in source(repo, "HEAD", history_filter)}
+
+    assert scopes(history.HistoryFilter()) == {"release", "cli", "deps", "api"}
+    assert scopes(history.HistoryFilter(author="test@example.com")) == {"release", "cli", "api"}
+    assert scopes(history.HistoryFilter(author="example.com")) == set()
+    assert scopes(history.HistoryFilter(no_merges=True)) == {"cli", "deps", "api"}
+    assert scopes(history.HistoryFilter(first_parent=True)) == {"release", "deps", "api"}
+    assert scopes(history.HistoryFilter("test@example.com", no_merges=True, first_parent=True)) == {"api"}
+
+
+def test_index_filter(git_repo: GitRepo) -> None:
+    """Test that the index is rebuilt when the configured filter changes."""
+    make_team_history(git_repo)
+    repo = commits.get_repo()
+    assert history.scan_history(repo).scope_counts == {"release": 1, "cli": 1, "deps": 1, "api": 1}
+
+    (git_repo.path / ".quick-commit-config.yaml").write_text(
+        "history:\n  only-mine: true\n  no-merges: true\n  first-parent: true\n", encoding="utf-8"
+    )
+    config.clear_cache()
+    history.clear_cache()
+    index = history.scan_history(repo)
+    assert index.scope_counts == {"api": 1}
+    assert index.history_filter == history.HistoryFilter("test@example.com", no_merges=True, first_parent=True)
+    assert history.load_index(repo) == index
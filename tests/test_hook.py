@@ -0,0 +1,107 @@
+"""Tests specific to the hook sub-module."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from commit import config, discovery, hook, lint
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .conftest import GitRepo
+
+# the time the hook may take to import and check a message once its rules are cached, without the interpreter start-up.
+HOOK_BUDGET = 0.04
+HOOK_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from commit import hook
+errors = hook.check_message_file(hook.Path(sys.argv[1]))
+elapsed = time.perf_counter() - start
+heavy = [name for name in ("dataclasses", "appdirs", "yaml", "git", "commit.config", "commit.commits") if name in sys.modules]
+print(json.dumps({"elapsed": elapsed, "heavy": heavy, "errors": errors}))
+"""
+
+
+def test_get_header() -> None:
+    """Test that comments and leading empty lines are skipped."""
+    assert hook.get_header("# comment\n\nfeat: :tada: start\n\nbody\n") == "feat: :tada: start"
+    assert not hook.get_header("# only comments\n")
+
+
+@pytest.mark.usefixtures("git_repo")
+def test_check_message_file(tmp_path: Path) -> None:
+    """Test the checks of a commit message file."""
+    message = tmp_path / "COMMIT_EDITMSG"
+    message.write_text("fix: :bug: fix a thing\n# Please enter the commit message\n", encoding="utf-8")
+    assert hook.check_message_file(message) == []
+    message.write_text("Merge branch 'feature'\n", encoding="utf-8")
+    assert hook.check_message_file(message) == []
+    message.write_text("Fix a thing.\n", encoding="utf-8")
+    assert hook.check_message_file(message) == [f"header does not match '{lint.HEADER_FORMAT}'"]
+
+
+def test_rules_cache(git_repo: GitRepo, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the cached rules are used until the configuration changes."""
+    assert lint.get_rules().to_data() == lint.Rules.from_config().to_data()
+    assert (git_repo.path / ".git" / lint.RULES_CACHE_FILE).is_file()
+
+    def from_config() -> lint.Rules:
+        raise AssertionError
+
+    with monkeypatch.context() as patch:
+        patch.setattr(lint.Rules, "from_config", from_config)
+        assert "feat" in lint.get_rules().commit_types
+
+    (git_repo.path / ".quick-commit-config.yaml").write_text("types:\n  exclude:\n    - feat\n", encoding="utf-8")
+    discovery.clear_cache()
+    config.clear_cache()
+    assert "feat" not in lint.get_rules().commit_types
+    assert "feat" not in lint.get_rules().commit_types
+
+
+def test_hook_start_up(git_repo: GitRepo, tmp_path: Path) -> None:
+    """Test that the hook only loads the header checks and the cached rules."""
+    message = tmp_path / "COMMIT_EDITMSG"
+    message.write_text("Fix a thing.\n", encoding="utf-8")
+    runs = []
+    # the first run builds the rules cache.
+    for _ in range(4):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", HOOK_SCRIPT, str(message)], capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(result.stdout.splitlines()[-1]))
+    assert (git_repo.path / ".git" / lint.RULES_CACHE_FILE).is_file()
+    assert all(run["errors"] == [f"header does not match '{lint.HEADER_FORMAT}'"] for run in runs)
+    assert all(run["heavy"] == [] for run in runs[1:])
+    assert min(run["elapsed"] for run in runs[1:]) < HOOK_BUDGET
+
+
+def test_install_hook(git_repo: GitRepo) -> None:
+    """Test that the installed hook rejects invalid messages, unless quick-commit itself commits."""
+    assert hook.install_hook() == 0
+    path = hook.get_hook_path()
+    assert os.access(path, os.X_OK)
+    assert hook.HOOK_MARKER in path.read_text(encoding="utf-8")
+
+    git_repo.commit("feat: :tada: initial commit")
+    with pytest.raises(subprocess.CalledProcessError):
+        git_repo.commit("Not conventional.")
+    (git_repo.path / "file.txt").write_text("changed\n", encoding="utf-8")
+    subprocess.run(  # noqa: S603
+        ["git", "commit", "-qam", "Not conventional."],  # noqa: S607
+        env={**os.environ, hook.VALIDATED_ENV_VARIABLE: "1"},
+        check=True,
+    )
+
+    path.write_text("#!/bin/sh\nexit 0\n", encoding="utf-8")
+    assert hook.install_hook() == 1
+    assert hook.install_hook(force=True) == 0
+    assert hook.HOOK_MARKER in path.read_text(encoding="utf-8")
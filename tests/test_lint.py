@@ -0,0 +1,93 @@
+"""Tests specific to the lint sub-module."""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from commit import lint
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .conftest import GitRepo
+
+RESOURCES = Path(__file__).parent / "resources"
+
+
+@pytest.mark.usefixtures("git_repo")
+def test_check_header() -> None:
+    """Test the checks of single commit headers."""
+    rules = lint.Rules.from_config()
+    assert lint.check_header("feat(api): :sparkles: add a thing", rules) == []
+    assert lint.check_header("fix!: 🐛 fix a thing", rules) == []
+    assert lint.check_header("fix(api):! :bug: fix a thing", rules) == []
+    assert lint.check_header("Merge branch 'main'", rules) == [f"header does not match '{lint.HEADER_FORMAT}'"]
+    assert lint.check_header("nope: :bug: Fix a thing.", rules) == [
+        "unknown commit type 'nope'",
+        "message does not follow the message rules",
+    ]
+    assert lint.check_header("fix: :no-such-gitmoji: fix a thing", rules) == ["unknown gitmoji ':no-such-gitmoji:'"]
+
+
+def test_check_header_config(git_repo: GitRepo) -> None:
+    """Test that the checks follow the configuration."""
+    shutil.copy(RESOURCES / ".quick-commit-config.yaml", git_repo.path)
+    rules = lint.Rules.from_config()
+    assert lint.check_header("my-commit-type(x): :my-gitmoji: Done.", rules) == []
+    assert lint.check_header("chore: :art: Done.", rules) == [
+        "unknown commit type 'chore'",
+        "missing scope",
+        "unknown gitmoji ':art:'",
+    ]
+    assert lint.check_header("feat(deps): :sparkles: Done.", rules) == ["excluded scope 'deps'"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_lint(git_repo: GitRepo, jobs: int) -> None:
+    """Test that all commits of a range are checked in order, in the current process or in a process pool."""
+    shas = [
+        git_repo.commit("feat: :tada: initial commit"),
+        git_repo.commit("not conventional"),
+        git_repo.commit("fix(api): :bug: fix a thing"),
+        git_repo.commit("docs: :memo: Wrong."),
+        git_repo.commit("test: :white_check_mark: add tests"),
+    ]
+    results = list(lint.lint(f"{shas[0]}..HEAD", lint.Rules.from_config(), jobs=jobs, chunk_size=2))
+    assert [sha for sha, _, _ in results] == shas[:0:-1]
+    assert [bool(errors) for _, _, errors in results] == [False, True, False, True]
+
+
+@pytest.mark.usefixtures("git_repo")
+def test_lint_reads_ahead_boundedly(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the process pool is only fed a few chunks ahead of the results being consumed."""
+    read = 0
+
+    def iter_headers(_revision_range: str, _include_merges: bool) -> Iterator[tuple[str, str]]:
+        nonlocal read
+        for i in range(1000):
+            read += 1
+            yield f"{i:040x}", "feat: :sparkles: add a thing"
+
+    monkeypatch.setattr(lint, "iter_headers", iter_headers)
+    results = lint.lint("HEAD", lint.Rules.from_config(), jobs=2, chunk_size=10)
+    assert next(results)[0] == f"{0:040x}"
+    assert read <= (2 * lint.CHUNKS_IN_FLIGHT_PER_WORKER + 1) * 10
+    assert len(list(results)) == 999
+
+
+def test_run_lint(git_repo: GitRepo, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the JSON lines output and the exit code."""
+    git_repo.commit("feat: :tada: initial commit")
+    assert lint.run_lint("HEAD") == 0
+    git_repo.commit("not conventional")
+    capsys.readouterr()
+    assert lint.run_lint("HEAD", show_all=True) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["valid"] for line in lines] == [False, True]
+    assert lines[0]["header"] == "not conventional"
+    assert lint.run_lint("no-such-revision") == 2
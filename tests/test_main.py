@@ -0,0 +1,275 @@
+"""Tests specific to the main sub-module."""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from commit import usage
+from commit.fuzzy import FuzzyIndex
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .conftest import GitRepo
+
+from commit.main import (
+    get_draft_path,
+    get_scripted_message,
+    load_draft,
+    new_filter_function,
+    run_in_background,
+    run_precommit,
+    run_scripted,
+    save_draft,
+    show_more_filter_function,
+    wait_for,
+)
+
+# the time `quick-commit --help` may take to import and run, without the interpreter start-up.
+COLD_START_BUDGET = 0.08
+COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from commit.main import main
+sys.argv = ["quick-commit", "--help"]
+try:
+    main()
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - start
+heavy = [name for name in ("git", "yaml", "appdirs", "commit.commits", "commit.config") if name in sys.modules]
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+FAKE_PRECOMMIT = """#!/bin/sh
+echo run >> "$FAKE_PRECOMMIT_RUNS"
+exit "$FAKE_PRECOMMIT_STATUS"
+"""
+RANKED = [f"x - :gitmoji-{i}: - Description {i}" for i in range(20)]
+
+
+def test_show_more_filter_pages() -> None:
+    """Test that selecting '...' moves to the next page and wraps around at the end."""
+    fun = show_more_filter_function(RANKED)
+    tags: dict[str, Any] = {}
+    options, index = fun("", 0, RANKED[:7] + ["..."], tags)
+    assert options == [*RANKED[:7], "..."]
+    options, index = fun("", 7, options, tags)
+    assert options == [*RANKED[7:14], "..."]
+    assert index == 0
+    options, _ = fun("", 7, options, tags)
+    assert options == [*RANKED[14:], "..."]
+    options, _ = fun("", 6, options, tags)
+    assert options == [*RANKED[:7], "..."]
+
+
+def test_show_more_filter_narrows() -> None:
+    """Test filtering, including extending and shortening the filter text."""
+    fun = show_more_filter_function(RANKED)
+    tags: dict[str, Any] = {}
+    options, _ = fun("1", 0, [*RANKED[:7], "..."], tags)
+    assert options == [*[gm for gm in RANKED if "1" in gm][:7], "..."]
+    options, index = fun("1", 1, options, tags)
+    assert index == 1
+    options, _ = fun("12", 0, options, tags)
+    assert options == [RANKED[12], "..."]
+    options, _ = fun("DESCRIPTION 1", 0, options, tags)
+    assert options == [*[gm for gm in RANKED if "description 1" in gm.lower()][:7], "..."]
+
+
+def test_new_filter_keeps_last() -> None:
+    """Test that the option creating a new scope stays last, whether the filter text matches it or not."""
+    scopes = ["None", "cli", "core", "docs", "Create new scope from current input"]
+    fun = new_filter_function(scopes)
+    tags: dict[str, Any] = {}
+    options, index = fun("c", 0, scopes, tags)
+    assert options == ["cli", "core", "docs", scopes[-1]]
+    options, index = fun("cr", 1, options, tags)
+    assert options == ["core", scopes[-1]]
+    assert index == 0
+    options, index = fun("crx", 1, options, tags)
+    assert options == [scopes[-1]]
+    assert index == 0
+    assert fun("", 0, options, tags)[0] == scopes
+
+
+def test_new_filter_builds_index_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the search index of the scope prompt is built once and narrowed while the user types."""
+    built: list[list[str]] = []
+    original = FuzzyIndex.__init__
+
+    def init(self: FuzzyIndex, options: list[str], keys: list[str] | None = None) -> None:
+        built.append(list(options))
+        original(self, options, keys)
+
+    monkeypatch.setattr(FuzzyIndex, "__init__", init)
+    scopes = [f"scope-{i}" for i in range(100)] + ["Create new scope from current input"]
+    fun = new_filter_function(scopes)
+    options = scopes
+    for end in range(1, len("scope-42") + 1):
+        options, _ = fun("scope-42"[:end], 0, options, {})
+    assert options == ["scope-42", scopes[-1]]
+    assert built == [scopes[:-1]]
+
+
+def test_background_prefetch(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that background results are awaited and an indicator is only shown while waiting."""
+    release = threading.Event()
+
+    def slow() -> int:
+        release.wait()
+        return 42
+
+    future = run_in_background(slow)
+    threading.Timer(0.05, release.set).start()
+    assert wait_for(future, "Loading...") == 42
+    assert "Loading..." in capsys.readouterr().out
+
+    assert wait_for(future, "Loading...") == 42
+    assert not capsys.readouterr().out
+
+
+def test_background_prefetch_error() -> None:
+    """Test that errors of background tasks are raised when the result is awaited."""
+
+    def fail() -> None:
+        msg = "failed"
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="failed"):
+        wait_for(run_in_background(fail), "Loading...")
+
+
+@pytest.mark.usefixtures("git_repo")
+def test_draft_kept(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a drafted commit message can be reused or discarded in the next run."""
+    assert load_draft() is None
+    save_draft("feat: :sparkles: keep me")
+    monkeypatch.setattr("builtins.input", lambda _prompt: "")
+    assert load_draft() == "feat: :sparkles: keep me"
+    monkeypatch.setattr("builtins.input", lambda _prompt: "n")
+    assert load_draft() is None
+    assert not get_draft_path().exists()
+
+
+def test_scopes_ranked_after_staging(git_repo: GitRepo, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that `-a` stages all changes before the scopes are ranked by the staged files."""
+    (git_repo.path / ".quick-commit-config.yaml").write_text("scopes:\n  suggest-from-paths: true\n", encoding="utf-8")
+    git_repo.commit("feat(api): :sparkles: first", "api/main.py")
+    git_repo.commit("fix(db): :bug: second", "db/schema.sql")
+    (git_repo.path / "api/main.py").write_text("changed\n", encoding="utf-8")
+
+    ranked: list[list[str]] = []
+
+    def prompt_message(*args: Any) -> str:  # noqa: ANN401
+        scopes_future = args[3]
+        ranked.append(wait_for(scopes_future, "Loading scopes..."))
+        return "feat(api): :sparkles: change it"
+
+    run = subprocess.run
+
+    def slow_run(args: list[str], **kwargs: Any) -> subprocess.CompletedProcess[Any]:  # noqa: ANN401
+        if args[:2] == ["git", "add"]:
+            # give a ranking started too early the time to finish before anything is staged.
+            time.sleep(0.5)
+        return run(args, **kwargs)
+
+    main_module = importlib.import_module("commit.main")
+    monkeypatch.setattr(main_module, "prompt_message", prompt_message)
+    monkeypatch.setattr(subprocess, "run", slow_run)
+    main_module.run(include_footer=False, breaking_change=False, stage_all=True, no_scope=False)
+    assert ranked == [["None", "api", "db"]]
+    assert git_repo.git("log", "-1", "--format=%s") == "feat(api): :sparkles: change it"
+
+
+def test_cold_start() -> None:
+    """Test that parsing the arguments does not load GitPython, PyYAML or the history machinery."""
+    runs = []
+    for _ in range(3):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", COLD_START_SCRIPT], capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(result.stdout.splitlines()[-1]))
+    assert runs[0]["heavy"] == []
+    assert min(run["elapsed"] for run in runs) < COLD_START_BUDGET
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        "import commit.main\nfrom commit import main",
+        "from commit import main\nimport commit.main",
+        "import commit.main\nimport commit\nmain = commit.main",
+    ],
+)
+def test_package_main_is_entry_point(script: str) -> None:
+    """Test that `commit.main` stays the entry point function, even once its submodule was imported."""
+    check = "\nimport sys, types\nassert main is sys.modules['commit.main'].main\nassert not isinstance(main, types.ModuleType)"
+    subprocess.run([sys.executable, "-c", script + check], check=True)  # noqa: S603
+
+
+def test_scripted_commit(git_repo: GitRepo, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test committing without prompts, including the validation of all parts."""
+    git_repo.commit("feat: :tada: initial commit")
+    message = get_scripted_message("fix", "api", "bug", "handle empty input", footer="Refs: #1")
+    assert message == "fix(api): :bug: handle empty input\n\nRefs: #1"
+
+    (git_repo.path / "file.txt").write_text("changed\n", encoding="utf-8")
+    run_scripted(message, stage_all=True)
+    assert git_repo.git("log", "-1", "--format=%B") == message
+    # commits made by scripts and bots must not skew the rankings of the user.
+    assert usage.get_scores("scope") == {}
+
+    with pytest.raises(SystemExit):
+        get_scripted_message("nope", "", "unknown", "Bad.")
+    out = capsys.readouterr().out
+    assert "Unknown commit type 'nope'" in out
+    assert "Unknown gitmoji 'unknown'" in out
+    assert "Invalid commit message format" in out
+
+    with pytest.raises(SystemExit):
+        run_scripted(message, stage_all=False)
+
+
+def test_precommit_cache(git_repo: GitRepo, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the pre-commit hooks only run again if the staged content or their configuration changed."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "pre-commit").write_text(FAKE_PRECOMMIT, encoding="utf-8")
+    (bin_dir / "pre-commit").chmod(0o755)
+    runs = tmp_path / "runs"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_PRECOMMIT_RUNS", str(runs))
+    monkeypatch.setenv("FAKE_PRECOMMIT_STATUS", "0")
+
+    def count() -> int:
+        return len(runs.read_text(encoding="utf-8").splitlines()) if runs.exists() else 0
+
+    git_repo.commit("feat: :tada: initial commit")
+    (git_repo.path / ".pre-commit-config.yaml").write_text("repos: []\n", encoding="utf-8")
+    (git_repo.path / "file.txt").write_text("changed\n", encoding="utf-8")
+    git_repo.git("add", "file.txt")
+    assert run_precommit()
+    assert run_precommit()
+    assert count() == 1
+    assert run_precommit(use_cache=False)
+    assert count() == 2
+
+    (git_repo.path / ".pre-commit-config.yaml").write_text("repos: []\n# changed\n", encoding="utf-8")
+    assert run_precommit()
+    assert count() == 3
+
+    monkeypatch.setenv("FAKE_PRECOMMIT_STATUS", "1")
+    (git_repo.path / "file.txt").write_text("changed again\n", encoding="utf-8")
+    git_repo.git("add", "file.txt")
+    assert not run_precommit()
+    assert not run_precommit()
+    assert count() == 5
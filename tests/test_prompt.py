@@ -0,0 +1,66 @@
+"""Tests specific to the prompt sub-module."""
+
+from __future__ import annotations
+
+import io
+
+from commit.prompt import FrameRenderer, parse_keys
+
+
+class CountingStream(io.StringIO):
+    """A string stream that counts how often it is written to."""
+
+    writes = 0
+
+    def write(self, s: str) -> int:
+        """Write to the stream, counting the call.
+
+        Args:
+            s (str): The text to write.
+
+        Returns:
+            int: The number of characters written.
+        """
+        self.writes += 1
+        return super().write(s)
+
+
+def test_first_frame() -> None:
+    """Test that the first frame draws every line in a single write."""
+    stream = CountingStream()
+    renderer = FrameRenderer(stream)
+    renderer.render(["header", "a", "b"], (0, 6))
+    assert stream.writes == 1
+    assert stream.getvalue() == "\rheader\033[K\n\ra\033[K\n\rb\033[K\033[2A\r\033[6C"
+
+
+def test_only_changed_lines() -> None:
+    """Test that later frames only rewrite the lines that changed and clear lines that are gone."""
+    stream = CountingStream()
+    renderer = FrameRenderer(stream)
+    renderer.render(["header", "a", "b"], (0, 6))
+    stream.seek(0)
+    stream.truncate()
+
+    renderer.render(["header", "a", "c"], (0, 6))
+    assert stream.getvalue() == "\033[2B\rc\033[K\033[2A\r\033[6C"
+    stream.seek(0)
+    stream.truncate()
+
+    renderer.render(["header", "a"], None)
+    assert stream.getvalue() == "\033[?25l\033[2B\r\033[K"
+    stream.seek(0)
+    stream.truncate()
+
+    renderer.render(["header", "a"], None)
+    assert not stream.getvalue()
+    assert stream.writes == 3
+
+
+def test_parse_keys() -> None:
+    """Test splitting a burst of terminal input into keys."""
+    assert parse_keys("ab\x7f\n") == (["a", "b", "backspace", "return"], "")
+    assert parse_keys("\x1b[A\x1bOB\x1b[1;5C") == (["up", "down", "esc"], "")
+    assert parse_keys("x\x1b") == (["x"], "\x1b")
+    assert parse_keys("x\x1b[") == (["x"], "\x1b[")
+    assert parse_keys("\x1bq") == (["esc", "q"], "")
@@ -0,0 +1,46 @@
+"""Tests for the recency-weighted ranking of scopes and gitmojis."""
+
+from __future__ import annotations
+
+import pytest
+
+from commit import Config, history, ranking
+
+NOW = 1_700_000_000
+DAY = history.SECONDS_PER_DAY
+
+
+def make_commits() -> list[tuple[str, int]]:
+    """Create commits using a scope daily and another one heavily three years ago, newest first.
+
+    Returns:
+        list[tuple[str, int]]: The subject lines and timestamps of the commits.
+    """
+    recent = [(f"feat(daily): :sparkles: change {i}", NOW - i * DAY) for i in range(20)]
+    old = [(f"fix(legacy): :bug: change {i}", NOW - 3 * 365 * DAY - i * 60) for i in range(500)]
+    return recent + old
+
+
+def test_recent_outranks_frequent() -> None:
+    """Test that a scope in active use outranks one that was used a lot long ago."""
+    index = history.scan_commits(make_commits())
+    scopes = ranking.get_scores(index.scopes, index, Config(), NOW)
+    assert scopes["daily"] > scopes["legacy"]
+    gitmojis = ranking.get_scores(index.gitmojis, index, Config(), NOW)
+    assert gitmojis[":sparkles:"] > gitmojis[":bug:"]
+    counts_only = ranking.get_scores(index.scopes, index, Config(ranking_recency_weight=0.0), NOW)
+    assert counts_only["legacy"] > counts_only["daily"]
+
+
+def test_incremental_scores_match_full_scan() -> None:
+    """Test that merging an incremental scan yields the same scores as scanning everything at once."""
+    commit_list = make_commits()
+    full = history.scan_commits(commit_list)
+    incremental = history.scan_commits(commit_list[:5])
+    incremental.merge_older(history.scan_commits(commit_list[5:]))
+
+    conf = Config(ranking_recency_weight=0.5)
+    expected = ranking.get_scores(full.scopes, full, conf, NOW)
+    actual = ranking.get_scores(incremental.scopes, incremental, conf, NOW)
+    assert actual == pytest.approx(expected)
+    assert incremental.scope_counts == full.scope_counts
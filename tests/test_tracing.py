@@ -0,0 +1,88 @@
+"""Tests specific to the tracing sub-module."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from commit import tracing
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def tracer() -> Iterator[tracing.Tracer]:
+    """Trace the test and stop tracing afterwards.
+
+    Yields:
+        tracing.Tracer: The active tracer.
+    """
+    yield tracing.enable()
+    tracing.disable()
+
+
+@tracing.traced("test.run_git")
+def run_git() -> None:
+    """Start a single git subprocess."""
+    subprocess.run(["git", "--version"], capture_output=True, check=True)  # noqa: S603 S607
+
+
+def test_disabled() -> None:
+    """Test that nothing is recorded while tracing is disabled."""
+    assert not tracing.is_enabled()
+    run_git()
+    tracing.add_latency("test.latency", 0.001)
+    assert tracing.disable() is None
+
+
+def test_phases(tracer: tracing.Tracer) -> None:
+    """Test that calls, time and subprocesses are recorded for the innermost phase."""
+    with tracing.phase("test.outer"):
+        run_git()
+        run_git()
+    subprocess.run(["git", "--version"], capture_output=True, check=True)  # noqa: S603 S607
+
+    trace = tracer.to_dict()
+    assert trace["phases"]["test.run_git"]["calls"] == 2
+    assert trace["phases"]["test.run_git"]["git_subprocesses"] == 2
+    assert trace["phases"]["test.outer"]["calls"] == 1
+    assert trace["phases"]["test.outer"]["subprocesses"] == 0
+    assert trace["phases"]["test.outer"]["seconds"] >= trace["phases"]["test.run_git"]["seconds"]
+    assert trace["git_subprocesses"] == 3
+
+
+def test_latencies(tracer: tracing.Tracer, tmp_path: Path) -> None:
+    """Test that latency samples are summarized as a histogram and written as JSON."""
+    for ms in [0.05, 0.3, 0.3, 4, 200]:
+        tracing.add_latency("test.latency", ms / 1000)
+    path = tmp_path / "trace.json"
+    tracing.write(path)
+
+    summary = json.loads(path.read_text(encoding="utf-8"))["latencies"]["test.latency"]
+    assert summary["count"] == 5
+    assert summary["p50_ms"] == pytest.approx(0.3)
+    assert summary["max_ms"] == pytest.approx(200)
+    assert summary["histogram"]["<=0.1"] == 1
+    assert summary["histogram"]["<=0.5"] == 2
+    assert summary["histogram"]["<=5.0"] == 1
+    assert summary["histogram"][">100.0"] == 1
+    assert sum(summary["histogram"].values()) == 5
+    assert tracer.latencies["test.latency"][0] == pytest.approx(0.00005)
+
+
+def test_trace_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that tracing is requested by the command line or the environment."""
+    monkeypatch.delenv(tracing.TRACE_ENV_VARIABLE, raising=False)
+    assert tracing.get_trace_path(None) is None
+    assert tracing.get_trace_path("out.json") == Path("out.json")
+    monkeypatch.setenv(tracing.TRACE_ENV_VARIABLE, "1")
+    assert tracing.get_trace_path(None) == Path(tracing.DEFAULT_TRACE_FILE)
+    monkeypatch.setenv(tracing.TRACE_ENV_VARIABLE, "env.json")
+    assert tracing.get_trace_path(None) == Path("env.json")
+    monkeypatch.setenv(tracing.TRACE_ENV_VARIABLE, "0")
+    assert tracing.get_trace_path(None) is None
@@ -0,0 +1,111 @@
+"""Tests for the usage store of the user across repositories."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from commit import commits, config, history, ranking, usage
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .conftest import GitRepo
+
+NOW = 1_750_000_000
+DAY = 24 * 60 * 60
+
+
+def test_record_and_rank(usage_database: Path) -> None:
+    """Test that recorded entries are ranked by their decayed uses."""
+    assert usage.get_scores("scope") == {}
+    for day in range(3):
+        usage.record("fix", "legacy", ":bug:", NOW - 400 * DAY - day)
+    usage.record_message("feat(api): :sparkles: add an endpoint\n\nbody\n")
+    usage.record("feat", "api", ":sparkles:", NOW - DAY)
+    usage.record("docs", "", None, NOW)
+    assert usage_database.is_file()
+
+    scopes = usage.get_scores("scope", NOW)
+    assert list(scopes) == ["api", "legacy"]
+    assert scopes["legacy"] == pytest.approx(3 * 2.0 ** (-400 * DAY / usage.HALF_LIFE), rel=1e-3)
+    assert list(usage.get_scores("gitmoji", NOW)) == [":sparkles:", ":bug:"]
+    assert list(usage.get_scores("type", NOW)) == ["feat", "docs", "fix"]
+
+
+def test_concurrent_writers() -> None:
+    """Test that commits recorded from many threads at once are all counted."""
+    writers, commits_per_writer = 8, 10
+
+    def write(index: int) -> None:
+        for i in range(commits_per_writer):
+            usage.record("feat", f"scope-{index}", ":sparkles:", NOW + i)
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    connection = usage.connect()
+    try:
+        counts = dict(connection.execute("SELECT key, count FROM usage WHERE kind = 'gitmoji' OR kind = 'type'"))
+        scope_counts = [count for (count,) in connection.execute("SELECT count FROM usage WHERE kind = 'scope'")]
+    finally:
+        connection.close()
+    assert counts == {":sparkles:": writers * commits_per_writer, "feat": writers * commits_per_writer}
+    assert scope_counts == [commits_per_writer] * writers
+
+
+def test_blend() -> None:
+    """Test that the user scores only change the ranking if there are any and they are not ignored."""
+    repository = {"a": 4.0, "b": 2.0}
+    assert ranking.blend(repository, {}, 0.5) is repository
+    assert ranking.blend(repository, {"c": 1.0}, 0.0) is repository
+    assert ranking.blend(repository, {"b": 10.0, "c": 5.0}, 0.5) == pytest.approx({"a": 1.0, "b": 1.0, "c": 0.25})
+
+
+def test_new_repository_uses_store(git_repo: GitRepo) -> None:
+    """Test that a repository without history is ranked by the commits of the user in other repositories."""
+    catalogue_order = commits.rank_gitmojis()
+    usage.record("fix", "parser", ":bug:")
+    usage.record("fix", "parser", ":bug:")
+    usage.record("perf", "cli", ":zap:")
+
+    assert commits.rank_gitmojis()[:2] == [
+        commits.get_gitmoji_catalogue()[":bug:"].format(),
+        commits.get_gitmoji_catalogue()[":zap:"].format(),
+    ]
+    assert commits.get_possible_scopes() == ["None", "parser", "cli"]
+
+    git_repo.commit("feat(cli): :zap: speed it up")
+    git_repo.commit("feat(cli): :zap: speed it up more")
+    history.clear_cache()
+    assert commits.get_possible_scopes() == ["None", "cli", "parser"]
+
+    (git_repo.path / ".quick-commit-config.yaml").write_text("ranking:\n  user-weight: 0\n", encoding="utf-8")
+    config.clear_cache()
+    assert commits.get_possible_scopes() == ["None", "cli"]
+    assert commits.rank_gitmojis()[0] == commits.get_gitmoji_catalogue()[":zap:"].format()
+    assert len(commits.rank_gitmojis()) == len(catalogue_order)
+
+
+def test_new_repository_ranks_types_from_store(git_repo: GitRepo) -> None:
+    """Test that the commit types used in other repositories move up in a repository without history."""
+    standard = list(commits.get_standard_commit_types())
+    assert [option.split(":")[0] for option in commits.get_commit_types()] == standard
+    usage.record("refactor", "", None)
+    usage.record("refactor", "", None)
+    usage.record("test", "", None)
+    assert [option.split(":")[0] for option in commits.get_commit_types()][:3] == ["refactor", "test", "feat"]
+
+    git_repo.commit("chore: :wrench: bump it")
+    git_repo.commit("chore: :wrench: bump it again")
+    history.clear_cache()
+    assert commits.get_commit_types()[0].startswith("chore:")
+
+    (git_repo.path / ".quick-commit-config.yaml").write_text("types:\n  priority:\n    - docs\n", encoding="utf-8")
+    config.clear_cache()
+    assert [option.split(":")[0] for option in commits.get_commit_types()][:2] == ["docs", "chore"]